@@ -1,5 +1,7 @@
 import structlog
 
+import django_structlog
+
 from .base import *  # noqa: F403
 from .base import MIDDLEWARE, env
 
@@ -81,39 +83,17 @@ LOGGING = {
     "disable_existing_loggers": False,
     "formatters": {
         "json_formatter": {
-            "()": structlog.stdlib.ProcessorFormatter,
-            "processor": structlog.processors.JSONRenderer(),
-            "foreign_pre_chain": [
-                structlog.contextvars.merge_contextvars,
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-            ],
+            "()": "django_structlog.renderers.JSONFormatter",
         },
         "colored": {
             "()": structlog.stdlib.ProcessorFormatter,
             "processor": structlog.dev.ConsoleRenderer(colors=True),
-            "foreign_pre_chain": [
-                structlog.contextvars.merge_contextvars,
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-            ],
         },
         "key_value": {
             "()": structlog.stdlib.ProcessorFormatter,
             "processor": structlog.processors.KeyValueRenderer(
                 key_order=["timestamp", "level", "event", "logger"]
             ),
-            "foreign_pre_chain": [
-                structlog.contextvars.merge_contextvars,
-                structlog.processors.TimeStamper(fmt="iso"),
-                structlog.stdlib.add_logger_name,
-                structlog.stdlib.add_log_level,
-                structlog.stdlib.PositionalArgumentsFormatter(),
-            ],
         },
     },
     "handlers": {
@@ -128,39 +108,43 @@ LOGGING = {
             "filename": "logs/flat_line.log",
             "formatter": "key_value",
         },
+        # configured in the sorted order of their names, after the handlers they use
+        "queued_files": {
+            "()": "django_structlog.handlers.QueueHandler",
+            "handlers": ["cfg://handlers.flat_line_file", "cfg://handlers.json_file"],
+        },
+        "stdlib_fan_out": {
+            "()": "django_structlog.handlers.FanOutHandler",
+            "handlers": [
+                "cfg://handlers.colored_stream",
+                "cfg://handlers.queued_files",
+            ],
+            "foreign_pre_chain": [
+                structlog.contextvars.merge_contextvars,
+                structlog.processors.TimeStamper(fmt="iso"),
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+                structlog.stdlib.PositionalArgumentsFormatter(),
+            ],
+        },
     },
     "loggers": {
         "django_structlog": {
-            "handlers": ["colored_stream", "flat_line_file", "json_file"],
+            "handlers": ["stdlib_fan_out"],
             "level": "INFO",
         },
         "django_structlog_demo_project": {
-            "handlers": ["colored_stream", "flat_line_file", "json_file"],
+            "handlers": ["stdlib_fan_out"],
             "level": "INFO",
         },
         "foreign_logger": {
-            "handlers": ["colored_stream", "flat_line_file", "json_file"],
+            "handlers": ["stdlib_fan_out"],
             "level": "INFO",
         },
     },
 }
 
-structlog.configure(
-    processors=[
-        structlog.contextvars.merge_contextvars,
-        structlog.stdlib.filter_by_level,
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
-    ],
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    cache_logger_on_first_use=True,
-)
+django_structlog.configure()
 
 MIDDLEWARE += [
     "django_structlog.middlewares.RequestMiddleware",
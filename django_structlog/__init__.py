@@ -1,7 +1,17 @@
 """``django-structlog`` is a structured logging integration for ``Django`` project using ``structlog``."""
 
+from typing import Any
+
 name = "django_structlog"
 
 VERSION = (10, 1, 0)
 
 __version__ = ".".join(str(v) for v in VERSION)
+
+
+def configure(*args: Any, **kwargs: Any) -> None:
+    """Configures ``structlog``, see :func:`django_structlog.configuration.configure`."""
+    # imported here so the version can be read without the dependencies installed
+    from .configuration import configure
+
+    configure(*args, **kwargs)
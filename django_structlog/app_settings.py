@@ -1,12 +1,161 @@
 import logging
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Collection, Mapping, Optional, cast
 
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+from .celery import metrics
+from .celery.context import ContextCodec
+from .celery.overrides import TaskOverrides, TaskSettings
+from .sampling import RequestSampler
+
+
+# noinspection PyPep8Naming
+@dataclass(frozen=True, slots=True)
+class AppSettingsSnapshot:
+    """Values of :class:`AppSettings` resolved once, read as plain attributes."""
+
+    CELERY_ENABLED: bool
+    CELERY_DEFAULT_LOG_LEVEL: int
+    CELERY_TASK_START_LOG_LEVEL: int
+    CELERY_TASK_SUCCESS_LOG_LEVEL: int
+    CELERY_TASK_NOTICE_LOG_LEVEL: int
+    CELERY_TASK_FAILURE_LOG_LEVEL: int
+    CELERY_TASK_ERROR_LOG_LEVEL: int
+    CELERY_CONTEXT_KEYS: Optional[Collection[str]]
+    CELERY_CONTEXT_EXCLUDED_KEYS: Collection[str]
+    CELERY_CONTEXT_MAX_BYTES: Optional[int]
+    CELERY_CONTEXT_KEY_ALIASES: Mapping[str, str]
+    CELERY_TASK_OVERRIDES: Mapping[str, Mapping[str, Any]]
+    CELERY_TASK_METRICS_ENABLED: bool
+    IP_LOGGING_ENABLED: bool
+    IP_PROXY_HEADER: Optional[str]
+    IP_PROXY_COUNT: int
+    REQUEST_CANCELLED_LOG_LEVEL: int
+    REQUEST_ID_GENERATOR: Callable[[], str]
+    REQUEST_SAMPLING_RATE: float
+    REQUEST_SAMPLING_PATH_RATES: Mapping[str, float]
+    REQUEST_SAMPLING_KEEP_STATUS_CLASSES: Collection[int]
+    REQUEST_SAMPLING_KEEP_SLOWER_THAN_MS: Optional[int]
+    REQUEST_SUMMARY_ENABLED: bool
+    REQUEST_FIELDS_ENABLED: bool
+    REQUEST_QUERY_MAX_LENGTH: Optional[int]
+    REQUEST_QUERY_REDACTED_PARAMS: Collection[str]
+    STATUS_DEFAULT_LOG_LEVEL: int
+    STATUS_START_LOG_LEVEL: int
+    STATUS_2XX_LOG_LEVEL: int
+    STATUS_4XX_LOG_LEVEL: int
+    STATUS_5XX_LOG_LEVEL: int
+    STATUS_CODE_LOG_LEVELS: Mapping[int, int]
+    COMMAND_LOGGING_ENABLED: bool
+    USER_ID_FIELD: str
+    USER_ID_FROM_SESSION: bool
+    HOOKS: Mapping[str, tuple[Callable[..., Any], ...]]
+
+    status_log_levels: tuple[int, ...] = field(init=False, repr=False, compare=False)
+    """Log level of every status code below 600, indexed by status code."""
+    request_sampler: Optional[RequestSampler] = field(
+        init=False, repr=False, compare=False
+    )
+    """``None`` when every request is logged."""
+    celery_context_codec: Optional[ContextCodec] = field(
+        init=False, repr=False, compare=False
+    )
+    """``None`` when the whole context is propagated to ``celery`` tasks."""
+    celery_task_overrides: TaskOverrides = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.IP_PROXY_COUNT < 1:
+            raise ImproperlyConfigured(
+                "DJANGO_STRUCTLOG_IP_PROXY_COUNT must be at least 1, "
+                f"got {self.IP_PROXY_COUNT!r}"
+            )
+
+        levels = [self.STATUS_DEFAULT_LOG_LEVEL] * 600
+        levels[200:300] = [self.STATUS_2XX_LOG_LEVEL] * 100
+        levels[400:500] = [self.STATUS_4XX_LOG_LEVEL] * 100
+        levels[500:600] = [self.STATUS_5XX_LOG_LEVEL] * 100
+        for status_code, level in self.STATUS_CODE_LOG_LEVELS.items():
+            if 0 <= status_code < 600:
+                levels[status_code] = level
+        object.__setattr__(self, "status_log_levels", tuple(levels))
+
+        request_sampler = None
+        if self.REQUEST_SAMPLING_RATE < 1 or self.REQUEST_SAMPLING_PATH_RATES:
+            request_sampler = RequestSampler(
+                self.REQUEST_SAMPLING_RATE, self.REQUEST_SAMPLING_PATH_RATES
+            )
+        object.__setattr__(self, "request_sampler", request_sampler)
+
+        celery_context_codec = None
+        if (
+            self.CELERY_CONTEXT_KEYS is not None
+            or self.CELERY_CONTEXT_EXCLUDED_KEYS
+            or self.CELERY_CONTEXT_MAX_BYTES is not None
+            or self.CELERY_CONTEXT_KEY_ALIASES
+        ):
+            max_bytes = self.CELERY_CONTEXT_MAX_BYTES
+            if max_bytes is not None and self.CELERY_TASK_METRICS_ENABLED:
+                # the publish timestamp is added to the encoded context
+                max_bytes -= metrics.PUBLISHED_AT_SIZE
+            celery_context_codec = ContextCodec(
+                self.CELERY_CONTEXT_KEYS,
+                self.CELERY_CONTEXT_EXCLUDED_KEYS,
+                max_bytes,
+                self.CELERY_CONTEXT_KEY_ALIASES,
+            )
+        object.__setattr__(self, "celery_context_codec", celery_context_codec)
+
+        celery_task_overrides = TaskOverrides(
+            TaskSettings(
+                self.CELERY_TASK_START_LOG_LEVEL, self.CELERY_TASK_SUCCESS_LOG_LEVEL
+            ),
+            self.CELERY_TASK_OVERRIDES,
+        )
+        object.__setattr__(self, "celery_task_overrides", celery_task_overrides)
+
+    def log_level_for_status_code(self, status_code: int) -> int:
+        try:
+            return self.status_log_levels[status_code]
+        except IndexError:
+            return self.STATUS_CODE_LOG_LEVELS.get(
+                status_code, self.STATUS_DEFAULT_LOG_LEVEL
+            )
 
 
 # noinspection PyPep8Naming
 class AppSettings:
     PREFIX = "DJANGO_STRUCTLOG_"
 
+    _snapshot: Optional[AppSettingsSnapshot]
+
+    def __init__(self) -> None:
+        self._snapshot = None
+
+    @property
+    def snapshot(self) -> AppSettingsSnapshot:
+        """Settings resolved on first access and kept until :meth:`reload`.
+
+        Use it on hot paths instead of the properties below which look up
+        ``django.conf.settings`` on every access.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = AppSettingsSnapshot(
+                **{
+                    snapshot_field.name: getattr(self, snapshot_field.name)
+                    for snapshot_field in fields(AppSettingsSnapshot)
+                    if snapshot_field.init
+                }
+            )
+        return snapshot
+
+    def reload(self) -> None:
+        self._snapshot = None
+
     @property
     def CELERY_ENABLED(self) -> bool:
         return getattr(settings, self.PREFIX + "CELERY_ENABLED", False)
@@ -55,16 +204,95 @@ class AppSettings:
             logging.ERROR,
         )
 
+    @property
+    def CELERY_CONTEXT_KEYS(self) -> Optional[Collection[str]]:
+        return getattr(settings, self.PREFIX + "CELERY_CONTEXT_KEYS", None)
+
+    @property
+    def CELERY_CONTEXT_EXCLUDED_KEYS(self) -> Collection[str]:
+        return getattr(settings, self.PREFIX + "CELERY_CONTEXT_EXCLUDED_KEYS", ())
+
+    @property
+    def CELERY_CONTEXT_MAX_BYTES(self) -> Optional[int]:
+        return getattr(settings, self.PREFIX + "CELERY_CONTEXT_MAX_BYTES", None)
+
+    @property
+    def CELERY_CONTEXT_KEY_ALIASES(self) -> Mapping[str, str]:
+        return getattr(settings, self.PREFIX + "CELERY_CONTEXT_KEY_ALIASES", {})
+
+    @property
+    def CELERY_TASK_OVERRIDES(self) -> Mapping[str, Mapping[str, Any]]:
+        return getattr(settings, self.PREFIX + "CELERY_TASK_OVERRIDES", {})
+
+    @property
+    def CELERY_TASK_METRICS_ENABLED(self) -> bool:
+        return getattr(settings, self.PREFIX + "CELERY_TASK_METRICS_ENABLED", False)
+
     @property
     def IP_LOGGING_ENABLED(self) -> bool:
         return getattr(settings, self.PREFIX + "IP_LOGGING_ENABLED", True)
 
+    @property
+    def IP_PROXY_HEADER(self) -> Optional[str]:
+        return getattr(settings, self.PREFIX + "IP_PROXY_HEADER", None)
+
+    @property
+    def IP_PROXY_COUNT(self) -> int:
+        return getattr(settings, self.PREFIX + "IP_PROXY_COUNT", 1)
+
     @property
     def REQUEST_CANCELLED_LOG_LEVEL(self) -> int:
         return getattr(
             settings, self.PREFIX + "REQUEST_CANCELLED_LOG_LEVEL", logging.WARNING
         )
 
+    @property
+    def REQUEST_ID_GENERATOR(self) -> Callable[[], str]:
+        generator = getattr(
+            settings,
+            self.PREFIX + "REQUEST_ID_GENERATOR",
+            "django_structlog.request_id.uuid4",
+        )
+        if isinstance(generator, str):
+            generator = import_string(generator)
+        return cast(Callable[[], str], generator)
+
+    @property
+    def REQUEST_SAMPLING_RATE(self) -> float:
+        return getattr(settings, self.PREFIX + "REQUEST_SAMPLING_RATE", 1.0)
+
+    @property
+    def REQUEST_SAMPLING_PATH_RATES(self) -> Mapping[str, float]:
+        return getattr(settings, self.PREFIX + "REQUEST_SAMPLING_PATH_RATES", {})
+
+    @property
+    def REQUEST_SAMPLING_KEEP_STATUS_CLASSES(self) -> Collection[int]:
+        return getattr(
+            settings, self.PREFIX + "REQUEST_SAMPLING_KEEP_STATUS_CLASSES", (4, 5)
+        )
+
+    @property
+    def REQUEST_SAMPLING_KEEP_SLOWER_THAN_MS(self) -> Optional[int]:
+        return getattr(
+            settings, self.PREFIX + "REQUEST_SAMPLING_KEEP_SLOWER_THAN_MS", None
+        )
+
+    @property
+    def REQUEST_SUMMARY_ENABLED(self) -> bool:
+        return getattr(settings, self.PREFIX + "REQUEST_SUMMARY_ENABLED", False)
+
+    @property
+    def REQUEST_FIELDS_ENABLED(self) -> bool:
+        return getattr(settings, self.PREFIX + "REQUEST_FIELDS_ENABLED", False)
+
+    @property
+    def REQUEST_QUERY_MAX_LENGTH(self) -> Optional[int]:
+        return getattr(settings, self.PREFIX + "REQUEST_QUERY_MAX_LENGTH", None)
+
+    @property
+    def REQUEST_QUERY_REDACTED_PARAMS(self) -> Collection[str]:
+        return getattr(settings, self.PREFIX + "REQUEST_QUERY_REDACTED_PARAMS", ())
+
     @property
     def STATUS_DEFAULT_LOG_LEVEL(self) -> int:
         return getattr(settings, self.PREFIX + "STATUS_DEFAULT_LOG_LEVEL", logging.INFO)
@@ -93,6 +321,10 @@ class AppSettings:
     def STATUS_5XX_LOG_LEVEL(self) -> int:
         return getattr(settings, self.PREFIX + "STATUS_5XX_LOG_LEVEL", logging.ERROR)
 
+    @property
+    def STATUS_CODE_LOG_LEVELS(self) -> Mapping[int, int]:
+        return getattr(settings, self.PREFIX + "STATUS_CODE_LOG_LEVELS", {})
+
     @property
     def COMMAND_LOGGING_ENABLED(self) -> bool:
         return getattr(settings, self.PREFIX + "COMMAND_LOGGING_ENABLED", False)
@@ -101,5 +333,28 @@ class AppSettings:
     def USER_ID_FIELD(self) -> str:
         return getattr(settings, self.PREFIX + "USER_ID_FIELD", "pk")
 
+    @property
+    def USER_ID_FROM_SESSION(self) -> bool:
+        return getattr(settings, self.PREFIX + "USER_ID_FROM_SESSION", False)
+
+    @property
+    def HOOKS(self) -> Mapping[str, tuple[Callable[..., Any], ...]]:
+        hooks = getattr(settings, self.PREFIX + "HOOKS", {})
+        return {
+            signal_name: tuple(
+                import_string(hook) if isinstance(hook, str) else hook
+                for hook in signal_hooks
+            )
+            for signal_name, signal_hooks in hooks.items()
+        }
+
 
 app_settings = AppSettings()
+
+
+def reload_app_settings(*args: Any, setting: str, **kwargs: Any) -> None:
+    if setting.startswith(AppSettings.PREFIX):
+        app_settings.reload()
+
+
+setting_changed.connect(reload_app_settings)
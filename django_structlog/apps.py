@@ -7,13 +7,16 @@ class DjangoStructLogConfig(AppConfig):
     name = "django_structlog"
 
     def ready(self) -> None:
-        if app_settings.CELERY_ENABLED:
+        app_settings.reload()
+        snapshot = app_settings.snapshot
+
+        if snapshot.CELERY_ENABLED:
             from .celery.receivers import CeleryReceiver
 
             self._celery_receiver = CeleryReceiver()
             self._celery_receiver.connect_signals()
 
-        if app_settings.COMMAND_LOGGING_ENABLED:
+        if snapshot.COMMAND_LOGGING_ENABLED:
             from .commands import DjangoCommandReceiver
 
             self._django_command_receiver = DjangoCommandReceiver()
@@ -0,0 +1,92 @@
+"""Context propagated to ``celery`` tasks in the ``__django_structlog__`` header.
+
+See :ref:`celery_context`.
+
+"""
+
+import json
+from typing import Any, Collection, Mapping, Optional
+
+_SAMPLED = "sampled"
+
+
+def _size(value: Any) -> int:
+    """Bytes of ``value`` in compact JSON."""
+    return len(json.dumps(value, separators=(",", ":"), default=str).encode())
+
+
+def _item_size(key: str, value: Any) -> int:
+    """Bytes of ``"key":value,`` in compact JSON."""
+    return _size({key: value}) - 1
+
+
+class ContextCodec:
+    """Filters, aliases and caps the context sent with a task, and restores it in the
+    worker.
+
+    Only ``keys`` are sent when given, in their order, and ``excluded_keys`` never are.
+    ``sampled`` is always sent. Keys are renamed with ``aliases`` on the wire. When the
+    encoded context exceeds ``max_bytes``, ``sampled`` is kept, then the other items in
+    the order of ``keys``, or of their names without ``keys``, as long as they fit. The
+    order of the context itself, which depends on the hashing of its keys, does not
+    matter, so the same context is truncated the same way by every process.
+    """
+
+    __slots__ = ("_keys", "_excluded_keys", "_max_bytes", "_aliases", "_names")
+
+    def __init__(
+        self,
+        keys: Optional[Collection[str]] = None,
+        excluded_keys: Collection[str] = (),
+        max_bytes: Optional[int] = None,
+        aliases: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self._keys = None if keys is None else tuple(keys)
+        self._excluded_keys = frozenset(excluded_keys)
+        self._max_bytes = max_bytes
+        self._aliases = dict(aliases or {})
+        self._names = {alias: key for key, alias in self._aliases.items()}
+
+    def encode(self, context: Mapping[str, Any]) -> dict[str, Any]:
+        if self._keys is None:
+            items = [
+                (key, value)
+                for key, value in context.items()
+                if key not in self._excluded_keys
+            ]
+        else:
+            items = [
+                (key, context[key])
+                for key in self._keys
+                if key in context and key not in self._excluded_keys
+            ]
+            if _SAMPLED in context and _SAMPLED not in self._keys:
+                items.append((_SAMPLED, context[_SAMPLED]))
+        aliases = self._aliases
+        if aliases:
+            items = [(aliases.get(key, key), value) for key, value in items]
+        encoded = dict(items)
+        if self._max_bytes is None or _size(encoded) <= self._max_bytes:
+            return encoded
+
+        encoded = {}
+        # braces, without the comma of the last item
+        size = 1
+        sampled_name = aliases.get(_SAMPLED, _SAMPLED)
+        if self._keys is None:
+            names = self._names
+            items.sort(key=lambda item: names.get(item[0], item[0]))
+        # ``sampled`` first since it is never dropped, the sort is stable
+        items.sort(key=lambda item: item[0] != sampled_name)
+        for key, value in items:
+            item_size = _item_size(key, value)
+            if key == sampled_name or size + item_size <= self._max_bytes:
+                encoded[key] = value
+                size += item_size
+        return encoded
+
+    def decode(self, metadata: Mapping[str, Any]) -> Mapping[str, Any]:
+        names = self._names
+        if not names:
+            return metadata
+        return {names.get(key, key): value for key, value in metadata.items()}
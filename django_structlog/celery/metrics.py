@@ -0,0 +1,94 @@
+"""Resource usage of ``celery`` tasks, logged with ``task_succeeded`` and
+``task_failed``.
+
+See :ref:`celery_task_metrics`.
+
+"""
+
+import sys
+import time
+from datetime import datetime
+from typing import Any, Mapping, Optional, cast
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+PUBLISHED_AT = "_published_at"
+"""Key of the publish timestamp in the ``__django_structlog__`` header."""
+
+PUBLISHED_AT_SIZE = len(f'"{PUBLISHED_AT}":,') + len("9999999999.999999")
+"""Bytes of the publish timestamp in the header, reserved in
+``DJANGO_STRUCTLOG_CELERY_CONTEXT_MAX_BYTES``."""
+
+# CPU time of the thread running the task, other threads of a threaded pool do not
+# count. Not available on every platform.
+_cpu_time_ns = getattr(time, "thread_time_ns", time.process_time_ns)
+
+
+def _max_rss_kb() -> Optional[int]:
+    """Peak resident set size of the process in KiB, ``None`` without ``resource``."""
+    if resource is None:  # pragma: no cover
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def published_at() -> float:
+    """Timestamp of the publication of a task, to the microsecond."""
+    return round(time.time(), 6)
+
+
+def _due_at(request: Any) -> Optional[float]:
+    """Timestamp of the ``eta`` of the task ``request`` (``countdown`` included), naive
+    ones are in local time like for the worker."""
+    eta = getattr(request, "eta", None)
+    if not eta:
+        return None
+    if isinstance(eta, str):
+        try:
+            eta = datetime.fromisoformat(eta)
+        except ValueError:
+            return None
+    return cast(datetime, eta).timestamp()
+
+
+def pop_published_at(
+    metadata: Mapping[str, Any],
+) -> tuple[Mapping[str, Any], Optional[float]]:
+    """Splits the publish timestamp from the context of the header, so it is not bound
+    to the context of the task."""
+    if PUBLISHED_AT not in metadata:
+        return metadata, None
+    metadata = dict(metadata)
+    return metadata, metadata.pop(PUBLISHED_AT)
+
+
+def start(request: Any, published_at: Optional[float]) -> None:
+    """Records the usage of the process when the task ``request`` starts.
+
+    The queue wait of a task with an ``eta`` starts when it is due.
+    """
+    queue_wait_ms = None
+    if published_at is not None:
+        due_at = _due_at(request)
+        if due_at is not None and due_at > published_at:
+            published_at = due_at
+        queue_wait_ms = round((time.time() - published_at) * 1000)
+    request._django_structlog_metrics = (_cpu_time_ns(), _max_rss_kb(), queue_wait_ms)
+
+
+def add_metrics(request: Any, log_vars: dict[str, Any]) -> None:
+    """Adds ``cpu_time_ms``, ``max_rss_delta_kb`` and ``queue_wait_ms`` of the task
+    ``request`` to ``log_vars``, when they were recorded by :func:`start`."""
+    metrics = getattr(request, "_django_structlog_metrics", None)
+    if metrics is None:
+        return
+    cpu_started_at, max_rss_kb, queue_wait_ms = metrics
+    log_vars["cpu_time_ms"] = round((_cpu_time_ns() - cpu_started_at) / 1_000_000)
+    if max_rss_kb is not None:
+        log_vars["max_rss_delta_kb"] = cast(int, _max_rss_kb()) - max_rss_kb
+    if queue_wait_ms is not None:
+        log_vars["queue_wait_ms"] = queue_wait_ms
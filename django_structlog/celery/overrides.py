@@ -0,0 +1,72 @@
+"""Levels and sampling of ``celery`` task events overridden per task name.
+
+See :ref:`celery_task_overrides`.
+
+"""
+
+import re
+from dataclasses import dataclass, field, replace
+from fnmatch import translate
+from typing import Any, Mapping, Optional
+
+from .. import sampling
+
+
+@dataclass(frozen=True, slots=True)
+class TaskSettings:
+    """Levels and sampling rate of the events of a task."""
+
+    start_log_level: int
+    success_log_level: int
+    sampling_rate: float = 1.0
+
+    _threshold: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_threshold", sampling.threshold(self.sampling_rate))
+
+    def sample(self, task_id: Optional[str]) -> bool:
+        """Whether the events of the task ``task_id`` are logged.
+
+        The decision hashes the id of the task, so ``task_enqueued`` and the events of
+        the worker agree.
+        """
+        if task_id is None or self._threshold >= 2**32:
+            return True
+        return sampling.sample_key(task_id, self._threshold)
+
+
+class TaskOverrides:
+    """Resolves the :class:`TaskSettings` of task names.
+
+    ``overrides`` maps ``fnmatch`` patterns of task names to the fields of
+    :class:`TaskSettings` to override, the first matching pattern wins. Patterns are
+    compiled once and the settings of each task name are cached.
+    """
+
+    __slots__ = ("_default", "_patterns", "_cache")
+
+    def __init__(
+        self, default: TaskSettings, overrides: Mapping[str, Mapping[str, Any]]
+    ) -> None:
+        self._default = default
+        self._patterns = tuple(
+            (re.compile(translate(pattern)).match, replace(default, **override))
+            for pattern, override in overrides.items()
+        )
+        self._cache: dict[str, TaskSettings] = {}
+
+    def get(self, task_name: Optional[str]) -> TaskSettings:
+        if task_name is None:
+            return self._default
+        try:
+            return self._cache[task_name]
+        except KeyError:
+            pass
+        task_settings = self._default
+        for match, pattern_settings in self._patterns:
+            if match(task_name):
+                task_settings = pattern_settings
+                break
+        self._cache[task_name] = task_settings
+        return task_settings
@@ -1,5 +1,8 @@
+import logging
 import time
-from typing import TYPE_CHECKING, Any, Optional, Type, cast
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Type, cast
 
 import structlog
 from celery import current_app
@@ -15,21 +18,127 @@ from celery.signals import (
     task_unknown,
 )
 
+from .. import sampling
 from ..app_settings import app_settings
-from . import signals
+from ..levels import LevelChecker
+from . import metrics, signals
 
 if TYPE_CHECKING:  # pragma: no cover
     from types import TracebackType
 
 logger = structlog.getLogger(__name__)
+logger_levels = LevelChecker(__name__)
 
+# id and priority of the task being published, from ``before_task_publish`` to
+# ``after_task_publish``. Each thread, greenlet or asyncio task publishes in its own
+# context, unlike an attribute of the receiver shared by all of them.
+_publishing: ContextVar[Optional[tuple[Optional[str], Any]]] = ContextVar(
+    "django_structlog_publishing", default=None
+)
 
-class CeleryReceiver:
-    _priority: Optional[str]
 
-    def __init__(self) -> None:
-        self._priority = None
+class _EnqueuedBatch:
+    """Tasks published in :func:`aggregate_enqueued`."""
+
+    __slots__ = (
+        "log_each",
+        "count",
+        "child_task_names",
+        "routing_keys",
+        "group_ids",
+        "first_child_task_id",
+        "last_child_task_id",
+        "group_id",
+        "context",
+    )
+
+    def __init__(self, log_each: bool) -> None:
+        self.log_each = log_each
+        self.count = 0
+        # dicts as ordered sets
+        self.child_task_names: dict[Optional[str], None] = {}
+        self.routing_keys: dict[Optional[str], None] = {}
+        self.group_ids: dict[str, None] = {}
+        self.first_child_task_id: Optional[str] = None
+        self.last_child_task_id: Optional[str] = None
+        # propagated context of the tasks of the group being published
+        self.group_id: Optional[str] = None
+        self.context: dict[str, Any] = {}
+
+    def add(
+        self,
+        child_task_id: Optional[str],
+        child_task_name: Optional[str],
+        routing_key: Optional[str],
+        group_id: Optional[str],
+    ) -> None:
+        if not self.count:
+            self.first_child_task_id = child_task_id
+        self.last_child_task_id = child_task_id
+        self.count += 1
+        self.child_task_names[child_task_name] = None
+        self.routing_keys[routing_key] = None
+        if group_id is not None:
+            self.group_ids[group_id] = None
+
+    def log(self) -> None:
+        level = app_settings.snapshot.CELERY_TASK_START_LOG_LEVEL
+        if (
+            not self.count
+            or not sampling.is_sampled()
+            or not logger_levels.is_enabled_for(level)
+        ):
+            return
+        logger.log(
+            level,
+            "tasks_enqueued",
+            count=self.count,
+            child_task_names=list(self.child_task_names),
+            routing_keys=list(self.routing_keys),
+            group_ids=list(self.group_ids),
+            first_child_task_id=self.first_child_task_id,
+            last_child_task_id=self.last_child_task_id,
+        )
+
+
+_batch: ContextVar[Optional[_EnqueuedBatch]] = ContextVar(
+    "django_structlog_enqueued_batch", default=None
+)
+
 
+@contextmanager
+def aggregate_enqueued(log_each: bool = False) -> Iterator[None]:
+    """Logs a single ``tasks_enqueued`` event for the tasks published in the block,
+    instead of one ``task_enqueued`` per task unless ``log_each`` is ``True``.
+
+    The context propagated to the tasks of a ``group`` (or of the header of a
+    ``chord``) is computed once for the whole group:
+    :attr:`django_structlog.celery.signals.modify_context_before_task_publish` is sent
+    for its first task only. Nested blocks are part of the outermost one.
+
+    .. code-block:: python
+
+        from celery import group
+        from django_structlog.celery.receivers import aggregate_enqueued
+
+        with aggregate_enqueued():
+            group(add.s(i, i) for i in range(10000)).apply_async()
+
+    """
+    if _batch.get() is not None:
+        yield
+        return
+    batch = _EnqueuedBatch(log_each)
+    token = _batch.set(batch)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+        # also what was published before an error
+        batch.log()
+
+
+class CeleryReceiver:
     def receiver_before_task_publish(
         self,
         sender: Optional[Type[Any]] = None,
@@ -42,19 +151,47 @@ class CeleryReceiver:
         if current_app.conf.task_protocol < 2:
             return
 
+        headers = cast(dict[str, Any], headers)
+        _publishing.set(
+            (
+                headers.get("id"),
+                properties.get("priority", None) if properties else None,
+            )
+        )
+        batch = _batch.get()
+        group_id = headers.get("group") if batch is not None else None
+        if batch is not None and group_id is not None and batch.group_id == group_id:
+            # the context of the caller does not change while a group is published
+            context = batch.context
+        else:
+            context = self._get_propagated_context(routing_key, properties)
+            if batch is not None:
+                batch.group_id = group_id
+                batch.context = context
+        if app_settings.snapshot.CELERY_TASK_METRICS_ENABLED:
+            context = {**context, metrics.PUBLISHED_AT: metrics.published_at()}
+        headers["__django_structlog__"] = context
+
+    def _get_propagated_context(
+        self, routing_key: Optional[str], properties: Optional[dict[str, Any]]
+    ) -> dict[str, Any]:
         context = structlog.contextvars.get_merged_contextvars(logger)
         if "task_id" in context:
             context["parent_task_id"] = context.pop("task_id")
 
-        signals.modify_context_before_task_publish.send(
-            sender=self.receiver_before_task_publish,
-            context=context,
-            task_routing_key=routing_key,
-            task_properties=properties,
-        )
-        if properties:
-            self._priority = properties.get("priority", None)
-        cast(dict[str, Any], headers)["__django_structlog__"] = context
+        if signals.modify_context_before_task_publish.has_listeners(
+            self.receiver_before_task_publish
+        ):
+            signals.modify_context_before_task_publish.send(
+                sender=self.receiver_before_task_publish,
+                context=context,
+                task_routing_key=routing_key,
+                task_properties=properties,
+            )
+        context_codec = app_settings.snapshot.celery_context_codec
+        if context_codec is not None:
+            context = context_codec.encode(context)
+        return context
 
     def receiver_after_task_publish(
         self,
@@ -64,24 +201,45 @@ class CeleryReceiver:
         routing_key: Optional[str] = None,
         **kwargs: Any,
     ) -> None:
+        publishing = _publishing.get()
+        if publishing is not None:
+            _publishing.set(None)
+
+        message = headers or cast(dict[str, Optional[str]], body)
+        batch = _batch.get()
+        if batch is not None:
+            batch.add(
+                message.get("id"),
+                message.get("task"),
+                routing_key,
+                headers.get("group") if headers else None,
+            )
+            if not batch.log_each:
+                return
+
+        child_task_id = message.get("id")
+        child_task_name = message.get("task")
+        task_settings = app_settings.snapshot.celery_task_overrides.get(child_task_name)
+        level = task_settings.start_log_level
+        if (
+            not sampling.is_sampled()
+            or not task_settings.sample(child_task_id)
+            or not logger_levels.is_enabled_for(level)
+        ):
+            return
+
         properties = {}
-        if self._priority is not None:
-            properties["priority"] = self._priority
-            self._priority = None
+        if publishing is not None:
+            task_id, priority = publishing
+            # ``None`` when the headers of ``before_task_publish`` had no id
+            if priority is not None and task_id in (None, child_task_id):
+                properties["priority"] = priority
 
         logger.log(
-            app_settings.CELERY_TASK_START_LOG_LEVEL,
+            level,
             "task_enqueued",
-            child_task_id=(
-                headers.get("id")
-                if headers
-                else cast(dict[str, Optional[str]], body).get("id")
-            ),
-            child_task_name=(
-                headers.get("task")
-                if headers
-                else cast(dict[str, Optional[str]], body).get("task")
-            ),
+            child_task_id=child_task_id,
+            child_task_name=child_task_name,
             routing_key=routing_key,
             **properties,
         )
@@ -92,15 +250,27 @@ class CeleryReceiver:
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(task_id=task_id)
         metadata = getattr(task.request, "__django_structlog__", {})
+        context_codec = app_settings.snapshot.celery_context_codec
+        if context_codec is not None:
+            metadata = context_codec.decode(metadata)
+        metadata, published_at = metrics.pop_published_at(metadata)
         structlog.contextvars.bind_contextvars(**metadata)
-        signals.bind_extra_task_metadata.send(
-            sender=self.receiver_task_prerun, task=task, logger=logger
+        task_settings = app_settings.snapshot.celery_task_overrides.get(task.name)
+        # ``sampled`` stays bound as is for the tasks enqueued by this one
+        sampling.set_sampled(
+            metadata.get("sampled", True) and task_settings.sample(task_id)
         )
+        if signals.bind_extra_task_metadata.has_listeners(self.receiver_task_prerun):
+            signals.bind_extra_task_metadata.send(
+                sender=self.receiver_task_prerun, task=task, logger=logger
+            )
         # Record the start time so we can log the task duration later.
         task.request._django_structlog_started_at = time.monotonic_ns()
-        logger.log(
-            app_settings.CELERY_TASK_START_LOG_LEVEL, "task_started", task=task.name
-        )
+        if app_settings.snapshot.CELERY_TASK_METRICS_ENABLED:
+            metrics.start(task.request, published_at)
+        level = task_settings.start_log_level
+        if sampling.is_sampled() and logger_levels.is_enabled_for(level):
+            logger.log(level, "task_started", task=task.name)
 
     def receiver_task_retry(
         self,
@@ -109,22 +279,29 @@ class CeleryReceiver:
         einfo: Optional[Any] = None,
         **kwargs: Any,
     ) -> None:
-        logger.log(
-            app_settings.CELERY_TASK_NOTICE_LOG_LEVEL, "task_retrying", reason=reason
-        )
+        level = app_settings.snapshot.CELERY_TASK_NOTICE_LOG_LEVEL
+        if logger_levels.is_enabled_for(level):
+            logger.log(level, "task_retrying", reason=reason)
 
     def receiver_task_success(
         self, result: Optional[str] = None, sender: Optional[Any] = None, **kwargs: Any
     ) -> None:
-        signals.pre_task_succeeded.send(
-            sender=self.receiver_task_success, logger=logger, result=result
+        if signals.pre_task_succeeded.has_listeners(self.receiver_task_success):
+            signals.pre_task_succeeded.send(
+                sender=self.receiver_task_success, logger=logger, result=result
+            )
+
+        task_settings = app_settings.snapshot.celery_task_overrides.get(
+            getattr(sender, "name", None)
         )
+        level = task_settings.success_log_level
+        if not sampling.is_sampled() or not logger_levels.is_enabled_for(level):
+            return
 
         log_vars: dict[str, Any] = {}
         self.add_duration_ms(sender, log_vars)
-        logger.log(
-            app_settings.CELERY_TASK_SUCCESS_LOG_LEVEL, "task_succeeded", **log_vars
-        )
+        self.add_metrics(sender, log_vars)
+        logger.log(level, "task_succeeded", **log_vars)
 
     def receiver_task_failure(
         self,
@@ -136,12 +313,22 @@ class CeleryReceiver:
         *args: Any,
         **kwargs: Any,
     ) -> None:
+        throws = getattr(sender, "throws", ())
+        expected = isinstance(exception, throws)
+        level = (
+            app_settings.snapshot.CELERY_TASK_FAILURE_LOG_LEVEL
+            if expected
+            else logging.ERROR
+        )
+        if not logger_levels.is_enabled_for(level):
+            return
+
         log_vars: dict[str, Any] = {}
         self.add_duration_ms(sender, log_vars)
-        throws = getattr(sender, "throws", ())
-        if isinstance(exception, throws):
+        self.add_metrics(sender, log_vars)
+        if expected:
             logger.log(
-                app_settings.CELERY_TASK_FAILURE_LOG_LEVEL,
+                level,
                 "task_failed",
                 error=str(exception),
                 **log_vars,
@@ -164,6 +351,11 @@ class CeleryReceiver:
                 (time.monotonic_ns() - started_at) / 1_000_000
             )
 
+    @classmethod
+    def add_metrics(cls, task: Optional[Type[Any]], log_vars: dict[str, Any]) -> None:
+        if task and app_settings.snapshot.CELERY_TASK_METRICS_ENABLED:
+            metrics.add_metrics(task.request, log_vars)
+
     def receiver_task_revoked(
         self,
         request: Any,
@@ -172,12 +364,21 @@ class CeleryReceiver:
         expired: Optional[Any] = None,
         **kwargs: Any,
     ) -> None:
-        metadata = getattr(request, "__django_structlog__", {}).copy()
+        level = app_settings.snapshot.CELERY_TASK_NOTICE_LOG_LEVEL
+        if not logger_levels.is_enabled_for(level):
+            return
+
+        metadata = getattr(request, "__django_structlog__", {})
+        context_codec = app_settings.snapshot.celery_context_codec
+        if context_codec is not None:
+            metadata = context_codec.decode(metadata)
+        metadata = dict(metadata)
+        metadata.pop(metrics.PUBLISHED_AT, None)
         metadata["task_id"] = request.id
         metadata["task"] = request.task
 
         logger.log(
-            app_settings.CELERY_TASK_NOTICE_LOG_LEVEL,
+            level,
             "task_revoked",
             terminated=terminated,
             signum=signum.value if signum is not None else None,
@@ -194,19 +395,17 @@ class CeleryReceiver:
         id: Optional[str] = None,
         **kwargs: Any,
     ) -> None:
-        logger.log(
-            app_settings.CELERY_TASK_ERROR_LOG_LEVEL,
-            "task_not_found",
-            task=name,
-            task_id=id,
-        )
+        level = app_settings.snapshot.CELERY_TASK_ERROR_LOG_LEVEL
+        if logger_levels.is_enabled_for(level):
+            logger.log(level, "task_not_found", task=name, task_id=id)
 
     def receiver_task_rejected(
         self, message: Any, exc: Optional[Exception] = None, **kwargs: Any
     ) -> None:
-        logger.exception(
-            "task_rejected", task_id=message.properties.get("correlation_id")
-        )
+        if logger_levels.is_enabled_for(logging.ERROR):
+            logger.exception(
+                "task_rejected", task_id=message.properties.get("correlation_id")
+            )
 
     def connect_signals(self) -> None:
         before_task_publish.connect(self.receiver_before_task_publish)
@@ -1,6 +1,6 @@
-import django.dispatch
+from ..dispatch import Signal
 
-bind_extra_task_metadata = django.dispatch.Signal()
+bind_extra_task_metadata = Signal("bind_extra_task_metadata")
 """ Signal to add extra ``structlog`` bindings from ``celery``'s task.
 
 :param task: the celery task being run
@@ -17,7 +17,7 @@ bind_extra_task_metadata = django.dispatch.Signal()
 """
 
 
-modify_context_before_task_publish = django.dispatch.Signal()
+modify_context_before_task_publish = Signal("modify_context_before_task_publish")
 """ Signal to modify context passed over to ``celery`` task's context. You must modify the ``context`` dict.
 
 :param context: the context dict that will be passed over to the task runner's logger
@@ -40,7 +40,7 @@ modify_context_before_task_publish = django.dispatch.Signal()
 
 """
 
-pre_task_succeeded = django.dispatch.Signal()
+pre_task_succeeded = Signal("pre_task_succeeded")
 """ Signal to add ``structlog`` bindings from ``celery``'s successful task.
 
 :param logger: the logger to bind more metadata or override existing bound metadata
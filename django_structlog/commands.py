@@ -1,3 +1,4 @@
+import logging
 import uuid
 from typing import TYPE_CHECKING, Any, List, Mapping, Tuple, Type
 
@@ -7,10 +8,13 @@ from django_extensions.management.signals import (
     pre_command,
 )
 
+from .levels import LevelChecker
+
 if TYPE_CHECKING:  # pragma: no cover
     import contextvars
 
 logger = structlog.getLogger(__name__)
+logger_levels = LevelChecker(__name__)
 
 
 class DjangoCommandReceiver:
@@ -30,15 +34,17 @@ class DjangoCommandReceiver:
             tokens = structlog.contextvars.bind_contextvars(command_id=command_id)
         self.stack.append((command_id, tokens))
 
-        logger.info(
-            "command_started",
-            command_name=sender.__module__.replace(".management.commands", ""),
-        )
+        if logger_levels.is_enabled_for(logging.INFO):
+            logger.info(
+                "command_started",
+                command_name=sender.__module__.replace(".management.commands", ""),
+            )
 
     def post_receiver(
         self, sender: Type[Any], outcome: str, *args: Any, **kwargs: Any
     ) -> None:
-        logger.info("command_finished")
+        if logger_levels.is_enabled_for(logging.INFO):
+            logger.info("command_finished")
 
         if len(self.stack):  # pragma: no branch
             command_id, tokens = self.stack.pop()
@@ -0,0 +1,83 @@
+import logging
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
+import structlog
+
+if TYPE_CHECKING:  # pragma: no cover
+    from structlog.typing import Processor
+
+
+def get_processors(
+    stdlib: bool = True,
+    processors: Sequence["Processor"] = (),
+    renderer: Optional["Processor"] = None,
+) -> list["Processor"]:
+    """Processors of :func:`configure`, for projects calling ``structlog.configure``
+    themselves."""
+    chain: list["Processor"] = []
+    if stdlib:
+        # drops disabled events before any other processor runs
+        chain += [
+            structlog.stdlib.filter_by_level,
+            structlog.contextvars.merge_contextvars,
+            structlog.stdlib.add_logger_name,
+        ]
+    else:
+        chain.append(structlog.contextvars.merge_contextvars)
+    chain += [
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.PositionalArgumentsFormatter(),
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+        *processors,
+    ]
+    if stdlib:
+        chain.append(structlog.stdlib.ProcessorFormatter.wrap_for_formatter)
+    else:
+        if renderer is None:
+            from .renderers import JSONRenderer
+
+            renderer = JSONRenderer(bytes_output=True)
+        chain.append(renderer)
+    return chain
+
+
+def configure(
+    stdlib: bool = True,
+    processors: Sequence["Processor"] = (),
+    renderer: Optional["Processor"] = None,
+    level: int = logging.INFO,
+    **kwargs: Any,
+) -> None:
+    """Configures ``structlog`` with a processor chain suited for ``django-structlog``.
+
+    With ``stdlib=True`` events are passed to ``logging``, whose ``LOGGING`` setting
+    decides the levels, the handlers and the rendering (with
+    ``structlog.stdlib.ProcessorFormatter``).
+
+    With ``stdlib=False`` events of ``structlog`` loggers below ``level`` are dropped
+    before any processor runs, then rendered by ``renderer`` and printed to the standard
+    output. The default renderer is :class:`django_structlog.renderers.JSONRenderer`,
+    writing bytes. Records of ``logging`` are still handled by ``LOGGING``.
+
+    ``processors`` are inserted before the rendering and other keyword arguments are
+    passed to ``structlog.configure``.
+
+    >>> import django_structlog
+    >>> django_structlog.configure()
+
+    """
+    if stdlib:
+        kwargs.setdefault("logger_factory", structlog.stdlib.LoggerFactory())
+        kwargs.setdefault("wrapper_class", structlog.stdlib.BoundLogger)
+    else:
+        if renderer is None:
+            kwargs.setdefault("logger_factory", structlog.BytesLoggerFactory())
+        else:
+            kwargs.setdefault("logger_factory", structlog.PrintLoggerFactory())
+        kwargs.setdefault("wrapper_class", structlog.make_filtering_bound_logger(level))
+    kwargs.setdefault("cache_logger_on_first_use", True)
+    structlog.configure(
+        processors=get_processors(stdlib, processors, renderer), **kwargs
+    )
@@ -0,0 +1,58 @@
+from typing import Any, Callable, Optional
+
+import django.dispatch
+
+from .app_settings import app_settings
+
+
+class Signal(django.dispatch.Signal):
+    """``django.dispatch.Signal`` which also calls the hooks of ``DJANGO_STRUCTLOG_HOOKS``.
+
+    Hooks are plain callables called directly, before the receivers, with the same
+    arguments. :meth:`has_listeners` remembers whether receivers were ever connected so
+    callers can skip building the arguments of a signal nobody listens to.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name = name
+        self._has_receivers = False
+
+    def connect(
+        self,
+        receiver: Callable[..., Any],
+        sender: Optional[Any] = None,
+        weak: bool = True,
+        dispatch_uid: Optional[Any] = None,
+    ) -> None:
+        super().connect(receiver, sender=sender, weak=weak, dispatch_uid=dispatch_uid)
+        self._has_receivers = True
+
+    def disconnect(
+        self,
+        receiver: Optional[Callable[..., Any]] = None,
+        sender: Optional[Any] = None,
+        dispatch_uid: Optional[Any] = None,
+    ) -> bool:
+        disconnected = super().disconnect(
+            receiver, sender=sender, dispatch_uid=dispatch_uid
+        )
+        self._has_receivers = bool(self.receivers)
+        return disconnected
+
+    @property
+    def hooks(self) -> tuple[Callable[..., Any], ...]:
+        return app_settings.snapshot.HOOKS.get(self.name, ())
+
+    def has_listeners(self, sender: Optional[Any] = None) -> bool:
+        return bool(self.hooks) or (
+            self._has_receivers and super().has_listeners(sender)
+        )
+
+    def send(self, sender: Any, **named: Any) -> list[tuple[Any, Any]]:
+        responses = [
+            (hook, hook(signal=self, sender=sender, **named)) for hook in self.hooks
+        ]
+        if self._has_receivers:
+            responses += super().send(sender, **named)
+        return responses
@@ -0,0 +1,447 @@
+"""Logging handlers keeping log I/O off the request path.
+
+See :doc:`handlers`.
+"""
+
+import collections
+import contextvars
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import traceback
+import weakref
+from typing import TYPE_CHECKING, Literal, Optional, Sequence, Union, cast
+
+import structlog
+
+if TYPE_CHECKING:  # pragma: no cover
+    from structlog.typing import EventDict, Processor
+
+logger = structlog.getLogger(__name__)
+
+DropPolicy = Literal["drop_oldest", "drop_newest", "block"]
+
+_forked_handlers: "weakref.WeakSet[Union[QueueHandler, BatchingFileHandler]]" = (
+    weakref.WeakSet()
+)
+
+
+def _get_handlers(handlers: Sequence[logging.Handler]) -> tuple[logging.Handler, ...]:
+    """Checks ``handlers``, instances or ``"cfg://handlers.<name>"`` references.
+
+    ``dictConfig`` converts the references when the items of its lists are accessed by
+    index, into the handlers it configured already. It configures them in the sorted
+    order of their names.
+    """
+    resolved = []
+    for i in range(len(handlers)):
+        handler = handlers[i]
+        if not isinstance(handler, logging.Handler):
+            raise ValueError(
+                f"{handler!r} is not a handler, reference handlers configured before "
+                'this one with "cfg://handlers.<name>"'
+            )
+        resolved.append(handler)
+    return tuple(resolved)
+
+
+def _handle(handlers: Sequence[logging.Handler], record: logging.LogRecord) -> None:
+    for handler in handlers:
+        if record.levelno >= handler.level:
+            handler.handle(record)
+
+
+class QueueHandler(logging.Handler):
+    """Emits records with other handlers from a background thread.
+
+    ``emit`` only appends the record and a copy of the context to a buffer of ``maxsize``
+    records, so ``merge_contextvars`` of a ``foreign_pre_chain`` still sees the context of
+    the request. When the buffer is full, ``policy`` drops the oldest record
+    (``"drop_oldest"``), drops the new record (``"drop_newest"``) or waits for room
+    (``"block"``).
+
+    Dropped records are counted in :attr:`dropped_events` and reported every
+    ``report_interval`` seconds with a ``log_events_dropped`` event.
+
+    Closing the handler emits the remaining records, then flushes and closes
+    ``handlers``.
+
+    >>> LOGGING = {
+    ...     # ...
+    ...     "handlers": {
+    ...         "json_file": {
+    ...             "class": "logging.handlers.WatchedFileHandler",
+    ...             "filename": "logs/json.log",
+    ...             "formatter": "json_formatter",
+    ...         },
+    ...         "queue": {
+    ...             "()": "django_structlog.handlers.QueueHandler",
+    ...             "handlers": ["cfg://handlers.json_file"],
+    ...         },
+    ...     },
+    ... }
+
+    """
+
+    dropped_events: int
+    """Number of records dropped since the handler was created."""
+
+    def __init__(
+        self,
+        handlers: Sequence[logging.Handler],
+        maxsize: int = 10000,
+        policy: DropPolicy = "drop_oldest",
+        report_interval: float = 60.0,
+        level: Union[int, str] = logging.NOTSET,
+    ) -> None:
+        super().__init__(level)
+        if policy not in ("drop_oldest", "drop_newest", "block"):
+            raise ValueError(f"Unknown drop policy {policy!r}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.report_interval = report_interval
+        self.dropped_events = 0
+        self._handlers = _get_handlers(handlers)
+        self._closing = False
+        self._reset()
+        _forked_handlers.add(self)
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._done = threading.Condition(self._lock)
+        self._buffer: collections.deque[tuple[logging.LogRecord, contextvars.Context]]
+        self._buffer = collections.deque()
+        self._pending = 0
+        self._reported_dropped_events = self.dropped_events
+        self._thread: Optional[threading.Thread] = None
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name=f"{__name__}.QueueHandler", daemon=True
+        )
+        self._thread.start()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # unlike ``logging.Handler.handle`` the handler lock is not acquired: producers
+        # waiting for room must not block the background thread
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return bool(rv)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self._closing or threading.current_thread() is self._thread:
+                # a target handler logging would wait for itself on a full buffer
+                self._handle(record)
+                return
+            if record.args:
+                # arguments may be mutated once the logging call returns
+                record.msg = record.getMessage()
+                record.args = None
+            item = (record, contextvars.copy_context())
+            with self._lock:
+                if self._thread is None:
+                    self._start()
+                if len(self._buffer) >= self.maxsize:
+                    if self.policy == "block":
+                        while len(self._buffer) >= self.maxsize and not self._closing:
+                            self._not_full.wait()
+                    elif self.policy == "drop_newest":
+                        self.dropped_events += 1
+                        return
+                    else:
+                        self._buffer.popleft()
+                        self._pending -= 1
+                        self.dropped_events += 1
+                self._buffer.append(item)
+                self._pending += 1
+                self._not_empty.notify()
+        except Exception:
+            self.handleError(record)
+
+    def _handle(self, record: logging.LogRecord) -> None:
+        _handle(self._handlers, record)
+
+    def _run(self) -> None:
+        next_report = time.monotonic() + self.report_interval
+        thread = threading.current_thread()
+        # a thread started before ``_reset`` must not take the records of the next one
+        while self._thread is thread:
+            with self._lock:
+                while not self._buffer and not self._closing:
+                    timeout = next_report - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._not_empty.wait(timeout)
+                items = self._buffer
+                self._buffer = collections.deque()
+                closing = self._closing
+                self._not_full.notify_all()
+            for record, context in items:
+                try:
+                    context.run(self._handle, record)
+                except Exception:
+                    self.handleError(record)
+            with self._lock:
+                self._pending -= len(items)
+                if not self._pending:
+                    self._done.notify_all()
+            if closing or time.monotonic() >= next_report:
+                next_report = time.monotonic() + self.report_interval
+                self._report_dropped_events()
+            if closing and not items:
+                return
+
+    def _report_dropped_events(self) -> None:
+        with self._lock:
+            dropped_events = self.dropped_events - self._reported_dropped_events
+            self._reported_dropped_events = self.dropped_events
+        if dropped_events:
+            logger.warning("log_events_dropped", dropped_events=dropped_events)
+
+    def flush(self) -> None:
+        """Waits until the background thread emitted the buffered records."""
+        with self._lock:
+            if threading.current_thread() is self._thread:
+                return
+            while self._pending and self._thread is not None:
+                self._done.wait()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closing = True
+            thread = self._thread
+            self._not_empty.notify()
+            self._not_full.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        # ``logging.shutdown`` may close the handlers before this one, a file handler
+        # would open its file again for the remaining records
+        for handler in self._handlers:
+            try:
+                handler.flush()
+                handler.close()
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc()
+        super().close()
+
+
+class FanOutHandler(logging.Handler):
+    """Runs ``foreign_pre_chain`` once per record of the standard library, then emits
+    the record with ``handlers``.
+
+    The record is passed to ``handlers`` like a record of ``structlog``, so their
+    ``structlog.stdlib.ProcessorFormatter`` only run their ``processors`` (ex: the
+    renderer). Records of ``structlog`` are passed as is.
+
+    ``use_get_message`` and ``pass_foreign_args`` work like the arguments of
+    ``structlog.stdlib.ProcessorFormatter``, whose own values no longer apply.
+
+    >>> import structlog
+    >>>
+    >>> LOGGING = {
+    ...     # ...
+    ...     "handlers": {
+    ...         "stdlib_fan_out": {
+    ...             "()": "django_structlog.handlers.FanOutHandler",
+    ...             "handlers": [
+    ...                 "cfg://handlers.colored_stream",
+    ...                 "cfg://handlers.json_file",
+    ...             ],
+    ...             "foreign_pre_chain": [
+    ...                 structlog.contextvars.merge_contextvars,
+    ...                 structlog.processors.TimeStamper(fmt="iso"),
+    ...                 structlog.stdlib.add_logger_name,
+    ...                 structlog.stdlib.add_log_level,
+    ...                 structlog.stdlib.PositionalArgumentsFormatter(),
+    ...             ],
+    ...         },
+    ...     },
+    ... }
+
+    """
+
+    def __init__(
+        self,
+        handlers: Sequence[logging.Handler],
+        foreign_pre_chain: Sequence["Processor"] = (),
+        level: Union[int, str] = logging.NOTSET,
+        use_get_message: bool = True,
+        pass_foreign_args: bool = False,
+    ) -> None:
+        super().__init__(level)
+        self.foreign_pre_chain = tuple(foreign_pre_chain)
+        self.use_get_message = use_get_message
+        self.pass_foreign_args = pass_foreign_args
+        self._handlers = _get_handlers(handlers)
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # the handlers have their own lock
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return bool(rv)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            # attributes set by ``structlog.stdlib.ProcessorFormatter.wrap_for_formatter``
+            if not hasattr(record, "_logger"):
+                record = self._pre_process(record)
+            _handle(self._handlers, record)
+        except Exception:
+            self.handleError(record)
+
+    def _pre_process(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Same as ``structlog.stdlib.ProcessorFormatter.format`` for records of the
+        standard library, up to ``foreign_pre_chain``."""
+        record = logging.makeLogRecord(record.__dict__)
+        meth_name = record.levelname.lower()
+        event_dict: "EventDict" = {
+            "event": record.getMessage() if self.use_get_message else str(record.msg),
+            "_record": record,
+            "_from_structlog": False,
+        }
+        if self.pass_foreign_args:
+            event_dict["positional_args"] = record.args
+        record.args = ()
+        if record.exc_info:
+            event_dict["exc_info"] = record.exc_info
+        if record.stack_info:
+            event_dict["stack_info"] = record.stack_info
+        for processor in self.foreign_pre_chain:
+            event_dict = cast("EventDict", processor(None, meth_name, event_dict))
+        # set again by the formatters of ``handlers``
+        event_dict.pop("_record", None)
+        event_dict.pop("_from_structlog", None)
+
+        record.msg = event_dict
+        setattr(record, "_logger", None)
+        setattr(record, "_name", meth_name)
+        return record
+
+
+class BatchingFileHandler(logging.handlers.WatchedFileHandler):
+    """``WatchedFileHandler`` writing the formatted records in batches.
+
+    Records are written once ``buffer_size`` characters are buffered, every
+    ``flush_interval`` seconds by a background thread and when the handler is flushed or
+    closed. The file is checked for rotation at most once per ``watch_interval``
+    seconds (never with ``None``) instead of once per record.
+
+    >>> LOGGING = {
+    ...     # ...
+    ...     "handlers": {
+    ...         "json_file": {
+    ...             "class": "django_structlog.handlers.BatchingFileHandler",
+    ...             "filename": "logs/json.log",
+    ...             "formatter": "json_formatter",
+    ...         },
+    ...     },
+    ... }
+
+    """
+
+    def __init__(
+        self,
+        filename: "Union[str, os.PathLike[str]]",
+        mode: str = "a",
+        encoding: Optional[str] = None,
+        delay: bool = False,
+        errors: Optional[str] = None,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        watch_interval: Optional[float] = 1.0,
+    ) -> None:
+        super().__init__(filename, mode, encoding, delay, errors)
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.watch_interval = watch_interval
+        self._closing = threading.Event()
+        self._reset()
+        _forked_handlers.add(self)
+
+    def _reset(self) -> None:
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._watched_at = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + self.terminator
+            self._buffer.append(line)
+            self._buffered += len(line)
+            if self._buffered >= self.buffer_size or self._closing.is_set():
+                self._write()
+            elif self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"{__name__}.BatchingFileHandler",
+                    daemon=True,
+                )
+                self._thread.start()
+        except Exception:
+            self.handleError(record)
+
+    def _write(self) -> None:
+        """Writes the buffer, the handler lock must be held."""
+        if not self._buffer:
+            return
+        data = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+        if self.watch_interval is not None:
+            now = time.monotonic()
+            if now - self._watched_at >= self.watch_interval:
+                self._watched_at = now
+                self.reopenIfNeeded()
+        if self.stream is None:
+            if self.mode == "w" and self._closed:
+                return
+            self.stream = self._open()
+            self._statstream()
+        self.stream.write(data)
+        self.stream.flush()
+
+    def _run(self) -> None:
+        thread = threading.current_thread()
+        # a thread started before ``_reset`` must let the next one flush
+        while self._thread is thread and not self._closing.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc()
+
+    def flush(self) -> None:
+        with self.lock:  # type: ignore[union-attr]
+            self._write()
+
+    def close(self) -> None:
+        self._closing.set()
+        with self.lock:  # type: ignore[union-attr]
+            try:
+                self._write()
+            finally:
+                super().close()
+
+
+def _reset_after_fork() -> None:
+    """The background threads of the parent are not in the forked process and its
+    buffered records are written by the parent."""
+    for handler in _forked_handlers:
+        handler._reset()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,70 @@
+"""Level checks of the events logged by ``django-structlog``.
+
+The events are built (keyword arguments, formatted request, signals completing them)
+only when their level is enabled, see :class:`LevelChecker`.
+
+"""
+
+import logging
+from typing import Any, Optional
+
+import structlog
+
+
+def is_enabled_for(logger: Any, level: int) -> bool:
+    """Whether the bound logger ``logger`` emits events of ``level``.
+
+    ``structlog.stdlib.BoundLogger`` asks its ``logging`` logger, which caches the
+    answer until the ``logging`` configuration changes. The filtering bound loggers of
+    ``structlog.make_filtering_bound_logger`` compare with their minimum level. Other
+    loggers are assumed to emit every level.
+    """
+    if isinstance(logger, structlog.stdlib.BoundLogger):
+        return logger.isEnabledFor(level)
+    # looked up on the class: ``structlog.BoundLogger`` proxies any other attribute as
+    # a log method
+    if hasattr(type(logger), "is_enabled_for"):
+        return bool(logger.is_enabled_for(level))
+    return True
+
+
+class LevelChecker:
+    """Levels enabled for the ``structlog`` logger ``name``.
+
+    The logger is resolved on the first check and again when ``structlog.configure``
+    changes the wrapper class or the logger factory. When ``structlog`` writes to
+    ``logging`` loggers (``structlog.stdlib.LoggerFactory``) through another bound
+    logger, such as a filtering one, the level of the ``logging`` logger is checked as
+    well.
+    """
+
+    __slots__ = ("_name", "_config", "_logger", "_stdlib_logger")
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._config: Optional[tuple[Any, Any]] = None
+        self._logger: Any = None
+        self._stdlib_logger: Optional[logging.Logger] = None
+
+    def _resolve(self, config: tuple[Any, Any]) -> None:
+        wrapper_class, logger_factory = config
+        logger = structlog.get_logger(self._name).bind()
+        self._stdlib_logger = (
+            logging.getLogger(self._name)
+            if not isinstance(logger, structlog.stdlib.BoundLogger)
+            and isinstance(logger_factory, structlog.stdlib.LoggerFactory)
+            else None
+        )
+        self._logger = logger
+        self._config = config
+
+    def is_enabled_for(self, level: int) -> bool:
+        """Whether the logger emits events of ``level``, see :func:`is_enabled_for`."""
+        structlog_config = structlog.get_config()
+        config = (structlog_config["wrapper_class"], structlog_config["logger_factory"])
+        if config != self._config:
+            self._resolve(config)
+        if not is_enabled_for(self._logger, level):
+            return False
+        stdlib_logger = self._stdlib_logger
+        return stdlib_logger is None or stdlib_logger.isEnabledFor(level)
@@ -1,6 +1,10 @@
 import asyncio
+import logging
 import sys
+import time
 import uuid
+import weakref
+from types import MappingProxyType
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -8,22 +12,31 @@ from typing import (
     AsyncIterator,
     Awaitable,
     Callable,
+    ClassVar,
+    Collection,
     Generator,
     Iterator,
+    Mapping,
+    Optional,
     Type,
     Union,
     cast,
 )
+from urllib.parse import unquote_plus
 
 import structlog
 from asgiref import sync
+from django.contrib.auth import SESSION_KEY, get_user_model
 from django.core.exceptions import PermissionDenied
 from django.core.signals import got_request_exception
 from django.http import Http404, StreamingHttpResponse
-from django.utils.functional import SimpleLazyObject
+from django.utils.encoding import escape_uri_path, iri_to_uri
+from django.utils.functional import LazyObject, SimpleLazyObject, empty
+from ipware import get_client_ip  # type: ignore[import-untyped]
 
-from .. import signals
+from .. import sampling, signals
 from ..app_settings import app_settings
+from ..levels import LevelChecker
 
 if sys.version_info >= (3, 12, 0):
     from inspect import (  # type: ignore[attr-defined]
@@ -39,10 +52,14 @@ else:
 if TYPE_CHECKING:  # pragma: no cover
     from types import TracebackType
 
+    import django.dispatch
     from django.contrib.auth.base_user import AbstractBaseUser
     from django.http import HttpRequest, HttpResponse
 
 logger = structlog.getLogger(__name__)
+logger_levels = LevelChecker(__name__)
+
+_NO_LOG_KWARGS: Mapping[str, Any] = MappingProxyType({})
 
 
 def get_request_header(request: "HttpRequest", header_key: str, meta_key: str) -> Any:
@@ -52,37 +69,155 @@ def get_request_header(request: "HttpRequest", header_key: str, meta_key: str) -
     return request.META.get(meta_key)
 
 
+def _elapsed_ms(started_at: int) -> int:
+    return round((time.monotonic_ns() - started_at) / 1_000_000)
+
+
 def sync_streaming_content_wrapper(
-    streaming_content: Iterator[bytes], context: Any
+    streaming_content: Iterator[bytes],
+    context: Any,
+    started_at: Optional[int] = None,
 ) -> Generator[bytes, None, None]:
+    snapshot = app_settings.snapshot
+    sampled = context.get("sampled", True)
+    if started_at is None:
+        started_at = time.monotonic_ns()
     with structlog.contextvars.bound_contextvars(**context):
-        logger.log(app_settings.STATUS_START_LOG_LEVEL, "streaming_started")
+        if sampled and logger_levels.is_enabled_for(snapshot.STATUS_START_LOG_LEVEL):
+            logger.log(snapshot.STATUS_START_LOG_LEVEL, "streaming_started")
+        chunks = iter(streaming_content)
+        ttfb_ms = None
+        chunk_count = bytes_sent = 0
         try:
-            for chunk in streaming_content:
+            # the first chunk is taken apart to keep the loop below free of branches
+            for chunk in chunks:
+                ttfb_ms = _elapsed_ms(started_at)
+                chunk_count = 1
+                bytes_sent = len(chunk)
+                yield chunk
+                break
+            for chunk in chunks:
+                chunk_count += 1
+                bytes_sent += len(chunk)
                 yield chunk
         except Exception:
             logger.exception("streaming_failed")
             raise
         else:
-            logger.log(app_settings.STATUS_2XX_LOG_LEVEL, "streaming_finished")
+            if sampled and logger_levels.is_enabled_for(snapshot.STATUS_2XX_LOG_LEVEL):
+                logger.log(
+                    snapshot.STATUS_2XX_LOG_LEVEL,
+                    "streaming_finished",
+                    ttfb_ms=ttfb_ms,
+                    duration_ms=_elapsed_ms(started_at),
+                    bytes_sent=bytes_sent,
+                    chunk_count=chunk_count,
+                )
 
 
 async def async_streaming_content_wrapper(
-    streaming_content: AsyncIterator[bytes], context: Any
+    streaming_content: AsyncIterator[bytes],
+    context: Any,
+    started_at: Optional[int] = None,
 ) -> AsyncGenerator[bytes, Any]:
+    snapshot = app_settings.snapshot
+    sampled = context.get("sampled", True)
+    if started_at is None:
+        started_at = time.monotonic_ns()
     with structlog.contextvars.bound_contextvars(**context):
-        logger.log(app_settings.STATUS_START_LOG_LEVEL, "streaming_started")
+        if sampled and logger_levels.is_enabled_for(snapshot.STATUS_START_LOG_LEVEL):
+            logger.log(snapshot.STATUS_START_LOG_LEVEL, "streaming_started")
+        chunks = aiter(streaming_content)
+        ttfb_ms = None
+        chunk_count = bytes_sent = 0
         try:
-            async for chunk in streaming_content:
+            # the first chunk is taken apart to keep the loop below free of branches
+            async for chunk in chunks:
+                ttfb_ms = _elapsed_ms(started_at)
+                chunk_count = 1
+                bytes_sent = len(chunk)
+                yield chunk
+                break
+            async for chunk in chunks:
+                chunk_count += 1
+                bytes_sent += len(chunk)
                 yield chunk
         except asyncio.CancelledError:
-            logger.log(app_settings.REQUEST_CANCELLED_LOG_LEVEL, "streaming_cancelled")
+            logger.log(snapshot.REQUEST_CANCELLED_LOG_LEVEL, "streaming_cancelled")
             raise
         except Exception:
             logger.exception("streaming_failed")
             raise
         else:
-            logger.log(app_settings.STATUS_2XX_LOG_LEVEL, "streaming_finished")
+            if sampled and logger_levels.is_enabled_for(snapshot.STATUS_2XX_LOG_LEVEL):
+                logger.log(
+                    snapshot.STATUS_2XX_LOG_LEVEL,
+                    "streaming_finished",
+                    ttfb_ms=ttfb_ms,
+                    duration_ms=_elapsed_ms(started_at),
+                    bytes_sent=bytes_sent,
+                    chunk_count=chunk_count,
+                )
+
+
+def get_proxied_ip(
+    request: "HttpRequest", header: str, proxy_count: int
+) -> Optional[str]:
+    """Client ip from a header set by ``proxy_count`` trusted proxies, such as
+    ``HTTP_X_FORWARDED_FOR``. Each proxy appends the address it received the request from:
+    the client's is the ``proxy_count``-th from the right. Values added before are
+    ignored since the client can forge them.
+
+    ``REMOTE_ADDR`` is used when the header is missing or the selected entry is empty.
+    """
+    value: Optional[str] = request.META.get(header)
+    if value:
+        ips = value.split(",")
+        ip = ips[max(len(ips) - proxy_count, 0)].strip()
+        if ip:
+            return ip
+    return request.META.get("REMOTE_ADDR")
+
+
+def _redact_query_param(param: str, redacted_params: Collection[str]) -> str:
+    name = param.partition("=")[0]
+    if unquote_plus(name) in redacted_params:
+        return f"{name}=[REDACTED]"
+    return param
+
+
+def format_query_string(request: "HttpRequest") -> str:
+    """Query string of the request with the values of
+    ``DJANGO_STRUCTLOG_REQUEST_QUERY_REDACTED_PARAMS`` replaced by ``[REDACTED]`` and
+    truncated to ``DJANGO_STRUCTLOG_REQUEST_QUERY_MAX_LENGTH`` characters."""
+    snapshot = app_settings.snapshot
+    query_string: str = request.META.get("QUERY_STRING", "")
+    redacted_params = snapshot.REQUEST_QUERY_REDACTED_PARAMS
+    if query_string and redacted_params:
+        query_string = "&".join(
+            _redact_query_param(param, redacted_params)
+            for param in query_string.split("&")
+        )
+    query_string = iri_to_uri(query_string)
+    max_length = snapshot.REQUEST_QUERY_MAX_LENGTH
+    if max_length is not None and len(query_string) > max_length:
+        query_string = query_string[:max_length] + "..."
+    return query_string
+
+
+class _SessionAccessRestoringUser(SimpleLazyObject):
+    """Wraps an already evaluated ``request.user`` to flag the session as accessed
+    only if the user is used again. Evaluating it never hits the database."""
+
+
+def _is_unevaluated_user(user: Any) -> bool:
+    # ``isinstance`` would evaluate the lazy object through its ``__class__``
+    user_type = type(user)
+    return (
+        issubclass(user_type, LazyObject)
+        and user_type is not _SessionAccessRestoringUser
+        and getattr(user, "_wrapped") is empty
+    )
 
 
 class RequestMiddleware:
@@ -98,6 +233,8 @@ class RequestMiddleware:
     sync_capable = True
     async_capable = True
 
+    _latest_instance: ClassVar["Optional[weakref.ref[RequestMiddleware]]"] = None
+
     def __init__(
         self,
         get_response: Callable[
@@ -108,7 +245,8 @@ class RequestMiddleware:
         self.get_response = get_response
         if iscoroutinefunction(self.get_response):
             markcoroutinefunction(self)
-        got_request_exception.connect(self.process_got_request_exception)
+        # exceptions are dispatched by the module level receiver, see below
+        RequestMiddleware._latest_instance = weakref.ref(self)
 
     def __call__(
         self, request: "HttpRequest"
@@ -121,36 +259,139 @@ class RequestMiddleware:
         return response
 
     async def __acall__(self, request: "HttpRequest") -> "HttpResponse":
-        await sync.sync_to_async(self.prepare)(request)
+        if self._requires_thread(request, signals.bind_extra_request_metadata):
+            await sync.sync_to_async(self.prepare)(request)
+        else:
+            self.prepare(request)
         try:
             response = await cast(Awaitable["HttpResponse"], self.get_response(request))
         except asyncio.CancelledError:
-            logger.log(app_settings.REQUEST_CANCELLED_LOG_LEVEL, "request_cancelled")
+            started_kwargs = self._pop_request_started_kwargs(request)
+            level = app_settings.snapshot.REQUEST_CANCELLED_LOG_LEVEL
+            if logger_levels.is_enabled_for(level):
+                logger.log(level, "request_cancelled", **started_kwargs)
             raise
-        await sync.sync_to_async(self.handle_response)(request, response)
+        if self._requires_thread(
+            request,
+            (
+                signals.update_failure_response
+                if hasattr(request, "_raised_exception")
+                else signals.bind_extra_request_finished_metadata
+            ),
+        ):
+            await sync.sync_to_async(self.handle_response)(request, response)
+        else:
+            self.handle_response(request, response)
         return response
 
+    def _requires_thread(
+        self, request: "HttpRequest", signal: "django.dispatch.Signal"
+    ) -> bool:
+        """Whether ``prepare``/``handle_response`` may block and must leave the event loop.
+
+        It is the case when a receiver is connected to ``signal`` (it may be synchronous
+        and query the database) or when ``request.user`` was never evaluated
+        (evaluating it loads the session and the user).
+        """
+        if signal.has_listeners(self.__class__):
+            return True
+        if not app_settings.snapshot.USER_ID_FIELD:
+            return False
+        user = getattr(request, "user", None)
+        # unless ``bind_user_id`` already read its id from the session
+        return _is_unevaluated_user(user) and (
+            request.__dict__.get("_django_structlog_session_user") is not user
+        )
+
     def _log_level_for_status_code(self, status_code: int) -> int:
-        match status_code // 100:
-            case 2:
-                level = app_settings.STATUS_2XX_LOG_LEVEL
-            case 4:
-                level = app_settings.STATUS_4XX_LOG_LEVEL
-            case 5:
-                level = app_settings.STATUS_5XX_LOG_LEVEL
-            case _:
-                level = app_settings.STATUS_DEFAULT_LOG_LEVEL
-        return level
+        return app_settings.snapshot.log_level_for_status_code(status_code)
 
     def handle_response(self, request: "HttpRequest", response: "HttpResponse") -> None:
         if not hasattr(request, "_raised_exception"):
-            self.bind_user_id(request)
-            context = structlog.contextvars.get_merged_contextvars(logger)
+            started_kwargs = self._pop_request_started_kwargs(request)
+            enabled = self._is_sampled(
+                request, response
+            ) and logger_levels.is_enabled_for(
+                self._log_level_for_status_code(response.status_code)
+            )
+            # nothing to log nor to wrap: skip the work of an unsampled request
+            if (
+                enabled
+                or isinstance(response, StreamingHttpResponse)
+                or signals.bind_extra_request_finished_metadata.has_listeners(
+                    self.__class__
+                )
+            ):
+                self._handle_finished_response(
+                    request, response, started_kwargs, enabled
+                )
+
+        else:
+            exception = getattr(request, "_raised_exception")
+            delattr(request, "_raised_exception")
+            if signals.update_failure_response.has_listeners(self.__class__):
+                signals.update_failure_response.send(
+                    sender=self.__class__,
+                    request=request,
+                    response=response,
+                    logger=logger,
+                    exception=exception,
+                )
+        structlog.contextvars.clear_contextvars()
+        if not sampling.is_sampled():
+            sampling.set_sampled(True)
+
+    def _handle_finished_response(
+        self,
+        request: "HttpRequest",
+        response: "HttpResponse",
+        started_kwargs: Mapping[str, Any],
+        enabled: bool,
+    ) -> None:
+        self.bind_user_id(request)
+        # the context of the request is only needed to log the streaming events
+        context = (
+            structlog.contextvars.get_merged_contextvars(logger)
+            if isinstance(response, StreamingHttpResponse)
+            else None
+        )
 
-            log_kwargs = dict(
-                code=response.status_code,
-                request=self.format_request(request),
+        started_at = getattr(request, "_django_structlog_started_at", None)
+        if enabled or signals.bind_extra_request_finished_metadata.has_listeners(
+            self.__class__
+        ):
+            self._log_request_finished(
+                request, response, started_kwargs, started_at, enabled
             )
+        if isinstance(response, StreamingHttpResponse):
+            streaming_content = response.streaming_content
+            if response.is_async:
+                response.streaming_content = async_streaming_content_wrapper(
+                    cast(AsyncIterator[bytes], streaming_content),
+                    context,
+                    started_at,
+                )
+            else:
+                response.streaming_content = sync_streaming_content_wrapper(
+                    cast(Iterator[bytes], streaming_content), context, started_at
+                )
+
+    def _log_request_finished(
+        self,
+        request: "HttpRequest",
+        response: "HttpResponse",
+        started_kwargs: Mapping[str, Any],
+        started_at: Optional[int],
+        enabled: bool,
+    ) -> None:
+        log_kwargs: dict[str, Any] = {
+            "code": response.status_code,
+            **self._request_log_kwargs(request),
+        }
+        log_kwargs.update(started_kwargs)
+        if started_at is not None:
+            log_kwargs["duration_ms"] = _elapsed_ms(started_at)
+        if signals.bind_extra_request_finished_metadata.has_listeners(self.__class__):
             signals.bind_extra_request_finished_metadata.send(
                 sender=self.__class__,
                 request=request,
@@ -158,75 +399,159 @@ class RequestMiddleware:
                 response=response,
                 log_kwargs=log_kwargs,
             )
+        if enabled:
             level = self._log_level_for_status_code(response.status_code)
             logger.log(
                 level,
                 "request_finished",
                 **log_kwargs,
             )
-            if isinstance(response, StreamingHttpResponse):
-                streaming_content = response.streaming_content
-                if response.is_async:
-                    response.streaming_content = async_streaming_content_wrapper(
-                        cast(AsyncIterator[bytes], streaming_content), context
-                    )
-                else:
-                    response.streaming_content = sync_streaming_content_wrapper(
-                        cast(Iterator[bytes], streaming_content), context
-                    )
 
-        else:
-            exception = getattr(request, "_raised_exception")
-            delattr(request, "_raised_exception")
-            signals.update_failure_response.send(
-                sender=self.__class__,
-                request=request,
-                response=response,
-                logger=logger,
-                exception=exception,
-            )
-        structlog.contextvars.clear_contextvars()
+    def _is_sampled(self, request: "HttpRequest", response: "HttpResponse") -> bool:
+        """Whether ``request_finished`` is logged: the request was sampled, or its status
+        class or duration must always be logged."""
+        if sampling.is_sampled():
+            return True
+        snapshot = app_settings.snapshot
+        if response.status_code // 100 in snapshot.REQUEST_SAMPLING_KEEP_STATUS_CLASSES:
+            return True
+        started_at = getattr(request, "_django_structlog_started_at", None)
+        return (
+            started_at is not None
+            and snapshot.REQUEST_SAMPLING_KEEP_SLOWER_THAN_MS is not None
+            and (time.monotonic_ns() - started_at) / 1_000_000
+            >= snapshot.REQUEST_SAMPLING_KEEP_SLOWER_THAN_MS
+        )
 
     def prepare(self, request: "HttpRequest") -> None:
-        request_id = get_request_header(
-            request, "x-request-id", "HTTP_X_REQUEST_ID"
-        ) or str(uuid.uuid4())
+        setattr(request, "_django_structlog_middleware", self)
+        snapshot = app_settings.snapshot
+        request_id = (
+            get_request_header(request, "x-request-id", "HTTP_X_REQUEST_ID")
+            or snapshot.REQUEST_ID_GENERATOR()
+        )
         correlation_id = get_request_header(
             request, "x-correlation-id", "HTTP_X_CORRELATION_ID"
         )
         structlog.contextvars.bind_contextvars(request_id=request_id)
+        setattr(request, "_django_structlog_started_at", time.monotonic_ns())
+        sampled = True
+        request_sampler = snapshot.request_sampler
+        if request_sampler is not None:
+            sampled = request_sampler.sample(request_id, request.path)
+            sampling.bind_sampled(sampled)
         self.bind_user_id(request)
         if correlation_id:
             structlog.contextvars.bind_contextvars(correlation_id=correlation_id)
-        if app_settings.IP_LOGGING_ENABLED:
+        if snapshot.IP_LOGGING_ENABLED:
             self.bind_ip(request)
+        level = snapshot.STATUS_START_LOG_LEVEL
+        enabled = snapshot.REQUEST_SUMMARY_ENABLED or (
+            sampled and logger_levels.is_enabled_for(level)
+        )
+        # receivers may bind the context of the whole request: always sent
+        has_listeners = signals.bind_extra_request_metadata.has_listeners(
+            self.__class__
+        )
+        if not enabled and not has_listeners:
+            return
         log_kwargs = {
-            "request": self.format_request(request),
+            **self._request_log_kwargs(request),
             "user_agent": request.META.get("HTTP_USER_AGENT"),
         }
-        signals.bind_extra_request_metadata.send(
-            sender=self.__class__, request=request, logger=logger, log_kwargs=log_kwargs
+        if has_listeners:
+            signals.bind_extra_request_metadata.send(
+                sender=self.__class__,
+                request=request,
+                logger=logger,
+                log_kwargs=log_kwargs,
+            )
+        if snapshot.REQUEST_SUMMARY_ENABLED:
+            setattr(request, "_django_structlog_request_started_kwargs", log_kwargs)
+        elif enabled:
+            logger.log(level, "request_started", **log_kwargs)
+
+    @staticmethod
+    def _pop_request_started_kwargs(request: "HttpRequest") -> Mapping[str, Any]:
+        """``log_kwargs`` of ``request_started`` kept by ``prepare`` in summary mode, to be
+        logged with the next lifecycle event instead."""
+        return cast(
+            Mapping[str, Any],
+            request.__dict__.pop(
+                "_django_structlog_request_started_kwargs", _NO_LOG_KWARGS
+            ),
         )
-        level = app_settings.STATUS_START_LOG_LEVEL
-        logger.log(level, "request_started", **log_kwargs)
 
     @classmethod
     def bind_ip(cls, request: "HttpRequest") -> None:
-        from ipware import get_client_ip  # type: ignore[import-untyped]
+        structlog.contextvars.bind_contextvars(ip=cls.get_client_ip(request))
+
+    @staticmethod
+    def get_client_ip(request: "HttpRequest") -> Optional[str]:
+        """Client ip of the request, resolved once and kept on the request.
 
-        ip, _ = get_client_ip(request)
-        structlog.contextvars.bind_contextvars(ip=ip)
+        It is read from ``DJANGO_STRUCTLOG_IP_PROXY_HEADER`` when set, otherwise
+        `django-ipware <https://github.com/un33k/django-ipware>`_ looks for it.
+        """
+        try:
+            return cast(Optional[str], request.__dict__["_django_structlog_ip"])
+        except KeyError:
+            pass
+        snapshot = app_settings.snapshot
+        ip: Optional[str]
+        if snapshot.IP_PROXY_HEADER is None:
+            ip, _ = get_client_ip(request)
+        else:
+            ip = get_proxied_ip(
+                request, snapshot.IP_PROXY_HEADER, snapshot.IP_PROXY_COUNT
+            )
+        setattr(request, "_django_structlog_ip", ip)
+        return ip
 
     @staticmethod
     def format_request(request: "HttpRequest") -> str:
-        return f"{request.method} {request.get_full_path()}"
+        snapshot = app_settings.snapshot
+        if (
+            not snapshot.REQUEST_QUERY_REDACTED_PARAMS
+            and snapshot.REQUEST_QUERY_MAX_LENGTH is None
+        ):
+            return f"{request.method} {request.get_full_path()}"
+        path = escape_uri_path(request.path)
+        query = format_query_string(request)
+        return (
+            f"{request.method} {path}?{query}" if query else f"{request.method} {path}"
+        )
+
+    def _request_log_kwargs(self, request: "HttpRequest") -> Mapping[str, Any]:
+        """``request`` (or ``method``, ``path`` and ``query``) computed once per request."""
+        request_log_kwargs: Optional[Mapping[str, Any]] = request.__dict__.get(
+            "_django_structlog_request_log_kwargs"
+        )
+        if request_log_kwargs is None:
+            if app_settings.snapshot.REQUEST_FIELDS_ENABLED:
+                request_log_kwargs = {
+                    "method": request.method,
+                    # escaped like ``request`` (``get_full_path``)
+                    "path": escape_uri_path(request.path),
+                    "query": format_query_string(request),
+                }
+            else:
+                request_log_kwargs = {"request": self.format_request(request)}
+            setattr(request, "_django_structlog_request_log_kwargs", request_log_kwargs)
+        return request_log_kwargs
 
     @staticmethod
     def bind_user_id(request: "HttpRequest") -> None:
-        user_id_field = app_settings.USER_ID_FIELD
+        snapshot = app_settings.snapshot
+        user_id_field = snapshot.USER_ID_FIELD
         if not user_id_field or not hasattr(request, "user"):
             return
 
+        if snapshot.USER_ID_FROM_SESSION and RequestMiddleware._bind_session_user_id(
+            request
+        ):
+            return
+
         session_was_accessed = (
             request.session.accessed if hasattr(request, "session") else None
         )
@@ -247,9 +572,38 @@ class RequestMiddleware:
                 request.session.accessed = True
                 return user
 
-            request.user = cast("AbstractBaseUser", SimpleLazyObject(get_user))
+            request.user = cast(
+                "AbstractBaseUser", _SessionAccessRestoringUser(get_user)
+            )
             request.session.accessed = False
 
+    @staticmethod
+    def _bind_session_user_id(request: "HttpRequest") -> bool:
+        """Binds the primary key of the authenticated user stored in the session without
+        evaluating ``request.user``.
+
+        The id is bound once per request, later calls do nothing until ``request.user``
+        is evaluated or replaced (ex: by ``login``). Returns ``False`` when
+        ``request.user`` was already evaluated or there is no session.
+        """
+        user = getattr(request, "user")
+        if not _is_unevaluated_user(user) or not hasattr(request, "session"):
+            return False
+        if request.__dict__.get("_django_structlog_session_user") is user:
+            return True
+
+        session = request.session
+        session_was_accessed = session.accessed
+        user_id = session.get(SESSION_KEY)
+        session.accessed = session_was_accessed
+        if user_id is not None:
+            user_id = get_user_model()._meta.pk.to_python(user_id)
+            if isinstance(user_id, uuid.UUID):
+                user_id = str(user_id)
+        structlog.contextvars.bind_contextvars(user_id=user_id)
+        setattr(request, "_django_structlog_session_user", user)
+        return True
+
     def process_got_request_exception(
         self, sender: Type[Any], request: "HttpRequest", **kwargs: Any
     ) -> None:
@@ -269,18 +623,56 @@ class RequestMiddleware:
 
         setattr(request, "_raised_exception", exception)
         self.bind_user_id(request)
-        log_kwargs = dict(
-            code=500,
-            request=self.format_request(request),
-        )
-        signals.bind_extra_request_failed_metadata.send(
-            sender=self.__class__,
-            request=request,
-            logger=logger,
-            exception=exception,
-            log_kwargs=log_kwargs,
-        )
-        logger.exception(
-            "request_failed",
-            **log_kwargs,
-        )
+        started_kwargs = self._pop_request_started_kwargs(request)
+        enabled = logger_levels.is_enabled_for(logging.ERROR)
+        if (
+            not enabled
+            and not signals.bind_extra_request_failed_metadata.has_listeners(
+                self.__class__
+            )
+        ):
+            return
+        log_kwargs: dict[str, Any] = {"code": 500, **self._request_log_kwargs(request)}
+        log_kwargs.update(started_kwargs)
+        started_at = getattr(request, "_django_structlog_started_at", None)
+        if started_at is not None:
+            log_kwargs["duration_ms"] = _elapsed_ms(started_at)
+        if signals.bind_extra_request_failed_metadata.has_listeners(self.__class__):
+            signals.bind_extra_request_failed_metadata.send(
+                sender=self.__class__,
+                request=request,
+                logger=logger,
+                exception=exception,
+                log_kwargs=log_kwargs,
+            )
+        if enabled:
+            logger.exception(
+                "request_failed",
+                **log_kwargs,
+            )
+
+
+def process_got_request_exception(
+    sender: Type[Any], request: "HttpRequest", **kwargs: Any
+) -> None:
+    """Single ``got_request_exception`` receiver of every :class:`RequestMiddleware`.
+
+    Connecting each instance would call all of them on every exception, and handler
+    chains can be built many times (tests, some ASGI servers). The exception goes to the
+    middleware which prepared the request, or to the latest one created when the request
+    did not reach it.
+    """
+    middleware: Optional[RequestMiddleware] = request.__dict__.get(
+        "_django_structlog_middleware"
+    )
+    if middleware is None:
+        latest_instance = RequestMiddleware._latest_instance
+        middleware = latest_instance() if latest_instance is not None else None
+    if middleware is not None:
+        middleware.process_got_request_exception(sender, request, **kwargs)
+
+
+got_request_exception.connect(
+    process_got_request_exception,
+    dispatch_uid="django_structlog.middlewares.request.process_got_request_exception",
+)
@@ -0,0 +1,156 @@
+"""JSON rendering with `orjson <https://github.com/ijl/orjson>`_ or
+`msgspec <https://jcristharif.com/msgspec/>`_ when installed.
+
+See :ref:`json_renderer`.
+"""
+
+import datetime
+import decimal
+import json
+import uuid
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, Union, cast
+
+import structlog
+from django.db.models import Model
+from django.http import HttpRequest, QueryDict
+from django.utils.functional import Promise
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+if TYPE_CHECKING:  # pragma: no cover
+    from structlog.typing import EventDict, WrappedLogger
+
+Backend = Literal["orjson", "msgspec", "json"]
+
+
+def default(obj: Any) -> Any:
+    """Serializes the values ``json`` libraries do not support, ``repr`` of anything else.
+
+    Lazy translations are translated, models are rendered as their label and primary key
+    and requests as their method and path.
+    """
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, (uuid.UUID, decimal.Decimal)):
+        return str(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, Model):
+        return {"model": obj._meta.label, "pk": obj.pk}
+    if isinstance(obj, QueryDict):
+        return dict(obj.lists())
+    if isinstance(obj, HttpRequest):
+        return f"{obj.method} {obj.get_full_path()}"
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return repr(obj)
+
+
+def _default_backend() -> Backend:
+    if orjson is not None:
+        return "orjson"
+    if msgspec is not None:
+        return "msgspec"
+    return "json"
+
+
+class JSONRenderer:
+    """Renders the event dict as JSON with the fastest library installed.
+
+    ``backend`` is ``"orjson"``, ``"msgspec"`` or ``"json"``, by default the first one
+    installed. Values the library does not support are serialized by :func:`default`.
+    Events which the library cannot encode (ex: integers over 64 bits with ``orjson``)
+    are rendered with ``json``.
+
+    ``orjson`` and ``msgspec`` encode to ``bytes``, which are returned as is with
+    ``bytes_output=True`` for loggers writing bytes (ex: ``structlog.BytesLogger``).
+    Otherwise they are decoded, as ``logging`` requires ``str``.
+    """
+
+    __slots__ = ("backend", "bytes_output", "sort_keys", "_dumps")
+
+    def __init__(
+        self,
+        backend: Optional[Backend] = None,
+        bytes_output: bool = False,
+        sort_keys: bool = False,
+    ) -> None:
+        self.backend = backend or _default_backend()
+        self.bytes_output = bytes_output
+        self.sort_keys = sort_keys
+        self._dumps = self._make_dumps()
+
+    def _make_dumps(self) -> Optional[Callable[[Any], bytes]]:
+        if self.backend == "orjson":
+            if orjson is None:
+                raise ImportError("orjson is not installed")
+            option = orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            orjson_dumps = orjson.dumps
+
+            def dumps(event_dict: Any) -> bytes:
+                return orjson_dumps(event_dict, default=default, option=option)
+
+            return dumps
+        if self.backend == "msgspec":
+            if msgspec is None:
+                raise ImportError("msgspec is not installed")
+            encoder = msgspec.json.Encoder(
+                enc_hook=default, order="sorted" if self.sort_keys else None
+            )
+            return cast(Callable[[Any], bytes], encoder.encode)
+        if self.backend != "json":
+            raise ValueError(f"Unknown JSON backend {self.backend!r}")
+        return None
+
+    def _json_dumps(self, event_dict: "EventDict") -> str:
+        return json.dumps(event_dict, default=default, sort_keys=self.sort_keys)
+
+    def __call__(
+        self, logger: "WrappedLogger", name: str, event_dict: "EventDict"
+    ) -> Union[str, bytes]:
+        dumps = self._dumps
+        if dumps is not None:
+            try:
+                rendered = dumps(event_dict)
+            except (TypeError, ValueError, OverflowError):
+                pass
+            else:
+                return rendered if self.bytes_output else rendered.decode()
+        text = self._json_dumps(event_dict)
+        return text.encode() if self.bytes_output else text
+
+
+class JSONFormatter(structlog.stdlib.ProcessorFormatter):
+    """``structlog.stdlib.ProcessorFormatter`` rendering with :class:`JSONRenderer`.
+
+    >>> LOGGING = {
+    ...     # ...
+    ...     "formatters": {
+    ...         "json_formatter": {
+    ...             "()": "django_structlog.renderers.JSONFormatter",
+    ...         },
+    ...     },
+    ... }
+
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        backend: Optional[Backend] = None,
+        sort_keys: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        if "processor" not in kwargs and "processors" not in kwargs:
+            kwargs["processor"] = JSONRenderer(backend=backend, sort_keys=sort_keys)
+        super().__init__(*args, **kwargs)
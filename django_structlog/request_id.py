@@ -0,0 +1,102 @@
+"""Request id generators for :class:`django_structlog.middlewares.RequestMiddleware`.
+
+Select one with ``DJANGO_STRUCTLOG_REQUEST_ID_GENERATOR``:
+
+>>> DJANGO_STRUCTLOG_REQUEST_ID_GENERATOR = "django_structlog.request_id.uuid7"
+
+Any callable without arguments returning a ``str`` (or its dotted path) can be used.
+
+"""
+
+import itertools
+import os
+import threading
+import time
+import uuid
+from typing import Iterator
+
+_POOL_SIZE = 4096
+_CHUNK_SIZE = 16
+
+_UUID_VERSION_MASK = ~((0xF << 76) | (0x3 << 62))
+_UUID_VARIANT = 0x2 << 62
+_RANDOM_80_BITS = (1 << 80) - 1
+
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# every pair of characters, encoding 10 bits at once
+_CROCKFORD_BASE32_PAIRS = tuple(
+    a + b for a in _CROCKFORD_BASE32 for b in _CROCKFORD_BASE32
+)
+# 26 characters hold 130 bits, the 2 extra leading bits are zeros
+_ULID_SHIFTS = tuple(range(120, -10, -10))
+
+_local = threading.local()
+_boot_id = os.urandom(8).hex()
+_counter = itertools.count(1)
+
+
+def _random_chunks() -> Iterator[int]:
+    while True:
+        pool = os.urandom(_POOL_SIZE)
+        for offset in range(0, _POOL_SIZE, _CHUNK_SIZE):
+            yield int.from_bytes(pool[offset : offset + _CHUNK_SIZE], "big")
+
+
+def _random_128() -> int:
+    """128 random bits from a per thread pool filled by a single ``os.urandom`` call."""
+    try:
+        chunks: Iterator[int] = _local.chunks
+    except AttributeError:
+        chunks = _local.chunks = _random_chunks()
+    return next(chunks)
+
+
+def _format_uuid(value: int) -> str:
+    h = "%032x" % value
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def uuid4() -> str:
+    """Random UUID from :func:`uuid.uuid4`. This is the default."""
+    return str(uuid.uuid4())
+
+
+def pooled_uuid4() -> str:
+    """Random UUID (version 4) using pooled random bytes instead of a syscall per id."""
+    return _format_uuid(_random_128() & _UUID_VERSION_MASK | (4 << 76) | _UUID_VARIANT)
+
+
+def uuid7() -> str:
+    """Time ordered UUID (version 7): unix timestamp in milliseconds followed by random bits."""
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms << 80) | (_random_128() & _RANDOM_80_BITS)
+    return _format_uuid(value & _UUID_VERSION_MASK | (7 << 76) | _UUID_VARIANT)
+
+
+def ulid() -> str:
+    """Time ordered `ULID <https://github.com/ulid/spec>`_: 26 characters in Crockford's base32."""
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms << 80) | (_random_128() & _RANDOM_80_BITS)
+    pairs = _CROCKFORD_BASE32_PAIRS
+    return "".join([pairs[(value >> shift) & 0x3FF] for shift in _ULID_SHIFTS])
+
+
+def process_counter() -> str:
+    """Per process counter prefixed with a random id generated when the process starts.
+
+    Ids look like ``3f9a1c2b7d4e5f60-1``: 16 hexadecimal characters, random per process,
+    followed by the value of the counter.
+    """
+    return f"{_boot_id}-{next(_counter)}"
+
+
+def _reset_after_fork() -> None:
+    """Forked processes must not reuse their parent's random pool, boot id and counter."""
+    global _local, _boot_id, _counter
+    _local = threading.local()
+    _boot_id = os.urandom(8).hex()
+    _counter = itertools.count(1)
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,74 @@
+"""Head based sampling of request lifecycle events.
+
+The decision is taken once per request in
+:meth:`django_structlog.middlewares.RequestMiddleware.prepare` and bound as ``sampled``
+in ``structlog``'s context, so that ``celery`` tasks enqueued by the request inherit it.
+
+"""
+
+import zlib
+from contextvars import ContextVar
+from typing import Mapping
+
+import structlog
+
+_sampled: ContextVar[bool] = ContextVar("django_structlog_sampled", default=True)
+
+
+def is_sampled() -> bool:
+    """Whether lifecycle events of the current request or task should be logged."""
+    return _sampled.get()
+
+
+def set_sampled(sampled: bool) -> None:
+    _sampled.set(sampled)
+
+
+def bind_sampled(sampled: bool) -> None:
+    _sampled.set(sampled)
+    structlog.contextvars.bind_contextvars(sampled=sampled)
+
+
+def threshold(rate: float) -> int:
+    """Threshold of :func:`sample_key` keeping the fraction ``rate`` of the keys."""
+    return int(min(max(rate, 0.0), 1.0) * 2**32)
+
+
+def sample_key(key: str, key_threshold: int) -> bool:
+    """Whether ``key`` is kept with the threshold of :func:`threshold`.
+
+    The decision hashes ``key``, so the same key always takes the same decision.
+    """
+    return zlib.crc32(key.encode()) < key_threshold
+
+
+class RequestSampler:
+    """Samples requests by hashing their ``request_id``.
+
+    Services sharing a ``request_id`` (ex: ``X-Request-ID`` header) and the same rate take
+    the same decision. The rate of the longest matching path prefix is used, otherwise the
+    default ``rate``.
+    """
+
+    __slots__ = ("_threshold", "_path_thresholds")
+
+    def __init__(self, rate: float, path_rates: Mapping[str, float]) -> None:
+        self._threshold = threshold(rate)
+        self._path_thresholds = tuple(
+            sorted(
+                (
+                    (prefix, threshold(path_rate))
+                    for prefix, path_rate in path_rates.items()
+                ),
+                key=lambda item: len(item[0]),
+                reverse=True,
+            )
+        )
+
+    def sample(self, request_id: str, path: str) -> bool:
+        request_threshold = self._threshold
+        for prefix, path_threshold in self._path_thresholds:
+            if path.startswith(prefix):
+                request_threshold = path_threshold
+                break
+        return sample_key(request_id, request_threshold)
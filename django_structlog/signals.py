@@ -1,6 +1,6 @@
-import django.dispatch
+from .dispatch import Signal
 
-bind_extra_request_metadata = django.dispatch.Signal()
+bind_extra_request_metadata = Signal("bind_extra_request_metadata")
 """ Signal to add extra ``structlog`` bindings from ``django``'s request.
 
 :param request: the request returned by the view
@@ -19,7 +19,7 @@ bind_extra_request_metadata = django.dispatch.Signal()
 
 """
 
-bind_extra_request_finished_metadata = django.dispatch.Signal()
+bind_extra_request_finished_metadata = Signal("bind_extra_request_finished_metadata")
 """ Signal to add extra ``structlog`` bindings from ``django``'s finished request and response.
 
 :param logger: the logger
@@ -38,7 +38,7 @@ bind_extra_request_finished_metadata = django.dispatch.Signal()
 
 """
 
-bind_extra_request_failed_metadata = django.dispatch.Signal()
+bind_extra_request_failed_metadata = Signal("bind_extra_request_failed_metadata")
 """ Signal to add extra ``structlog`` bindings from ``django``'s failed request and exception.
 
 :param logger: the logger
@@ -57,7 +57,7 @@ bind_extra_request_failed_metadata = django.dispatch.Signal()
 
 """
 
-update_failure_response = django.dispatch.Signal()
+update_failure_response = Signal("update_failure_response")
 """ Signal to update response failure response before it is returned.
 
 :param request: the request returned by the view
@@ -0,0 +1,12 @@
+import logging
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def null_logging_handlers() -> Generator[None, None, None]:
+    """Measure ``django_structlog``'s overhead, not the console's."""
+    with patch.object(logging.getLogger(), "handlers", [logging.NullHandler()]):
+        yield
@@ -0,0 +1,67 @@
+"""Memory allocated by ``RequestMiddleware.handle_response``, measured with ``tracemalloc``.
+
+Handling the regular response of an unsampled request logs nothing. It must not allocate
+more than clearing the context of the request, whatever the size of that context.
+"""
+
+import tracemalloc
+from typing import Any, Callable
+
+import pytest
+import structlog
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+
+from django_structlog import sampling
+from django_structlog.middlewares import RequestMiddleware
+
+
+def get_response(request: HttpRequest) -> HttpResponse:  # pragma: no cover
+    return HttpResponse()
+
+
+def peak_allocated(func: Callable[[], None], context_size: int) -> int:
+    context = {f"key_{i}": i for i in range(context_size)}
+
+    def bind() -> None:
+        structlog.contextvars.bind_contextvars(request_id="foo", **context)
+        sampling.bind_sampled(False)
+
+    # warm up caches
+    bind()
+    func()
+
+    bind()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        structlog.contextvars.clear_contextvars()
+        sampling.set_sampled(True)
+    return peak - start
+
+
+@pytest.fixture(autouse=True)
+def unsampled(settings: Any) -> None:
+    settings.DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE = 0
+
+
+@pytest.mark.parametrize("context_size", [1, 500])
+def test_unsampled_response(context_size: int) -> None:
+    middleware = RequestMiddleware(get_response)
+    request = RequestFactory().get("/foo")
+    request.user = AnonymousUser()
+    response = HttpResponse()
+
+    allocated = peak_allocated(
+        lambda: middleware.handle_response(request, response), context_size
+    )
+    clear_contextvars_allocated = peak_allocated(
+        structlog.contextvars.clear_contextvars, context_size
+    )
+
+    assert allocated - clear_contextvars_allocated < 1024
@@ -0,0 +1,74 @@
+import json
+from typing import Any, Generator
+
+import pytest
+import structlog
+
+from django_structlog.celery.receivers import CeleryReceiver
+
+pytestmark = pytest.mark.benchmark(group="celery_context")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
+
+@pytest.fixture
+def receiver() -> Generator[CeleryReceiver, None, None]:
+    """A request context with a user agent and a few custom bindings."""
+    structlog.contextvars.bind_contextvars(
+        request_id="00000000-0000-0000-0000-000000000000",
+        correlation_id="11111111-1111-1111-1111-111111111111",
+        user_id=1,
+        ip="0.0.0.0",
+        user_agent=USER_AGENT,
+        tenant="acme",
+        feature_flags=["new_checkout", "dark_mode", "beta_search"],
+    )
+    yield CeleryReceiver()
+    structlog.contextvars.clear_contextvars()
+
+
+@pytest.fixture
+def filtered(settings: Any) -> None:
+    settings.DJANGO_STRUCTLOG_CELERY_CONTEXT_EXCLUDED_KEYS = ["user_agent"]
+    settings.DJANGO_STRUCTLOG_CELERY_CONTEXT_KEY_ALIASES = {
+        "request_id": "rid",
+        "correlation_id": "cid",
+        "parent_task_id": "ptid",
+        "user_id": "uid",
+    }
+
+
+@pytest.fixture
+def capped(settings: Any, filtered: None) -> None:
+    settings.DJANGO_STRUCTLOG_CELERY_CONTEXT_MAX_BYTES = 256
+
+
+def publish(benchmark: Any, receiver: CeleryReceiver) -> int:
+    """Publishes a task and returns the size of the header in bytes."""
+
+    def run() -> dict[str, Any]:
+        headers: dict[str, Any] = {}
+        receiver.receiver_before_task_publish(headers=headers, routing_key="celery")
+        return headers
+
+    headers = benchmark(run)
+    size = len(json.dumps(headers["__django_structlog__"]).encode())
+    benchmark.extra_info["header_bytes"] = size
+    return size
+
+
+def test_publish_whole_context(benchmark: Any, receiver: CeleryReceiver) -> None:
+    assert publish(benchmark, receiver) > 256
+
+
+@pytest.mark.usefixtures("filtered")
+def test_publish_filtered_context(benchmark: Any, receiver: CeleryReceiver) -> None:
+    assert publish(benchmark, receiver) <= 256
+
+
+@pytest.mark.usefixtures("capped")
+def test_publish_capped_context(benchmark: Any, receiver: CeleryReceiver) -> None:
+    assert publish(benchmark, receiver) <= 256
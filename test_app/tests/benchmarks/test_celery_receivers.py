@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+from typing import Any, Generator
+
+import pytest
+import structlog
+
+from django_structlog.celery.receivers import CeleryReceiver, aggregate_enqueued
+
+pytestmark = pytest.mark.benchmark(group="celery_receivers")
+
+
+@pytest.fixture
+def receiver() -> Generator[CeleryReceiver, None, None]:
+    structlog.contextvars.bind_contextvars(
+        request_id="00000000-0000-0000-0000-000000000000", user_id=1, ip="0.0.0.0"
+    )
+    yield CeleryReceiver()
+    structlog.contextvars.clear_contextvars()
+
+
+@pytest.fixture
+def task() -> Any:
+    return SimpleNamespace(
+        name="test_app.tasks.foo",
+        request=SimpleNamespace(
+            __django_structlog__={"request_id": "00000000-0000-0000-0000-000000000000"}
+        ),
+        throws=(),
+    )
+
+
+def test_before_task_publish(benchmark: Any, receiver: CeleryReceiver) -> None:
+    def run() -> dict[str, Any]:
+        headers: dict[str, Any] = {}
+        receiver.receiver_before_task_publish(
+            headers=headers, properties={"priority": 5}, routing_key="celery"
+        )
+        return headers
+
+    assert "__django_structlog__" in benchmark(run)
+
+
+def test_after_task_publish(benchmark: Any, receiver: CeleryReceiver) -> None:
+    benchmark(
+        receiver.receiver_after_task_publish,
+        headers={"id": "11111111-1111-1111-1111-111111111111", "task": "foo"},
+        routing_key="celery",
+    )
+
+
+def test_task_prerun(benchmark: Any, receiver: CeleryReceiver, task: Any) -> None:
+    benchmark(
+        receiver.receiver_task_prerun, "11111111-1111-1111-1111-111111111111", task
+    )
+
+
+@pytest.fixture
+def overrides(settings: Any) -> None:
+    """100 patterns, none of which matches the task."""
+    settings.DJANGO_STRUCTLOG_CELERY_TASK_OVERRIDES = {
+        f"test_app.tasks.task_{i}_*": {"sampling_rate": 0.5} for i in range(100)
+    }
+
+
+@pytest.mark.usefixtures("overrides")
+def test_task_prerun_with_overrides(
+    benchmark: Any, receiver: CeleryReceiver, task: Any
+) -> None:
+    benchmark(
+        receiver.receiver_task_prerun, "11111111-1111-1111-1111-111111111111", task
+    )
+
+
+def test_task_success(benchmark: Any, receiver: CeleryReceiver, task: Any) -> None:
+    receiver.receiver_task_prerun("11111111-1111-1111-1111-111111111111", task)
+    benchmark(receiver.receiver_task_success, result="foo", sender=task)
+
+
+def publish_group(receiver: CeleryReceiver, size: int) -> None:
+    for i in range(size):
+        headers: dict[str, Any] = {
+            "id": f"task-{i}",
+            "task": "test_app.tasks.foo",
+            "group": "22222222-2222-2222-2222-222222222222",
+        }
+        receiver.receiver_before_task_publish(headers=headers, routing_key="celery")
+        receiver.receiver_after_task_publish(headers=headers, routing_key="celery")
+
+
+def test_publish_group(benchmark: Any, receiver: CeleryReceiver) -> None:
+    benchmark(publish_group, receiver, 1000)
+
+
+def test_publish_group_aggregated(benchmark: Any, receiver: CeleryReceiver) -> None:
+    def run() -> None:
+        with aggregate_enqueued():
+            publish_group(receiver, 1000)
+
+    benchmark(run)
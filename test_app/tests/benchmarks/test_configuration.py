@@ -0,0 +1,66 @@
+import logging
+import os
+from typing import Any, Generator
+
+import pytest
+import structlog
+
+from django_structlog import configuration
+
+pytestmark = pytest.mark.benchmark(group="configuration")
+
+# the chain of ``config/settings/test.py``
+PROCESSORS: list[Any] = [
+    structlog.contextvars.merge_contextvars,
+    structlog.stdlib.filter_by_level,
+    structlog.processors.TimeStamper(fmt="iso"),
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.PositionalArgumentsFormatter(),
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    structlog.processors.UnicodeDecoder(),
+    structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+]
+
+
+@pytest.fixture(autouse=True)
+def restore_configuration() -> Generator[None, None, None]:
+    config = structlog.get_config()
+    structlog.contextvars.bind_contextvars(
+        request_id="3a8f801c-072b-4805-8f38-e1337f363ed4", user_id=1, ip="127.0.0.1"
+    )
+    logging.getLogger(__name__).setLevel(logging.INFO)
+    yield
+    structlog.contextvars.clear_contextvars()
+    structlog.reset_defaults()
+    structlog.configure(**config)
+
+
+def configure_processors() -> None:
+    structlog.configure(
+        processors=PROCESSORS,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
+
+
+@pytest.mark.parametrize("method", ["info", "debug"], ids=["enabled", "disabled"])
+def test_processors(benchmark: Any, method: str) -> None:
+    configure_processors()
+    benchmark(getattr(structlog.get_logger(__name__), method), "hello", foo="bar")
+
+
+@pytest.mark.parametrize("method", ["info", "debug"], ids=["enabled", "disabled"])
+def test_configure(benchmark: Any, method: str) -> None:
+    configuration.configure()
+    benchmark(getattr(structlog.get_logger(__name__), method), "hello", foo="bar")
+
+
+@pytest.mark.parametrize("method", ["info", "debug"], ids=["enabled", "disabled"])
+def test_configure_without_stdlib(benchmark: Any, method: str) -> None:
+    with open(os.devnull, "wb") as devnull:
+        configuration.configure(
+            stdlib=False, logger_factory=structlog.BytesLoggerFactory(devnull)
+        )
+        benchmark(getattr(structlog.get_logger(__name__), method), "hello", foo="bar")
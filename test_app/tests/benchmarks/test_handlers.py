@@ -0,0 +1,70 @@
+import logging
+import os
+from typing import Any, Callable, Generator, Sequence
+
+import pytest
+import structlog
+
+from django_structlog import handlers
+
+pytestmark = pytest.mark.benchmark(group="handlers")
+
+FOREIGN_PRE_CHAIN: Sequence[Any] = (
+    structlog.contextvars.merge_contextvars,
+    structlog.processors.TimeStamper(fmt="iso"),
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.PositionalArgumentsFormatter(),
+)
+
+RENDERERS: Sequence[Any] = (
+    structlog.dev.ConsoleRenderer(colors=False),
+    structlog.processors.KeyValueRenderer(),
+    structlog.processors.JSONRenderer(),
+)
+
+
+@pytest.fixture
+def devnull() -> Generator[Any, None, None]:
+    with open(os.devnull, "w") as stream:
+        yield stream
+
+
+def make_handlers(devnull: Any, foreign_pre_chain: Sequence[Any]) -> list[Any]:
+    stream_handlers = []
+    for renderer in RENDERERS:
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(
+            structlog.stdlib.ProcessorFormatter(
+                processor=renderer, foreign_pre_chain=foreign_pre_chain
+            )
+        )
+        stream_handlers.append(handler)
+    return stream_handlers
+
+
+def emit(handlers: Sequence[logging.Handler]) -> Callable[[], None]:
+    record = logging.LogRecord(
+        "foreign_logger", logging.INFO, __file__, 1, "hello %s", ("world",), None
+    )
+
+    def _emit() -> None:
+        for handler in handlers:
+            handler.handle(record)
+
+    return _emit
+
+
+def test_handlers(benchmark: Any, devnull: Any) -> None:
+    structlog.contextvars.bind_contextvars(request_id="abc", user_id=1)
+    benchmark(emit(make_handlers(devnull, FOREIGN_PRE_CHAIN)))
+    structlog.contextvars.clear_contextvars()
+
+
+def test_fan_out_handler(benchmark: Any, devnull: Any) -> None:
+    structlog.contextvars.bind_contextvars(request_id="abc", user_id=1)
+    fan_out_handler = handlers.FanOutHandler(
+        make_handlers(devnull, ()), foreign_pre_chain=FOREIGN_PRE_CHAIN
+    )
+    benchmark(emit([fan_out_handler]))
+    structlog.contextvars.clear_contextvars()
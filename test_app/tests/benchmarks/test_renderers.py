@@ -0,0 +1,36 @@
+import uuid
+from typing import Any
+
+import pytest
+import structlog
+
+from django_structlog import renderers
+
+pytestmark = pytest.mark.benchmark(group="renderers")
+
+EVENT_DICT = {
+    "event": "request_finished",
+    "request_id": str(uuid.uuid4()),
+    "user_id": 1,
+    "ip": "127.0.0.1",
+    "request": "GET /foo?bar=1",
+    "code": 200,
+    "duration_ms": 12,
+    "timestamp": "2025-01-01T00:00:00.000000Z",
+    "logger": "django_structlog.middlewares.request",
+    "level": "info",
+}
+
+
+@pytest.mark.parametrize(
+    "renderer",
+    [
+        structlog.processors.JSONRenderer(),
+        renderers.JSONRenderer(backend="json"),
+        renderers.JSONRenderer(),
+        renderers.JSONRenderer(bytes_output=True),
+    ],
+    ids=["structlog", "json", "default", "default_bytes"],
+)
+def test_json_renderer(benchmark: Any, renderer: Any) -> None:
+    benchmark(renderer, None, "info", dict(EVENT_DICT))
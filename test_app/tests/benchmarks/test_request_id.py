@@ -0,0 +1,21 @@
+from typing import Any, Callable
+
+import pytest
+
+from django_structlog import request_id
+
+pytestmark = pytest.mark.benchmark(group="request_id")
+
+
+@pytest.mark.parametrize(
+    "generator",
+    [
+        request_id.uuid4,
+        request_id.pooled_uuid4,
+        request_id.uuid7,
+        request_id.ulid,
+        request_id.process_counter,
+    ],
+)
+def test_request_id_generator(benchmark: Any, generator: Callable[[], str]) -> None:
+    assert isinstance(benchmark(generator), str)
@@ -0,0 +1,101 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generator, cast
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+from django.utils.functional import SimpleLazyObject
+
+from django_structlog.middlewares import RequestMiddleware
+
+pytestmark = pytest.mark.benchmark(group="request_middleware")
+
+ROUNDS = 2000
+
+
+def request_setup(
+    path: str, user: bool = True, **extra: Any
+) -> Callable[[], tuple[tuple[HttpRequest], dict[str, Any]]]:
+    """A new request for each round: the formatted request and the client ip are cached
+    on the request."""
+
+    def setup() -> tuple[tuple[HttpRequest], dict[str, Any]]:
+        request = RequestFactory().get(path, **extra)
+        if user:
+            request.user = AnonymousUser()
+        return (request,), {}
+
+    return setup
+
+
+@pytest.fixture
+def loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_wsgi_request(benchmark: Any) -> None:
+    def get_response(request: HttpRequest) -> HttpResponse:
+        return HttpResponse()
+
+    middleware = RequestMiddleware(get_response)
+
+    response = benchmark.pedantic(
+        middleware, setup=request_setup("/foo"), rounds=ROUNDS
+    )
+    assert response.status_code == 200
+
+
+def test_wsgi_request_with_request_id_header(benchmark: Any) -> None:
+    def get_response(request: HttpRequest) -> HttpResponse:
+        return HttpResponse()
+
+    middleware = RequestMiddleware(get_response)
+
+    response = benchmark.pedantic(
+        middleware,
+        setup=request_setup(
+            "/foo?bar=baz", HTTP_X_REQUEST_ID="foo", HTTP_X_CORRELATION_ID="bar"
+        ),
+        rounds=ROUNDS,
+    )
+    assert response.status_code == 200
+
+
+def test_asgi_request(benchmark: Any, loop: asyncio.AbstractEventLoop) -> None:
+    async def get_response(request: HttpRequest) -> HttpResponse:
+        return HttpResponse()
+
+    middleware = RequestMiddleware(get_response)
+
+    def run(request: HttpRequest) -> HttpResponse:
+        return loop.run_until_complete(
+            cast(Awaitable[HttpResponse], middleware(request))
+        )
+
+    response = benchmark.pedantic(run, setup=request_setup("/foo"), rounds=ROUNDS)
+    assert response.status_code == 200
+
+
+def test_asgi_request_with_lazy_user(
+    benchmark: Any, loop: asyncio.AbstractEventLoop
+) -> None:
+    """Unevaluated ``request.user`` may hit the database: it runs in a thread."""
+
+    async def get_response(request: HttpRequest) -> HttpResponse:
+        return HttpResponse()
+
+    middleware = RequestMiddleware(get_response)
+
+    def run(request: HttpRequest) -> HttpResponse:
+        request.user = cast(Any, SimpleLazyObject(AnonymousUser))
+        return loop.run_until_complete(
+            cast(Awaitable[HttpResponse], middleware(request))
+        )
+
+    response = benchmark.pedantic(
+        run, setup=request_setup("/foo", user=False), rounds=ROUNDS
+    )
+    assert response.status_code == 200
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any, AsyncGenerator, Generator
+
+import pytest
+
+from django_structlog.middlewares.request import (
+    async_streaming_content_wrapper,
+    sync_streaming_content_wrapper,
+)
+
+pytestmark = pytest.mark.benchmark(group="streaming")
+
+CHUNK_COUNT = 1000
+CHUNK = b"x" * 64
+
+
+def streaming_content() -> Generator[bytes, None, None]:
+    for _ in range(CHUNK_COUNT):
+        yield CHUNK
+
+
+async def async_streaming_content() -> AsyncGenerator[bytes, None]:
+    for _ in range(CHUNK_COUNT):
+        yield CHUNK
+
+
+async def consume(content: AsyncGenerator[bytes, Any]) -> int:
+    return len([chunk async for chunk in content])
+
+
+@pytest.fixture
+def loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_sync_streaming_unwrapped(benchmark: Any) -> None:
+    """Reference to subtract from ``test_sync_streaming``."""
+    assert benchmark(lambda: len(list(streaming_content()))) == CHUNK_COUNT
+
+
+def test_sync_streaming(benchmark: Any) -> None:
+    assert (
+        benchmark(
+            lambda: len(
+                list(
+                    sync_streaming_content_wrapper(
+                        streaming_content(), {"request_id": "foo"}
+                    )
+                )
+            )
+        )
+        == CHUNK_COUNT
+    )
+
+
+def test_async_streaming_unwrapped(
+    benchmark: Any, loop: asyncio.AbstractEventLoop
+) -> None:
+    """Reference to subtract from ``test_async_streaming``."""
+    assert (
+        benchmark(lambda: loop.run_until_complete(consume(async_streaming_content())))
+        == CHUNK_COUNT
+    )
+
+
+def test_async_streaming(benchmark: Any, loop: asyncio.AbstractEventLoop) -> None:
+    assert (
+        benchmark(
+            lambda: loop.run_until_complete(
+                consume(
+                    async_streaming_content_wrapper(
+                        async_streaming_content(), {"request_id": "foo"}
+                    )
+                )
+            )
+        )
+        == CHUNK_COUNT
+    )
@@ -0,0 +1,112 @@
+import json
+from typing import Any
+
+from django.test import TestCase
+
+from django_structlog.celery.context import ContextCodec
+
+CONTEXT = {
+    "request_id": "00000000-0000-0000-0000-000000000000",
+    "user_agent": "Mozilla/5.0",
+    "user_id": 1,
+    "sampled": True,
+}
+
+
+def size(encoded: Any) -> int:
+    return len(json.dumps(encoded, separators=(",", ":")).encode())
+
+
+class TestContextCodec(TestCase):
+    def test_keys(self) -> None:
+        codec = ContextCodec(keys=["user_id", "request_id", "ip"])
+
+        encoded = codec.encode(CONTEXT)
+
+        self.assertEqual(
+            {
+                "user_id": 1,
+                "request_id": "00000000-0000-0000-0000-000000000000",
+                "sampled": True,
+            },
+            encoded,
+        )
+        self.assertEqual(["user_id", "request_id", "sampled"], list(encoded))
+
+    def test_excluded_keys(self) -> None:
+        codec = ContextCodec(excluded_keys=["user_agent"])
+
+        self.assertEqual(
+            {
+                "request_id": "00000000-0000-0000-0000-000000000000",
+                "user_id": 1,
+                "sampled": True,
+            },
+            codec.encode(CONTEXT),
+        )
+
+    def test_aliases(self) -> None:
+        codec = ContextCodec(aliases={"request_id": "rid", "user_agent": "ua"})
+
+        encoded = codec.encode(CONTEXT)
+
+        self.assertEqual(
+            {
+                "rid": "00000000-0000-0000-0000-000000000000",
+                "ua": "Mozilla/5.0",
+                "user_id": 1,
+                "sampled": True,
+            },
+            encoded,
+        )
+        self.assertEqual(CONTEXT, codec.decode(encoded))
+
+    def test_decode_without_aliases(self) -> None:
+        codec = ContextCodec(excluded_keys=["user_agent"])
+
+        self.assertIs(CONTEXT, codec.decode(CONTEXT))
+
+    def test_max_bytes(self) -> None:
+        codec = ContextCodec(max_bytes=90)
+
+        encoded = codec.encode(CONTEXT)
+
+        # ``user_agent`` does not fit anymore, ``user_id`` still does
+        self.assertEqual(
+            {
+                "sampled": True,
+                "request_id": "00000000-0000-0000-0000-000000000000",
+                "user_id": 1,
+            },
+            encoded,
+        )
+        self.assertEqual(80, size(encoded))
+        self.assertEqual(encoded, codec.encode(dict(CONTEXT)))
+
+    def test_max_bytes_order(self) -> None:
+        context = {f"key_{i}": "x" * 10 for i in range(10)}
+        codec = ContextCodec(max_bytes=64, aliases={"key_0": "z"})
+
+        encoded = codec.encode(context)
+
+        # ``key_0`` first by its name, not its alias
+        self.assertEqual(["z", "key_1", "key_2"], list(encoded))
+        self.assertEqual(encoded, codec.encode(dict(reversed(context.items()))))
+
+    def test_max_bytes_order_of_keys(self) -> None:
+        codec = ContextCodec(keys=["user_id", "user_agent", "request_id"], max_bytes=60)
+
+        self.assertEqual(
+            {"sampled": True, "user_id": 1, "user_agent": "Mozilla/5.0"},
+            codec.encode(dict(reversed(CONTEXT.items()))),
+        )
+
+    def test_max_bytes_keeps_sampled(self) -> None:
+        codec = ContextCodec(max_bytes=0, aliases={"sampled": "s"})
+
+        self.assertEqual({"s": True}, codec.encode(CONTEXT))
+
+    def test_max_bytes_not_reached(self) -> None:
+        codec = ContextCodec(max_bytes=size(CONTEXT))
+
+        self.assertEqual(CONTEXT, codec.encode(CONTEXT))
@@ -0,0 +1,72 @@
+import logging
+
+from django.test import TestCase
+
+from django_structlog.celery.overrides import TaskOverrides, TaskSettings
+
+DEFAULT = TaskSettings(logging.INFO, logging.INFO)
+
+
+class TestTaskSettings(TestCase):
+    def test_sample_rate_one(self) -> None:
+        task_settings = TaskSettings(logging.INFO, logging.INFO, sampling_rate=1)
+        self.assertTrue(all(task_settings.sample(str(i)) for i in range(1000)))
+
+    def test_sample_rate_zero(self) -> None:
+        task_settings = TaskSettings(logging.INFO, logging.INFO, sampling_rate=0)
+        self.assertFalse(any(task_settings.sample(str(i)) for i in range(1000)))
+
+    def test_sample_rate(self) -> None:
+        task_settings = TaskSettings(logging.INFO, logging.INFO, sampling_rate=0.25)
+        sampled = sum(task_settings.sample(f"task-{i}") for i in range(10000))
+        self.assertAlmostEqual(0.25, sampled / 10000, delta=0.02)
+
+    def test_sample_without_task_id(self) -> None:
+        task_settings = TaskSettings(logging.INFO, logging.INFO, sampling_rate=0)
+        self.assertTrue(task_settings.sample(None))
+
+
+class TestTaskOverrides(TestCase):
+    def test_default(self) -> None:
+        overrides = TaskOverrides(DEFAULT, {})
+
+        self.assertIs(DEFAULT, overrides.get("app.tasks.foo"))
+        self.assertIs(DEFAULT, overrides.get(None))
+
+    def test_glob(self) -> None:
+        overrides = TaskOverrides(
+            DEFAULT, {"app.tasks.heartbeat_*": {"start_log_level": logging.DEBUG}}
+        )
+
+        task_settings = overrides.get("app.tasks.heartbeat_redis")
+        self.assertEqual(logging.DEBUG, task_settings.start_log_level)
+        self.assertEqual(logging.INFO, task_settings.success_log_level)
+        self.assertIs(DEFAULT, overrides.get("app.tasks.foo"))
+
+    def test_first_match(self) -> None:
+        overrides = TaskOverrides(
+            DEFAULT,
+            {
+                "app.tasks.critical": {"success_log_level": logging.WARNING},
+                "app.tasks.*": {"sampling_rate": 0.1},
+            },
+        )
+
+        self.assertEqual(
+            TaskSettings(logging.INFO, logging.WARNING),
+            overrides.get("app.tasks.critical"),
+        )
+        self.assertEqual(
+            TaskSettings(logging.INFO, logging.INFO, sampling_rate=0.1),
+            overrides.get("app.tasks.foo"),
+        )
+
+    def test_cached(self) -> None:
+        overrides = TaskOverrides(DEFAULT, {"app.*": {"sampling_rate": 0.1}})
+
+        self.assertIs(overrides.get("app.tasks.foo"), overrides.get("app.tasks.foo"))
+        self.assertIn("app.tasks.foo", overrides._cache)
+
+    def test_unknown_field(self) -> None:
+        with self.assertRaises(TypeError):
+            TaskOverrides(DEFAULT, {"app.*": {"failure_log_level": logging.DEBUG}})
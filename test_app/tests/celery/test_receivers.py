@@ -1,7 +1,10 @@
+import json
 import logging
+import threading
 import time
+from datetime import datetime, timezone
 from signal import SIGTERM
-from typing import Any, Optional, Type
+from typing import Any, Optional, Type, cast
 from unittest.mock import MagicMock, Mock, call, patch
 
 import structlog
@@ -10,7 +13,8 @@ from django.contrib.auth.models import AnonymousUser
 from django.dispatch import receiver as django_receiver
 from django.test import RequestFactory, TestCase
 
-from django_structlog.celery import receivers, signals
+from django_structlog import sampling
+from django_structlog.celery import metrics, receivers, signals
 
 
 class TestReceivers(TestCase):
@@ -20,6 +24,7 @@ class TestReceivers(TestCase):
 
     def tearDown(self) -> None:
         structlog.contextvars.clear_contextvars()
+        sampling.set_sampled(True)
 
     def test_defer_task(self) -> None:
         expected_uuid = "00000000-0000-0000-0000-000000000000"
@@ -235,6 +240,93 @@ class TestReceivers(TestCase):
         self.assertIn("task", record.msg)
         self.assertEqual("task_name", record.msg["task"])
 
+    def test_receiver_task_pre_run_not_sampled(self) -> None:
+        task_id = "11111111-1111-1111-1111-111111111111"
+        task = Mock()
+        task.request = Mock()
+        task.request.__django_structlog__ = {"request_id": "foo", "sampled": False}
+        task.name = "task_name"
+
+        receiver = receivers.CeleryReceiver()
+        with self.assertNoLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.DEBUG
+        ):
+            receiver.receiver_task_prerun(task_id, task)
+        context = structlog.contextvars.get_merged_contextvars(self.logger)
+
+        self.assertFalse(context["sampled"])
+        self.assertFalse(sampling.is_sampled())
+
+        mock_sender = Mock()
+        with self.assertNoLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.DEBUG
+        ):
+            receiver.receiver_task_success(result="foo", sender=mock_sender)
+
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+        ) as log_results:
+            receiver.receiver_task_failure(exception=Exception("foo"))
+        self.assertEqual(1, len(log_results.records))
+        record: Any = log_results.records[0]
+        self.assertEqual("task_failed", record.msg["event"])
+
+    def test_receiver_after_task_publish_not_sampled(self) -> None:
+        headers: dict[str, Any] = {"id": "foo", "task": "Foo"}
+        receiver = receivers.CeleryReceiver()
+        sampling.bind_sampled(False)
+
+        with self.assertNoLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.DEBUG
+        ):
+            receiver.receiver_after_task_publish(headers=headers)
+
+    def test_receiver_before_task_publish_propagates_sampled(self) -> None:
+        headers: dict[str, Any] = {}
+        sampling.bind_sampled(False)
+        receiver = receivers.CeleryReceiver()
+        receiver.receiver_before_task_publish(headers=headers)
+
+        self.assertFalse(headers["__django_structlog__"]["sampled"])
+
+    def test_receiver_before_task_publish_context_settings(self) -> None:
+        headers: dict[str, Any] = {}
+        structlog.contextvars.bind_contextvars(
+            request_id="00000000-0000-0000-0000-000000000000",
+            user_agent="Mozilla/5.0",
+            user_id=1,
+        )
+        receiver = receivers.CeleryReceiver()
+        with self.settings(
+            DJANGO_STRUCTLOG_CELERY_CONTEXT_EXCLUDED_KEYS=["user_agent"],
+            DJANGO_STRUCTLOG_CELERY_CONTEXT_KEY_ALIASES={"request_id": "rid"},
+        ):
+            receiver.receiver_before_task_publish(headers=headers)
+
+        self.assertDictEqual(
+            {"rid": "00000000-0000-0000-0000-000000000000", "user_id": 1},
+            headers["__django_structlog__"],
+        )
+
+    def test_receiver_task_pre_run_key_aliases(self) -> None:
+        task = Mock()
+        task.request.__django_structlog__ = {
+            "rid": "00000000-0000-0000-0000-000000000000"
+        }
+        receiver = receivers.CeleryReceiver()
+        with self.settings(
+            DJANGO_STRUCTLOG_CELERY_CONTEXT_KEY_ALIASES={"request_id": "rid"}
+        ):
+            receiver.receiver_task_prerun("11111111-1111-1111-1111-111111111111", task)
+
+        self.assertDictEqual(
+            {
+                "task_id": "11111111-1111-1111-1111-111111111111",
+                "request_id": "00000000-0000-0000-0000-000000000000",
+            },
+            structlog.contextvars.get_contextvars(),
+        )
+
     def test_signal_bind_extra_task_metadata(self) -> None:
         @django_receiver(signals.bind_extra_task_metadata)
         def receiver_bind_extra_request_metadata(
@@ -276,6 +368,27 @@ class TestReceivers(TestCase):
         self.assertIn("reason", record.msg)
         self.assertEqual(expected_reason, record.msg["reason"])
 
+    def test_receiver_signals_not_sent_without_listeners(self) -> None:
+        task = Mock()
+        task.request.__django_structlog__ = {}
+        receiver = receivers.CeleryReceiver()
+
+        with (
+            patch.object(signals.modify_context_before_task_publish, "send") as m1,
+            patch.object(signals.bind_extra_task_metadata, "send") as m2,
+            patch.object(signals.pre_task_succeeded, "send") as m3,
+            self.assertLogs(
+                logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+            ),
+        ):
+            receiver.receiver_before_task_publish(headers={})
+            receiver.receiver_task_prerun("task_id", task)
+            receiver.receiver_task_success(result="foo", sender=task)
+
+        m1.assert_not_called()
+        m2.assert_not_called()
+        m3.assert_not_called()
+
     def test_receiver_task_success(self) -> None:
         expected_result = "foo"
 
@@ -338,6 +451,28 @@ class TestReceivers(TestCase):
         self.assertIn("exception", record.msg)
         self.assertEqual(expected_exception, record.msg["error"])
 
+    def test_receiver_disabled_events_are_not_built(self) -> None:
+        stdlib_logger = logging.getLogger("django_structlog.celery.receivers")
+        self.addCleanup(stdlib_logger.setLevel, stdlib_logger.level)
+        stdlib_logger.setLevel(logging.CRITICAL)
+        sender = Mock(throws=())
+
+        receiver = receivers.CeleryReceiver()
+        with (
+            patch.object(
+                receivers.CeleryReceiver, "add_duration_ms"
+            ) as mock_add_duration_ms,
+            patch.object(receivers.logger, "log") as mock_log,
+            patch.object(receivers.logger, "exception") as mock_exception,
+        ):
+            receiver.receiver_task_success(result="foo", sender=sender)
+            receiver.receiver_task_failure(exception=Exception("foo"), sender=sender)
+            receiver.receiver_task_retry(reason="foo")
+
+        mock_add_duration_ms.assert_not_called()
+        mock_log.assert_not_called()
+        mock_exception.assert_not_called()
+
     def test_receiver_task_failure_with_throws(self) -> None:
         expected_exception = "foo"
 
@@ -403,6 +538,27 @@ class TestReceivers(TestCase):
         self.assertIn("user_id", record.msg)
         self.assertEqual(expected_user_id, record.msg["user_id"])
 
+    def test_receiver_task_revoked_key_aliases(self) -> None:
+        request = Mock()
+        request.__django_structlog__ = {"rid": "00000000-0000-0000-0000-000000000000"}
+
+        receiver = receivers.CeleryReceiver()
+        with (
+            self.settings(
+                DJANGO_STRUCTLOG_CELERY_CONTEXT_KEY_ALIASES={"request_id": "rid"}
+            ),
+            self.assertLogs(
+                logging.getLogger("django_structlog.celery.receivers"), logging.WARNING
+            ) as log_results,
+        ):
+            receiver.receiver_task_revoked(request=request)
+
+        record: Any = log_results.records[0]
+        self.assertEqual(
+            "00000000-0000-0000-0000-000000000000", record.msg["request_id"]
+        )
+        self.assertNotIn("rid", record.msg)
+
     def test_receiver_task_revoked_terminated(self) -> None:
         expected_request_uuid = "00000000-0000-0000-0000-000000000000"
         task_id = "11111111-1111-1111-1111-111111111111"
@@ -541,6 +697,421 @@ class TestReceivers(TestCase):
         self.assertIn("routing_key", record.msg)
         self.assertEqual(expected_routing_key, record.msg["routing_key"])
 
+    def test_priority_of_another_task(self) -> None:
+        receiver = receivers.CeleryReceiver()
+        receiver.receiver_before_task_publish(
+            headers={"id": "foo"}, properties={"priority": 6}
+        )
+
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+        ) as log_results:
+            receiver.receiver_after_task_publish(headers={"id": "bar", "task": "Foo"})
+            receiver.receiver_after_task_publish(headers={"id": "foo", "task": "Foo"})
+
+        for record in log_results.records:
+            self.assertNotIn("priority", cast(Any, record).msg)
+
+    def test_priority_not_kept_for_next_task(self) -> None:
+        receiver = receivers.CeleryReceiver()
+        receiver.receiver_before_task_publish(
+            headers={"id": "foo"}, properties={"priority": 6}
+        )
+        receiver.receiver_after_task_publish(headers={"id": "foo", "task": "Foo"})
+        receiver.receiver_before_task_publish(headers={"id": "bar"})
+
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+        ) as log_results:
+            receiver.receiver_after_task_publish(headers={"id": "bar", "task": "Foo"})
+
+        self.assertNotIn("priority", cast(Any, log_results.records[0]).msg)
+
+    def test_priority_concurrent_publishers(self) -> None:
+        threads_count = 16
+        publishes_count = 50
+        receiver = receivers.CeleryReceiver()
+        # every thread calls ``before_task_publish`` before any ``after_task_publish``
+        barrier = threading.Barrier(threads_count)
+
+        def publish(thread_index: int) -> None:
+            for i in range(publishes_count):
+                task_id = f"{thread_index}-{i}"
+                receiver.receiver_before_task_publish(
+                    headers={"id": task_id},
+                    properties={"priority": thread_index},
+                )
+                barrier.wait()
+                receiver.receiver_after_task_publish(
+                    headers={"id": task_id, "task": "Foo"}
+                )
+                barrier.wait()
+
+        threads = [
+            threading.Thread(target=publish, args=(thread_index,))
+            for thread_index in range(threads_count)
+        ]
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+        ) as log_results:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        records: list[Any] = log_results.records
+        self.assertEqual(threads_count * publishes_count, len(records))
+        for record in records:
+            thread_index = int(record.msg["child_task_id"].split("-")[0])
+            self.assertEqual(thread_index, record.msg["priority"])
+
+
+class TestTaskOverrides(TestCase):
+    def setUp(self) -> None:
+        self.receiver = receivers.CeleryReceiver()
+        self.task = Mock()
+        self.task.name = "app.tasks.heartbeat_redis"
+        self.task.throws = ()
+
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+        sampling.set_sampled(True)
+
+    def run_task(self) -> list[Any]:
+        self.task.request.__django_structlog__ = {"request_id": "foo"}
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.DEBUG
+        ) as log_results:
+            logging.getLogger("django_structlog.celery.receivers").debug("marker")
+            self.receiver.receiver_after_task_publish(
+                headers={"id": "task-0", "task": self.task.name}
+            )
+            self.receiver.receiver_task_prerun("task-0", self.task)
+            self.receiver.receiver_task_success(result="foo", sender=self.task)
+        return [record.msg for record in cast(Any, log_results.records)[1:]]
+
+    def test_log_levels(self) -> None:
+        with self.settings(
+            DJANGO_STRUCTLOG_CELERY_TASK_OVERRIDES={
+                "app.tasks.heartbeat_*": {
+                    "start_log_level": logging.DEBUG,
+                    "success_log_level": logging.DEBUG,
+                }
+            }
+        ):
+            records = self.run_task()
+
+        self.assertEqual(
+            ["task_enqueued", "task_started", "task_succeeded"],
+            [record["event"] for record in records],
+        )
+        for record in records:
+            self.assertEqual("debug", record["level"])
+
+    def test_sampling_rate(self) -> None:
+        with self.settings(
+            DJANGO_STRUCTLOG_CELERY_TASK_OVERRIDES={
+                "app.tasks.heartbeat_*": {"sampling_rate": 0}
+            }
+        ):
+            self.assertEqual([], self.run_task())
+            self.assertNotIn("sampled", structlog.contextvars.get_contextvars())
+
+            with self.assertLogs(
+                logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+            ) as log_results:
+                self.receiver.receiver_task_failure(
+                    exception=Exception("foo"), sender=self.task
+                )
+            self.assertEqual(
+                "task_failed", cast(Any, log_results.records[0]).msg["event"]
+            )
+
+    def test_other_tasks(self) -> None:
+        self.task.name = "app.tasks.foo"
+        with self.settings(
+            DJANGO_STRUCTLOG_CELERY_TASK_OVERRIDES={
+                "app.tasks.heartbeat_*": {"sampling_rate": 0}
+            }
+        ):
+            records = self.run_task()
+
+        self.assertEqual(
+            ["task_enqueued", "task_started", "task_succeeded"],
+            [record["event"] for record in records],
+        )
+
+
+class TestAggregateEnqueued(TestCase):
+    def setUp(self) -> None:
+        self.receiver = receivers.CeleryReceiver()
+        structlog.contextvars.bind_contextvars(request_id="foo")
+
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+        sampling.set_sampled(True)
+
+    def publish(
+        self, task_id: str, group_id: Optional[str] = None, task: str = "add"
+    ) -> dict[str, Any]:
+        headers: dict[str, Any] = {"id": task_id, "task": task, "group": group_id}
+        self.receiver.receiver_before_task_publish(
+            headers=headers, routing_key="celery"
+        )
+        self.receiver.receiver_after_task_publish(headers=headers, routing_key="celery")
+        return headers
+
+    def get_log_results(self, log_each: bool = False) -> list[Any]:
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+        ) as log_results:
+            with receivers.aggregate_enqueued(log_each=log_each):
+                for i in range(3):
+                    self.publish(f"task-{i}", group_id="group")
+                self.publish("task-3", task="mul")
+        return [record.msg for record in cast(Any, log_results.records)]
+
+    def test_tasks_enqueued(self) -> None:
+        (record,) = self.get_log_results()
+
+        self.assertEqual("tasks_enqueued", record["event"])
+        self.assertEqual(4, record["count"])
+        self.assertEqual(["add", "mul"], record["child_task_names"])
+        self.assertEqual(["celery"], record["routing_keys"])
+        self.assertEqual(["group"], record["group_ids"])
+        self.assertEqual("task-0", record["first_child_task_id"])
+        self.assertEqual("task-3", record["last_child_task_id"])
+        self.assertEqual("foo", record["request_id"])
+
+    def test_log_each(self) -> None:
+        records = self.get_log_results(log_each=True)
+
+        self.assertEqual(
+            ["task_enqueued"] * 4 + ["tasks_enqueued"],
+            [record["event"] for record in records],
+        )
+
+    def test_context_computed_once_per_group(self) -> None:
+        mock_receiver = Mock()
+        signals.modify_context_before_task_publish.connect(mock_receiver)
+        self.addCleanup(
+            signals.modify_context_before_task_publish.disconnect, mock_receiver
+        )
+
+        with receivers.aggregate_enqueued():
+            headers = [self.publish(f"task-{i}", group_id="group") for i in range(3)]
+            other_headers = self.publish("task-3", group_id="other")
+
+        self.assertEqual(2, mock_receiver.call_count)
+        for task_headers in headers + [other_headers]:
+            self.assertEqual(
+                {"request_id": "foo"}, task_headers["__django_structlog__"]
+            )
+
+    def test_nested(self) -> None:
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+        ) as log_results:
+            with receivers.aggregate_enqueued():
+                self.publish("task-0")
+                with receivers.aggregate_enqueued(log_each=True):
+                    self.publish("task-1")
+
+        self.assertEqual(1, len(log_results.records))
+        self.assertEqual(2, cast(Any, log_results.records[0]).msg["count"])
+
+    def test_logged_on_error(self) -> None:
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+        ) as log_results:
+            with self.assertRaises(ConnectionError):
+                with receivers.aggregate_enqueued():
+                    self.publish("task-0")
+                    raise ConnectionError()
+
+        self.assertEqual(1, cast(Any, log_results.records[0]).msg["count"])
+
+    def test_nothing_enqueued(self) -> None:
+        with patch.object(receivers.logger, "log") as mock_log:
+            with receivers.aggregate_enqueued():
+                pass
+
+        mock_log.assert_not_called()
+
+    def test_not_sampled(self) -> None:
+        sampling.set_sampled(False)
+
+        with patch.object(receivers.logger, "log") as mock_log:
+            with receivers.aggregate_enqueued():
+                self.publish("task-0")
+
+        mock_log.assert_not_called()
+
+
+class TestTaskMetrics(TestCase):
+    def setUp(self) -> None:
+        self.receiver = receivers.CeleryReceiver()
+        self.task = Mock(spec=["name", "request", "throws"])
+        self.task.name = "add"
+        self.task.request = Mock(spec=[])
+        self.task.throws = ()
+
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+        sampling.set_sampled(True)
+
+    def run_task(self, failed: bool = False, queued_for: float = 0) -> Any:
+        headers: dict[str, Any] = {"id": "task-0"}
+        self.receiver.receiver_before_task_publish(headers=headers)
+        context = headers["__django_structlog__"]
+        if metrics.PUBLISHED_AT in context:
+            context[metrics.PUBLISHED_AT] -= queued_for
+        self.task.request.__django_structlog__ = context
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+        ) as log_results:
+            self.receiver.receiver_task_prerun("task-0", self.task)
+            if failed:
+                self.receiver.receiver_task_failure(
+                    exception=Exception("foo"), sender=self.task
+                )
+            else:
+                self.receiver.receiver_task_success(result="foo", sender=self.task)
+        return cast(Any, log_results.records[-1]).msg
+
+    def test_metrics(self) -> None:
+        with (
+            self.settings(DJANGO_STRUCTLOG_CELERY_TASK_METRICS_ENABLED=True),
+            patch.object(metrics, "_cpu_time_ns", side_effect=[0, 5_000_000]),
+            patch.object(metrics, "_max_rss_kb", side_effect=[1000, 1200]),
+        ):
+            record = self.run_task(queued_for=1.5)
+
+        self.assertEqual("task_succeeded", record["event"])
+        self.assertEqual(5, record["cpu_time_ms"])
+        self.assertEqual(200, record["max_rss_delta_kb"])
+        self.assertGreaterEqual(record["queue_wait_ms"], 1500)
+        self.assertLess(record["queue_wait_ms"], 60_000)
+        self.assertNotIn(metrics.PUBLISHED_AT, record)
+        self.assertNotIn(metrics.PUBLISHED_AT, structlog.contextvars.get_contextvars())
+
+    def test_queue_wait_from_eta(self) -> None:
+        self.task.request.eta = datetime.fromtimestamp(
+            time.time() - 0.5, timezone.utc
+        ).isoformat()
+
+        with self.settings(DJANGO_STRUCTLOG_CELERY_TASK_METRICS_ENABLED=True):
+            record = self.run_task(queued_for=1.5)
+
+        self.assertGreaterEqual(record["queue_wait_ms"], 500)
+        self.assertLess(record["queue_wait_ms"], 1500)
+
+    def test_eta_before_publish(self) -> None:
+        self.task.request.eta = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+        with self.settings(DJANGO_STRUCTLOG_CELERY_TASK_METRICS_ENABLED=True):
+            record = self.run_task(queued_for=1.5)
+
+        self.assertGreaterEqual(record["queue_wait_ms"], 1500)
+        self.assertLess(record["queue_wait_ms"], 60_000)
+
+    def test_context_max_bytes(self) -> None:
+        structlog.contextvars.bind_contextvars(
+            **{f"key_{i}": "x" * 10 for i in range(20)}
+        )
+        self.addCleanup(structlog.contextvars.clear_contextvars)
+        headers: dict[str, Any] = {"id": "task-0"}
+
+        with self.settings(
+            DJANGO_STRUCTLOG_CELERY_TASK_METRICS_ENABLED=True,
+            DJANGO_STRUCTLOG_CELERY_CONTEXT_MAX_BYTES=128,
+        ):
+            self.receiver.receiver_before_task_publish(headers=headers)
+
+        context = headers["__django_structlog__"]
+        # sorted by name, until the cap minus the room of the timestamp
+        self.assertEqual(
+            {"key_0", "key_1", "key_10", "key_11", metrics.PUBLISHED_AT}, set(context)
+        )
+        self.assertLessEqual(
+            len(json.dumps(context, separators=(",", ":")).encode()), 128
+        )
+
+    def test_task_failed(self) -> None:
+        with self.settings(DJANGO_STRUCTLOG_CELERY_TASK_METRICS_ENABLED=True):
+            record = self.run_task(failed=True)
+
+        self.assertEqual("task_failed", record["event"])
+        self.assertGreaterEqual(record["cpu_time_ms"], 0)
+        self.assertGreaterEqual(record["max_rss_delta_kb"], 0)
+        self.assertIn("queue_wait_ms", record)
+
+    def test_disabled(self) -> None:
+        record = self.run_task()
+
+        self.assertNotIn(metrics.PUBLISHED_AT, self.task.request.__django_structlog__)
+        self.assertNotIn("cpu_time_ms", record)
+        self.assertNotIn("max_rss_delta_kb", record)
+        self.assertNotIn("queue_wait_ms", record)
+
+    def test_disabled_in_worker(self) -> None:
+        with self.settings(DJANGO_STRUCTLOG_CELERY_TASK_METRICS_ENABLED=True):
+            headers: dict[str, Any] = {"id": "task-0"}
+            self.receiver.receiver_before_task_publish(headers=headers)
+        self.task.request.__django_structlog__ = headers["__django_structlog__"]
+
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+        ) as log_results:
+            self.receiver.receiver_task_prerun("task-0", self.task)
+            self.receiver.receiver_task_success(result="foo", sender=self.task)
+
+        record = cast(Any, log_results.records[-1]).msg
+        self.assertNotIn(metrics.PUBLISHED_AT, record)
+        self.assertNotIn("queue_wait_ms", record)
+
+    def test_not_published_with_metrics(self) -> None:
+        with self.settings(DJANGO_STRUCTLOG_CELERY_TASK_METRICS_ENABLED=True):
+            self.task.request.__django_structlog__ = {"request_id": "foo"}
+            with self.assertLogs(
+                logging.getLogger("django_structlog.celery.receivers"), logging.INFO
+            ) as log_results:
+                self.receiver.receiver_task_prerun("task-0", self.task)
+                self.receiver.receiver_task_success(result="foo", sender=self.task)
+
+        record = cast(Any, log_results.records[-1]).msg
+        self.assertIn("cpu_time_ms", record)
+        self.assertNotIn("queue_wait_ms", record)
+
+    def test_task_revoked(self) -> None:
+        request = Mock(id="task-0", task="add")
+        request.__django_structlog__ = {"request_id": "foo", metrics.PUBLISHED_AT: 1.0}
+
+        with self.assertLogs(
+            logging.getLogger("django_structlog.celery.receivers"), logging.WARNING
+        ) as log_results:
+            self.receiver.receiver_task_revoked(request=request)
+
+        record = cast(Any, log_results.records[0]).msg
+        self.assertEqual("foo", record["request_id"])
+        self.assertNotIn(metrics.PUBLISHED_AT, record)
+
+    def test_published_in_group(self) -> None:
+        with (
+            self.settings(DJANGO_STRUCTLOG_CELERY_TASK_METRICS_ENABLED=True),
+            receivers.aggregate_enqueued(),
+        ):
+            headers = []
+            for i in range(2):
+                task_headers: dict[str, Any] = {"id": f"task-{i}", "group": "group"}
+                self.receiver.receiver_before_task_publish(headers=task_headers)
+                self.receiver.receiver_after_task_publish(headers=task_headers)
+                headers.append(task_headers["__django_structlog__"])
+
+        for context in headers:
+            self.assertIn(metrics.PUBLISHED_AT, context)
+        self.assertIsNot(headers[0], headers[1])
+
 
 class TestConnectCeleryTaskSignals(TestCase):
     def test_call(self) -> None:
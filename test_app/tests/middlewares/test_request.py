@@ -1,18 +1,28 @@
 import asyncio
+import gc
 import logging
 import traceback
 import uuid
-from typing import Any, AsyncGenerator, Awaitable, Generator, Type, cast
+from typing import Any, AsyncGenerator, Awaitable, Generator, Optional, Type, cast
 from unittest import mock
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, Mock, call, patch
 
 import structlog
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY,
+    HASH_SESSION_KEY,
+    SESSION_KEY,
+    login,
+)
 from django.contrib.auth.middleware import AuthenticationMiddleware
 from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.sessions.backends.db import SessionStore
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.contrib.sites.models import Site
 from django.contrib.sites.shortcuts import get_current_site
 from django.core.exceptions import PermissionDenied
+from django.core.handlers.base import BaseHandler
 from django.core.signals import got_request_exception
 from django.dispatch import receiver
 from django.http import (
@@ -25,7 +35,9 @@ from django.http import (
     StreamingHttpResponse,
 )
 from django.test import RequestFactory, TestCase, override_settings
+from django.utils.functional import SimpleLazyObject
 
+from django_structlog import sampling
 from django_structlog.middlewares.request import (
     RequestMiddleware,
     async_streaming_content_wrapper,
@@ -36,6 +48,7 @@ from django_structlog.signals import (
     bind_extra_request_failed_metadata,
     bind_extra_request_finished_metadata,
     bind_extra_request_metadata,
+    update_failure_response,
 )
 
 
@@ -436,6 +449,10 @@ class TestRequestMiddleware(TestCase):
             log_kwargs["request_started_log"] = "foo"
             structlog.contextvars.bind_contextvars(domain=current_site.domain)
 
+        self.addCleanup(
+            bind_extra_request_metadata.disconnect, receiver_bind_extra_request_metadata
+        )
+
         mock_response = Mock()
         mock_response.status_code = 200
 
@@ -493,6 +510,11 @@ class TestRequestMiddleware(TestCase):
             log_kwargs["request_finished_log"] = "foo"
             structlog.contextvars.bind_contextvars(domain=current_site.domain)
 
+        self.addCleanup(
+            bind_extra_request_finished_metadata.disconnect,
+            receiver_bind_extra_request_finished_metadata,
+        )
+
         def get_response(_request: HttpRequest) -> HttpResponse:
             return mock_response
 
@@ -550,6 +572,11 @@ class TestRequestMiddleware(TestCase):
             log_kwargs["request_failed_log"] = "foo"
             structlog.contextvars.bind_contextvars(domain=current_site.domain)
 
+        self.addCleanup(
+            bind_extra_request_failed_metadata.disconnect,
+            receiver_bind_extra_request_failed_metadata,
+        )
+
         request = self.factory.get("/foo")
 
         mock_user: Any = User.objects.create(email="foo@example.com")
@@ -919,6 +946,39 @@ class TestRequestMiddleware(TestCase):
         self.assertNotIn("user_id", record.msg)
         self.assertEqual(x_request_id, record.msg["request_id"])
 
+    def test_should_log_request_id_from_generator(self) -> None:
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            with self.assertLogs(__name__, logging.INFO) as log_results:
+                self.logger.info("hello")
+            self.log_results = log_results
+            return HttpResponse()
+
+        middleware = RequestMiddleware(get_response)
+        with patch("django_structlog.request_id.process_counter", return_value="foo-1"):
+            with self.settings(
+                DJANGO_STRUCTLOG_REQUEST_ID_GENERATOR="django_structlog.request_id.process_counter"
+            ):
+                middleware(self.factory.get("/foo"))
+
+        self.assertEqual(1, len(self.log_results.records))
+        record: Any = self.log_results.records[0]
+        self.assertEqual("foo-1", record.msg["request_id"])
+
+    def test_should_log_request_id_from_callable_generator(self) -> None:
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            with self.assertLogs(__name__, logging.INFO) as log_results:
+                self.logger.info("hello")
+            self.log_results = log_results
+            return HttpResponse()
+
+        middleware = RequestMiddleware(get_response)
+        with self.settings(DJANGO_STRUCTLOG_REQUEST_ID_GENERATOR=lambda: "bar"):
+            middleware(self.factory.get("/foo"))
+
+        self.assertEqual(1, len(self.log_results.records))
+        record: Any = self.log_results.records[0]
+        self.assertEqual("bar", record.msg["request_id"])
+
     def test_should_log_correlation_id_from_request_x_correlation_id_header(
         self,
     ) -> None:
@@ -971,6 +1031,10 @@ class TestRequestMiddleware(TestCase):
 
         mock_sync_streaming_response_wrapper.assert_called_once()
         self.assertEqual(response.streaming_content, mock_wrapper)
+        self.assertEqual(
+            request._django_structlog_started_at,  # type: ignore[attr-defined]
+            mock_sync_streaming_response_wrapper.call_args.args[2],
+        )
 
     def test_async_streaming_response(self) -> None:
         async def streaming_content() -> AsyncGenerator[Any, None]:  # pragma: no cover
@@ -997,6 +1061,10 @@ class TestRequestMiddleware(TestCase):
 
         mock_sync_streaming_response_wrapper.assert_called_once()
         self.assertEqual(response.streaming_content, mock_wrapper)
+        self.assertEqual(
+            request._django_structlog_started_at,  # type: ignore[attr-defined]
+            mock_sync_streaming_response_wrapper.call_args.args[2],
+        )
 
     async def test_async_cancel(self) -> None:
         async def async_get_response(request: HttpRequest) -> Any:
@@ -1052,6 +1120,65 @@ class TestRequestMiddleware(TestCase):
         self.assertEqual("DEBUG", record.levelname)
         self.assertEqual("request_cancelled", record.msg["event"])
 
+    def test_context_only_captured_for_streaming_response(self) -> None:
+        middleware = RequestMiddleware(Mock())
+        request = self.factory.get("/foo")
+
+        with patch(
+            "structlog.contextvars.get_merged_contextvars",
+            wraps=structlog.contextvars.get_merged_contextvars,
+        ) as mock_get_merged_contextvars:
+            middleware.handle_response(request, HttpResponse())
+            mock_get_merged_contextvars.assert_not_called()
+
+            middleware.handle_response(
+                request, cast(HttpResponse, StreamingHttpResponse(iter([])))
+            )
+            mock_get_merged_contextvars.assert_called_once()
+
+    def test_request_finished_duration_ms(self) -> None:
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            return HttpResponse()
+
+        middleware = RequestMiddleware(get_response)
+        with (
+            patch("time.monotonic_ns", side_effect=[1_000_000_000, 1_012_600_000]),
+            self.assertLogs(
+                "django_structlog.middlewares.request", logging.INFO
+            ) as log_results,
+        ):
+            middleware(self.factory.get("/foo"))
+
+        self.assertEqual(2, len(log_results.records))
+        record: Any = log_results.records[0]
+        self.assertEqual("request_started", record.msg["event"])
+        self.assertNotIn("duration_ms", record.msg)
+        record = log_results.records[1]
+        self.assertEqual("request_finished", record.msg["event"])
+        self.assertEqual(13, record.msg["duration_ms"])
+
+    def test_request_failed_duration_ms(self) -> None:
+        def get_response(request: HttpRequest) -> HttpResponse:
+            try:
+                raise Exception("This is an exception")
+            except Exception:
+                got_request_exception.send(object, request=request)
+                return HttpResponseServerError()
+
+        middleware = RequestMiddleware(get_response)
+        with (
+            patch("time.monotonic_ns", side_effect=[1_000_000_000, 1_500_000_000]),
+            self.assertLogs(
+                "django_structlog.middlewares.request", logging.INFO
+            ) as log_results,
+        ):
+            middleware(self.factory.get("/foo"))
+
+        self.assertEqual(2, len(log_results.records))
+        record: Any = log_results.records[1]
+        self.assertEqual("request_failed", record.msg["event"])
+        self.assertEqual(500, record.msg["duration_ms"])
+
     @override_settings(DJANGO_STRUCTLOG_IP_LOGGING_ENABLED=False)
     def test_disable_ip_logging(self) -> None:
         mock_response = Mock()
@@ -1078,169 +1205,982 @@ class TestRequestMiddleware(TestCase):
         self.assertNotIn("ip", record.msg)
 
 
-class TestRequestMiddlewareRouter(TestCase):
-    async def test_async(self) -> None:
-        mock_response = Mock()
+class TestRequestMiddlewareSignals(TestCase):
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
 
-        async def async_get_response(request: HttpRequest) -> Any:
-            return mock_response
+    def test_signals_not_sent_without_listeners(self) -> None:
+        def get_response(request: HttpRequest) -> HttpResponse:
+            try:
+                raise Exception("This is an exception")
+            except Exception:
+                got_request_exception.send(object, request=request)
+                return HttpResponseServerError()
+
+        signals = [
+            bind_extra_request_metadata,
+            bind_extra_request_finished_metadata,
+            bind_extra_request_failed_metadata,
+            update_failure_response,
+        ]
+        with (
+            patch.object(bind_extra_request_metadata, "send") as mock_started,
+            patch.object(bind_extra_request_failed_metadata, "send") as mock_failed,
+            patch.object(update_failure_response, "send") as mock_update,
+            patch.object(bind_extra_request_finished_metadata, "send") as mock_finished,
+            self.assertLogs("django_structlog.middlewares.request", logging.INFO),
+        ):
+            self.assertFalse(any(signal.has_listeners() for signal in signals))
+            RequestMiddleware(get_response)(RequestFactory().get("/foo"))
+            RequestMiddleware(lambda request: HttpResponse())(
+                RequestFactory().get("/foo")
+            )
 
-        middleware = RequestMiddleware(async_get_response)
+        mock_started.assert_not_called()
+        mock_finished.assert_not_called()
+        mock_failed.assert_not_called()
+        mock_update.assert_not_called()
 
-        mock_request = Mock()
+    def test_hooks(self) -> None:
+        def hook(log_kwargs: Any, **kwargs: Any) -> None:
+            log_kwargs["hooked"] = True
+
+        middleware = RequestMiddleware(lambda request: HttpResponse())
         with (
-            patch(
-                "django_structlog.middlewares.RequestMiddleware.prepare"
-            ) as mock_prepare,
-            patch(
-                "django_structlog.middlewares.RequestMiddleware.handle_response"
-            ) as mock_handle_response,
+            self.settings(
+                DJANGO_STRUCTLOG_HOOKS={
+                    "bind_extra_request_metadata": [hook],
+                    "bind_extra_request_finished_metadata": [hook],
+                }
+            ),
+            self.assertLogs(
+                "django_structlog.middlewares.request", logging.INFO
+            ) as log_results,
         ):
-            response = await cast(Awaitable[HttpResponse], middleware(mock_request))
-        self.assertEqual(response, mock_response)
-        mock_prepare.assert_called_once_with(mock_request)
-        mock_handle_response.assert_called_once_with(mock_request, mock_response)
+            middleware(RequestFactory().get("/foo"))
 
-    def test_sync(self) -> None:
-        mock_response = Mock()
+        self.assertEqual(2, len(log_results.records))
+        for record in log_results.records:
+            self.assertTrue(cast(Any, record).msg["hooked"])
 
-        def get_response(request: HttpRequest) -> HttpResponse:
-            return mock_response
 
-        middleware = RequestMiddleware(get_response)
+@override_settings(
+    SECRET_KEY="00000000000000000000000000000000",
+    DJANGO_STRUCTLOG_USER_ID_FROM_SESSION=True,
+)
+class TestRequestMiddlewareSessionUserId(TestCase):
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
 
-        mock_request = Mock()
-        with (
-            patch(
-                "django_structlog.middlewares.RequestMiddleware.prepare"
-            ) as mock_prepare,
-            patch(
-                "django_structlog.middlewares.RequestMiddleware.handle_response"
-            ) as mock_handle_response,
-        ):
-            response = middleware(mock_request)
-        self.assertEqual(response, mock_response)
-        mock_prepare.assert_called_once_with(mock_request)
-        mock_handle_response.assert_called_once_with(mock_request, mock_response)
+    def run_middlewares(
+        self, get_response: Any, session_key: Optional[str] = None
+    ) -> tuple[HttpRequest, HttpResponse, Any]:
+        request = RequestFactory().get("/foo")
+        if session_key is not None:
+            request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+        request_middleware = RequestMiddleware(get_response)
+        authentication_middleware = AuthenticationMiddleware(
+            cast(Any, request_middleware)
+        )
+        session_middleware = SessionMiddleware(cast(Any, authentication_middleware))
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            response = cast(HttpResponse, session_middleware(request))
+        return request, response, log_results
+
+    def login(self, user: Any) -> str:
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        return cast(str, session.session_key)
+
+    def test_anonymous(self) -> None:
+        with self.assertNumQueries(0):
+            request, response, log_results = self.run_middlewares(
+                lambda request: HttpResponse()
+            )
 
+        self.assertIsNone(response.headers.get("Vary"))
+        self.assertEqual(2, len(log_results.records))
+        for record in log_results.records:
+            self.assertIsNone(record.msg["user_id"])
+        self.assertIsInstance(request.user, AnonymousUser)
+
+    def test_user_is_not_loaded(self) -> None:
+        user: Any = User.objects.create()
+        session_key = self.login(user)
+
+        # only the session is loaded
+        with self.assertNumQueries(1):
+            request, response, log_results = self.run_middlewares(
+                lambda request: HttpResponse(), session_key
+            )
 
-class TestGetRequestHeader(TestCase):
-    def test_django_22_or_higher(self) -> None:
-        mock_request = mock.MagicMock(spec=["headers"])
-        get_request_header(mock_request, "x-foo-bar", "HTTP_X_FOO_BAR")
-        mock_request.headers.get.assert_called_once_with("x-foo-bar")
+        self.assertIsNone(response.headers.get("Vary"))
+        self.assertEqual(2, len(log_results.records))
+        for record in log_results.records:
+            self.assertEqual(user.pk, record.msg["user_id"])
+        self.assertEqual(user, request.user)
 
-    def test_django_prior_to_22(self) -> None:
-        mock_request = mock.MagicMock(spec=["META"])
-        get_request_header(mock_request, "x-foo-bar", "HTTP_X_FOO_BAR")
-        mock_request.META.get.assert_called_once_with("HTTP_X_FOO_BAR")
+    def test_user_evaluated_in_view(self) -> None:
+        user: Any = User.objects.create()
+        session_key = self.login(user)
 
+        def get_response(request: HttpRequest) -> HttpResponse:
+            self.assertEqual(user, request.user)
+            return HttpResponse()
 
-class TestSyncStreamingContentWrapper(TestCase):
-    def setUp(self) -> None:
-        self.logger = structlog.getLogger(__name__)
+        request, response, log_results = self.run_middlewares(get_response, session_key)
 
-    def test_success(self) -> None:
-        result = Mock()
+        self.assertIsNotNone(response.headers.get("Vary"))
+        self.assertEqual(2, len(log_results.records))
+        for record in log_results.records:
+            self.assertEqual(user.pk, record.msg["user_id"])
 
-        def streaming_content() -> Generator[Any, None, None]:
-            self.logger.info("streaming_content")
-            yield result
+    def test_user_logged_in_view(self) -> None:
+        user: Any = User.objects.create()
 
-        wrapped_streaming_content = sync_streaming_content_wrapper(
-            streaming_content(), {"foo": "bar"}
+        def get_response(request: HttpRequest) -> HttpResponse:
+            login(request, user)
+            return HttpResponse()
+
+        request, response, log_results = self.run_middlewares(get_response)
+
+        self.assertEqual(2, len(log_results.records))
+        self.assertIsNone(log_results.records[0].msg["user_id"])
+        self.assertEqual(user.pk, log_results.records[1].msg["user_id"])
+
+    def test_without_session(self) -> None:
+        user: Any = User.objects.create()
+        request = RequestFactory().get("/foo")
+        request.user = cast(Any, SimpleLazyObject(lambda: user))
+
+        RequestMiddleware.bind_user_id(request)
+
+        self.assertEqual(
+            user.pk, structlog.contextvars.get_contextvars().get("user_id")
         )
+
+    def test_async_thread_not_required_once_bound(self) -> None:
+        request = RequestFactory().get("/foo")
+        request.session = SessionStore()
+        request.user = cast(Any, SimpleLazyObject(lambda: AnonymousUser()))
+        middleware = RequestMiddleware(lambda request: HttpResponse())
+        signal = bind_extra_request_finished_metadata
+
+        self.assertTrue(middleware._requires_thread(request, signal))
+        RequestMiddleware.bind_user_id(request)
+        self.assertFalse(middleware._requires_thread(request, signal))
+
+
+class TestGotRequestExceptionDispatch(TestCase):
+    @override_settings(MIDDLEWARE=["django_structlog.middlewares.RequestMiddleware"])
+    def test_receivers_count_constant(self) -> None:
+        receivers_count = len(got_request_exception.receivers)
+
+        handlers = []
+        for _ in range(20):
+            handler = BaseHandler()
+            handler.load_middleware()
+            async_handler = BaseHandler()
+            async_handler.load_middleware(is_async=True)
+            handlers += [handler, async_handler, RequestMiddleware(Mock())]
+
+        self.assertEqual(receivers_count, len(got_request_exception.receivers))
+
+    def test_dispatched_to_middleware_of_request(self) -> None:
+        middleware = RequestMiddleware(Mock())
+        latest_middleware = RequestMiddleware(Mock())
+        request = RequestFactory().get("/foo")
+        middleware.prepare(request)
+
         with (
-            self.assertLogs(__name__, logging.INFO) as streaming_content_log_results,
-            self.assertLogs(
-                "django_structlog.middlewares.request", logging.INFO
-            ) as log_results,
+            patch.object(
+                middleware, "process_got_request_exception"
+            ) as mock_process_got_request_exception,
+            patch.object(
+                latest_middleware, "process_got_request_exception"
+            ) as mock_latest_process_got_request_exception,
         ):
-            self.assertEqual(result, next(wrapped_streaming_content))
+            got_request_exception.send(object, request=request)
 
-        self.assertEqual(1, len(log_results.records))
-        record: Any
-        record = log_results.records[0]
-        self.assertEqual("INFO", record.levelname)
-        self.assertEqual("streaming_started", record.msg["event"])
-        self.assertIn("foo", record.msg)
-        self.assertEqual("bar", record.msg["foo"])
+        mock_process_got_request_exception.assert_called_once_with(
+            object, request, signal=got_request_exception
+        )
+        mock_latest_process_got_request_exception.assert_not_called()
+        structlog.contextvars.clear_contextvars()
 
-        with self.assertLogs(
-            "django_structlog.middlewares.request", logging.INFO
-        ) as log_results:
-            self.assertRaises(StopIteration, next, wrapped_streaming_content)
+    def test_dispatched_to_latest_middleware(self) -> None:
+        RequestMiddleware(Mock())
+        latest_middleware = RequestMiddleware(Mock())
+        request = RequestFactory().get("/foo")
 
-        self.assertEqual(1, len(streaming_content_log_results.records))
-        record = streaming_content_log_results.records[0]
-        self.assertEqual("INFO", record.levelname)
-        self.assertIn("foo", record.msg)
-        self.assertEqual("bar", record.msg["foo"])
+        with patch.object(
+            latest_middleware, "process_got_request_exception"
+        ) as mock_process_got_request_exception:
+            got_request_exception.send(object, request=request)
 
-        self.assertEqual(1, len(streaming_content_log_results.records))
-        record = log_results.records[0]
-        self.assertEqual("INFO", record.levelname)
-        self.assertEqual("streaming_finished", record.msg["event"])
-        self.assertIn("foo", record.msg)
-        self.assertEqual("bar", record.msg["foo"])
+        mock_process_got_request_exception.assert_called_once_with(
+            object, request, signal=got_request_exception
+        )
 
-    def test_failure(self) -> None:
-        result = Mock()
+    def test_latest_middleware_garbage_collected(self) -> None:
+        RequestMiddleware(Mock())
+        gc.collect()
 
-        class CustomException(Exception):
-            pass
+        with patch.object(
+            RequestMiddleware, "process_got_request_exception"
+        ) as mock_process_got_request_exception:
+            got_request_exception.send(object, request=RequestFactory().get("/foo"))
 
-        exception = CustomException()
+        mock_process_got_request_exception.assert_not_called()
 
-        def streaming_content() -> Generator[Any, None, None]:
-            self.logger.info("streaming_content")
-            yield result
-            raise exception
 
-        wrapped_streaming_content = sync_streaming_content_wrapper(
-            streaming_content(), {"foo": "bar"}
+class TestRequestMiddlewareIp(TestCase):
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+
+    def test_get_client_ip_memoised(self) -> None:
+        request = RequestFactory().get("/foo")
+
+        with patch(
+            "django_structlog.middlewares.request.get_client_ip",
+            return_value=("1.2.3.4", True),
+        ) as mock_get_client_ip:
+            self.assertEqual("1.2.3.4", RequestMiddleware.get_client_ip(request))
+            self.assertEqual("1.2.3.4", RequestMiddleware.get_client_ip(request))
+
+        mock_get_client_ip.assert_called_once_with(request)
+
+    def test_get_client_ip_memoised_none(self) -> None:
+        request = RequestFactory().get("/foo")
+
+        with patch(
+            "django_structlog.middlewares.request.get_client_ip",
+            return_value=(None, False),
+        ) as mock_get_client_ip:
+            self.assertIsNone(RequestMiddleware.get_client_ip(request))
+            self.assertIsNone(RequestMiddleware.get_client_ip(request))
+
+        mock_get_client_ip.assert_called_once_with(request)
+
+    def test_bind_ip_in_signal_receiver(self) -> None:
+        mock_receiver = Mock(
+            side_effect=lambda request, **kwargs: self.assertEqual(
+                "1.2.3.4", RequestMiddleware.get_client_ip(request)
+            )
         )
+        bind_extra_request_metadata.connect(mock_receiver)
+        self.addCleanup(bind_extra_request_metadata.disconnect, mock_receiver)
+
+        middleware = RequestMiddleware(lambda request: HttpResponse())
         with (
-            self.assertLogs(__name__, logging.INFO) as streaming_content_log_results,
+            patch(
+                "django_structlog.middlewares.request.get_client_ip",
+                return_value=("1.2.3.4", True),
+            ) as mock_get_client_ip,
             self.assertLogs(
                 "django_structlog.middlewares.request", logging.INFO
             ) as log_results,
         ):
-            self.assertEqual(result, next(wrapped_streaming_content))
+            middleware(RequestFactory().get("/foo"))
 
-        self.assertEqual(1, len(log_results.records))
-        record: Any
-        record = log_results.records[0]
-        self.assertEqual("INFO", record.levelname)
-        self.assertEqual("streaming_started", record.msg["event"])
-        self.assertIn("foo", record.msg)
-        self.assertEqual("bar", record.msg["foo"])
+        mock_get_client_ip.assert_called_once()
+        mock_receiver.assert_called_once()
+        record: Any = log_results.records[0]
+        self.assertEqual("1.2.3.4", record.msg["ip"])
+
+    @override_settings(DJANGO_STRUCTLOG_IP_PROXY_HEADER="HTTP_X_FORWARDED_FOR")
+    def test_proxy_header(self) -> None:
+        def get_ip(forwarded_for: Optional[str], proxy_count: int = 1) -> Any:
+            extra: Any = (
+                {} if forwarded_for is None else {"HTTP_X_FORWARDED_FOR": forwarded_for}
+            )
+            request = RequestFactory().get("/foo", **extra)
+            with self.settings(DJANGO_STRUCTLOG_IP_PROXY_COUNT=proxy_count):
+                return RequestMiddleware.get_client_ip(request)
+
+        with patch(
+            "django_structlog.middlewares.request.get_client_ip"
+        ) as mock_get_client_ip:
+            self.assertEqual("2.2.2.2", get_ip("1.1.1.1, 2.2.2.2"))
+            self.assertEqual("2.2.2.2", get_ip("2.2.2.2"))
+            self.assertEqual("1.1.1.1", get_ip("3.3.3.3, 1.1.1.1,2.2.2.2", 2))
+            self.assertEqual("1.1.1.1", get_ip("1.1.1.1, 2.2.2.2", 3))
+            self.assertEqual("127.0.0.1", get_ip(None))
+            self.assertEqual("127.0.0.1", get_ip(""))
+            self.assertEqual("127.0.0.1", get_ip("1.2.3.4, ,"))
+            self.assertEqual("127.0.0.1", get_ip("1.2.3.4, , ", 2))
+            self.assertEqual("1.2.3.4", get_ip("1.2.3.4, ,", 3))
+
+        mock_get_client_ip.assert_not_called()
+
+
+class TestRequestMiddlewareRequestFormat(TestCase):
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+
+    def get_log_results(self, path: str, status_code: int = 200) -> Any:
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            return HttpResponse(status=status_code)
 
+        middleware = RequestMiddleware(get_response)
         with self.assertLogs(
             "django_structlog.middlewares.request", logging.INFO
         ) as log_results:
-            self.assertRaises(CustomException, next, wrapped_streaming_content)
+            middleware(RequestFactory().get(path))
+        records: Any = log_results.records
+        return [record.msg for record in records]
 
-        self.assertEqual(1, len(streaming_content_log_results.records))
-        record = streaming_content_log_results.records[0]
-        self.assertEqual("INFO", record.levelname)
-        self.assertIn("foo", record.msg)
-        self.assertEqual("bar", record.msg["foo"])
+    def test_request_formatted_once(self) -> None:
+        with patch.object(
+            HttpRequest, "get_full_path", autospec=True, return_value="/foo?bar=baz"
+        ) as mock_get_full_path:
+            started, finished = self.get_log_results("/foo?bar=baz")
 
-        self.assertEqual(1, len(streaming_content_log_results.records))
-        record = log_results.records[0]
-        self.assertEqual("ERROR", record.levelname)
-        self.assertEqual("streaming_failed", record.msg["event"])
-        self.assertIn("foo", record.msg)
-        self.assertEqual("bar", record.msg["foo"])
+        mock_get_full_path.assert_called_once()
+        self.assertEqual("GET /foo?bar=baz", started["request"])
+        self.assertEqual("GET /foo?bar=baz", finished["request"])
 
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_FIELDS_ENABLED=True)
+    def test_request_fields(self) -> None:
+        started, finished = self.get_log_results("/foo?bar=baz")
 
-class TestASyncStreamingContentWrapper(TestCase):
-    def setUp(self) -> None:
-        self.logger = structlog.getLogger(__name__)
+        for record in (started, finished):
+            self.assertNotIn("request", record)
+            self.assertEqual("GET", record["method"])
+            self.assertEqual("/foo", record["path"])
+            self.assertEqual("bar=baz", record["query"])
+
+    def test_request_fields_path_escaped(self) -> None:
+        started, _ = self.get_log_results("/caf%C3%A9/%0Abar")
+        with self.settings(DJANGO_STRUCTLOG_REQUEST_FIELDS_ENABLED=True):
+            fields_started, _ = self.get_log_results("/caf%C3%A9/%0Abar")
+
+        self.assertEqual("GET /caf%C3%A9/%0Abar", started["request"])
+        self.assertEqual("/caf%C3%A9/%0Abar", fields_started["path"])
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_FIELDS_ENABLED=True)
+    def test_request_fields_without_query(self) -> None:
+        started, _ = self.get_log_results("/foo")
+
+        self.assertEqual("/foo", started["path"])
+        self.assertEqual("", started["query"])
+
+    @override_settings(
+        DJANGO_STRUCTLOG_REQUEST_QUERY_REDACTED_PARAMS=("token", "api key")
+    )
+    def test_query_redacted(self) -> None:
+        started, _ = self.get_log_results(
+            "/caf%C3%A9?token=secret&page=2&api+key=secret&tokens=1&token"
+        )
+
+        self.assertEqual(
+            "GET /caf%C3%A9?token=[REDACTED]&page=2&api+key=[REDACTED]&tokens=1&token=[REDACTED]",
+            started["request"],
+        )
+
+    @override_settings(
+        DJANGO_STRUCTLOG_REQUEST_FIELDS_ENABLED=True,
+        DJANGO_STRUCTLOG_REQUEST_QUERY_REDACTED_PARAMS=("token",),
+    )
+    def test_request_fields_query_redacted(self) -> None:
+        started, _ = self.get_log_results("/foo?token=secret&page=2")
+
+        self.assertEqual("token=[REDACTED]&page=2", started["query"])
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_QUERY_MAX_LENGTH=10)
+    def test_query_truncated(self) -> None:
+        started, _ = self.get_log_results("/foo?bar=0123456789")
+        self.assertEqual("GET /foo?bar=012345...", started["request"])
+
+        started, _ = self.get_log_results("/foo?bar=012345")
+        self.assertEqual("GET /foo?bar=012345", started["request"])
+
+        started, _ = self.get_log_results("/foo")
+        self.assertEqual("GET /foo", started["request"])
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_FIELDS_ENABLED=True)
+    def test_request_failed_fields(self) -> None:
+        def get_response(request: HttpRequest) -> HttpResponse:
+            try:
+                raise Exception("This is an exception")
+            except Exception:
+                got_request_exception.send(object, request=request)
+                return HttpResponseServerError()
+
+        middleware = RequestMiddleware(get_response)
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            middleware(RequestFactory().post("/foo?bar=baz"))
+
+        record: Any = log_results.records[1]
+        self.assertEqual("request_failed", record.msg["event"])
+        self.assertEqual("POST", record.msg["method"])
+        self.assertEqual("/foo", record.msg["path"])
+        self.assertEqual("bar=baz", record.msg["query"])
+
+
+@override_settings(DJANGO_STRUCTLOG_REQUEST_SUMMARY_ENABLED=True)
+class TestRequestMiddlewareSummary(TestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory(HTTP_USER_AGENT="Mozilla/5.0")
+
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+
+    def test_request_finished(self) -> None:
+        @receiver(bind_extra_request_metadata)
+        def receiver_bind_extra_request_metadata(
+            sender: Type[Any], log_kwargs: Any = None, **kwargs: Any
+        ) -> None:
+            log_kwargs["request_started_log"] = "foo"
+
+        @receiver(bind_extra_request_finished_metadata)
+        def receiver_bind_extra_request_finished_metadata(
+            sender: Type[Any], log_kwargs: Any = None, **kwargs: Any
+        ) -> None:
+            log_kwargs["request_finished_log"] = "bar"
+
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            return HttpResponse()
+
+        request = self.factory.get("/foo?bar=baz")
+        middleware = RequestMiddleware(get_response)
+
+        try:
+            with self.assertLogs(
+                "django_structlog.middlewares.request", logging.INFO
+            ) as log_results:
+                middleware(request)
+        finally:
+            bind_extra_request_metadata.disconnect(receiver_bind_extra_request_metadata)
+            bind_extra_request_finished_metadata.disconnect(
+                receiver_bind_extra_request_finished_metadata
+            )
+
+        self.assertEqual(1, len(log_results.records))
+        record: Any = log_results.records[0]
+        self.assertEqual("INFO", record.levelname)
+        self.assertEqual("request_finished", record.msg["event"])
+        self.assertEqual(200, record.msg["code"])
+        self.assertEqual("GET /foo?bar=baz", record.msg["request"])
+        self.assertEqual("Mozilla/5.0", record.msg["user_agent"])
+        self.assertEqual("127.0.0.1", record.msg["ip"])
+        self.assertIn("request_id", record.msg)
+        self.assertEqual("foo", record.msg["request_started_log"])
+        self.assertEqual("bar", record.msg["request_finished_log"])
+        self.assertFalse(hasattr(request, "_django_structlog_request_started_kwargs"))
+
+    def test_request_failed(self) -> None:
+        exception = Exception("This is an exception")
+
+        def get_response(request: HttpRequest) -> HttpResponse:
+            try:
+                raise exception
+            except Exception:
+                got_request_exception.send(object, request=request)
+                return HttpResponseServerError()
+
+        middleware = RequestMiddleware(get_response)
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            middleware(self.factory.get("/foo"))
+
+        self.assertEqual(1, len(log_results.records))
+        record: Any = log_results.records[0]
+        self.assertEqual("request_failed", record.msg["event"])
+        self.assertEqual(500, record.msg["code"])
+        self.assertEqual("Mozilla/5.0", record.msg["user_agent"])
+
+    async def test_request_cancelled(self) -> None:
+        async def async_get_response(request: HttpRequest) -> Any:
+            raise asyncio.CancelledError
+
+        middleware = RequestMiddleware(async_get_response)
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            with self.assertRaises(asyncio.CancelledError):
+                await cast(
+                    Awaitable[HttpResponse], middleware(self.factory.get("/foo"))
+                )
+
+        self.assertEqual(1, len(log_results.records))
+        record: Any = log_results.records[0]
+        self.assertEqual("request_cancelled", record.msg["event"])
+        self.assertEqual("GET /foo", record.msg["request"])
+        self.assertEqual("Mozilla/5.0", record.msg["user_agent"])
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0)
+    def test_not_sampled(self) -> None:
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            return HttpResponseNotFound()
+
+        middleware = RequestMiddleware(get_response)
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            middleware(self.factory.get("/foo"))
+
+        self.assertEqual(1, len(log_results.records))
+        record: Any = log_results.records[0]
+        self.assertEqual("request_finished", record.msg["event"])
+        self.assertEqual("Mozilla/5.0", record.msg["user_agent"])
+
+
+class TestRequestMiddlewareSampling(TestCase):
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+
+    def get_log_results(
+        self, status_code: int = 200, path: str = "/foo", **extra: Any
+    ) -> Any:
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            self.context = structlog.contextvars.get_contextvars()
+            return HttpResponse(status=status_code)
+
+        middleware = RequestMiddleware(get_response)
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.DEBUG
+        ) as log_results:
+            logging.getLogger("django_structlog.middlewares.request").debug("marker")
+            middleware(RequestFactory().get(path, **extra))
+        records: Any = log_results.records[1:]
+        return [record.msg["event"] for record in records]
+
+    def test_sampling_disabled_by_default(self) -> None:
+        self.assertEqual(
+            ["request_started", "request_finished"], self.get_log_results()
+        )
+        self.assertNotIn("sampled", self.context)
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0)
+    def test_not_sampled(self) -> None:
+        self.assertEqual([], self.get_log_results())
+        self.assertFalse(self.context["sampled"])
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0.999999)
+    def test_sampled(self) -> None:
+        self.assertEqual(
+            ["request_started", "request_finished"], self.get_log_results()
+        )
+        self.assertTrue(self.context["sampled"])
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0)
+    def test_not_sampled_errors_are_logged(self) -> None:
+        self.assertEqual(["request_finished"], self.get_log_results(404))
+        self.assertEqual(["request_finished"], self.get_log_results(503))
+        self.assertEqual([], self.get_log_results(302))
+
+    @override_settings(
+        DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0,
+        DJANGO_STRUCTLOG_REQUEST_SAMPLING_KEEP_STATUS_CLASSES=(5,),
+    )
+    def test_not_sampled_keep_status_classes(self) -> None:
+        self.assertEqual([], self.get_log_results(404))
+        self.assertEqual(["request_finished"], self.get_log_results(500))
+
+    @override_settings(
+        DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0,
+        DJANGO_STRUCTLOG_REQUEST_SAMPLING_KEEP_SLOWER_THAN_MS=100,
+    )
+    def test_not_sampled_slow_requests_are_logged(self) -> None:
+        with patch("time.monotonic_ns", side_effect=[0, 100_000_000, 100_000_000]):
+            self.assertEqual(["request_finished"], self.get_log_results())
+        with patch("time.monotonic_ns", side_effect=[0, 99_000_000, 99_000_000]):
+            self.assertEqual([], self.get_log_results())
+
+    @override_settings(
+        DJANGO_STRUCTLOG_REQUEST_SAMPLING_PATH_RATES={"/health": 0, "/api/": 1}
+    )
+    def test_path_rates(self) -> None:
+        self.assertEqual([], self.get_log_results(path="/health/ready"))
+        self.assertEqual(
+            ["request_started", "request_finished"],
+            self.get_log_results(path="/api/users"),
+        )
+        self.assertEqual(
+            ["request_started", "request_finished"], self.get_log_results(path="/")
+        )
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0)
+    def test_not_sampled_response_skips_finished_metadata(self) -> None:
+        middleware = RequestMiddleware(Mock())
+        request = RequestFactory().get("/foo")
+
+        with patch(
+            "django_structlog.middlewares.RequestMiddleware.bind_user_id"
+        ) as mock_bind_user_id:
+            sampling.bind_sampled(False)
+            middleware.handle_response(request, HttpResponse())
+            mock_bind_user_id.assert_not_called()
+            self.assertTrue(sampling.is_sampled())
+
+            mock_receiver = Mock()
+            bind_extra_request_finished_metadata.connect(mock_receiver)
+            self.addCleanup(
+                bind_extra_request_finished_metadata.disconnect, mock_receiver
+            )
+            sampling.bind_sampled(False)
+            middleware.handle_response(request, HttpResponse())
+            mock_bind_user_id.assert_called_once_with(request)
+            mock_receiver.assert_called_once()
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0)
+    def test_not_sampled_request_failed_is_logged(self) -> None:
+        exception = Exception("This is an exception")
+
+        def get_response(request: HttpRequest) -> HttpResponse:
+            try:
+                raise exception
+            except Exception:
+                got_request_exception.send(object, request=request)
+                return HttpResponseServerError()
+
+        middleware = RequestMiddleware(get_response)
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            middleware(RequestFactory().get("/foo"))
+
+        self.assertEqual(1, len(log_results.records))
+        record: Any = log_results.records[0]
+        self.assertEqual("request_failed", record.msg["event"])
+        self.assertFalse(record.msg["sampled"])
+
+    @override_settings(DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0)
+    def test_not_sampled_streaming(self) -> None:
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            return cast(HttpResponse, StreamingHttpResponse(iter([b"foo"])))
+
+        middleware = RequestMiddleware(get_response)
+        with self.assertNoLogs("django_structlog.middlewares.request", logging.DEBUG):
+            response = cast(
+                StreamingHttpResponse, middleware(RequestFactory().get("/foo"))
+            )
+            self.assertEqual(b"foo", b"".join(response.streaming_content))  # type: ignore[arg-type]
+
+
+class TestRequestMiddlewareRouter(TestCase):
+    async def test_async(self) -> None:
+        mock_response = Mock()
+
+        async def async_get_response(request: HttpRequest) -> Any:
+            return mock_response
+
+        middleware = RequestMiddleware(async_get_response)
+
+        mock_request = Mock()
+        with (
+            patch(
+                "django_structlog.middlewares.RequestMiddleware.prepare"
+            ) as mock_prepare,
+            patch(
+                "django_structlog.middlewares.RequestMiddleware.handle_response"
+            ) as mock_handle_response,
+        ):
+            response = await cast(Awaitable[HttpResponse], middleware(mock_request))
+        self.assertEqual(response, mock_response)
+        mock_prepare.assert_called_once_with(mock_request)
+        mock_handle_response.assert_called_once_with(mock_request, mock_response)
+
+    def test_sync(self) -> None:
+        mock_response = Mock()
+
+        def get_response(request: HttpRequest) -> HttpResponse:
+            return mock_response
+
+        middleware = RequestMiddleware(get_response)
+
+        mock_request = Mock()
+        with (
+            patch(
+                "django_structlog.middlewares.RequestMiddleware.prepare"
+            ) as mock_prepare,
+            patch(
+                "django_structlog.middlewares.RequestMiddleware.handle_response"
+            ) as mock_handle_response,
+        ):
+            response = middleware(mock_request)
+        self.assertEqual(response, mock_response)
+        mock_prepare.assert_called_once_with(mock_request)
+        mock_handle_response.assert_called_once_with(mock_request, mock_response)
+
+    async def test_async_without_thread(self) -> None:
+        mock_response = Mock()
+
+        async def async_get_response(request: HttpRequest) -> Any:
+            return mock_response
+
+        middleware = RequestMiddleware(async_get_response)
+
+        request = RequestFactory().get("/foo")
+        request.user = AnonymousUser()
+        with (
+            patch(
+                "django_structlog.middlewares.request.sync.sync_to_async"
+            ) as mock_sync_to_async,
+            patch(
+                "django_structlog.middlewares.RequestMiddleware.prepare"
+            ) as mock_prepare,
+            patch(
+                "django_structlog.middlewares.RequestMiddleware.handle_response"
+            ) as mock_handle_response,
+        ):
+            response = await cast(Awaitable[HttpResponse], middleware(request))
+        self.assertEqual(response, mock_response)
+        mock_sync_to_async.assert_not_called()
+        mock_prepare.assert_called_once_with(request)
+        mock_handle_response.assert_called_once_with(request, mock_response)
+
+    async def test_async_thread_for_lazy_user(self) -> None:
+        mock_response = Mock()
+
+        async def async_get_response(request: HttpRequest) -> Any:
+            return mock_response
+
+        middleware = RequestMiddleware(async_get_response)
+
+        request = RequestFactory().get("/foo")
+        request.user = cast(Any, SimpleLazyObject(lambda: AnonymousUser()))
+        with (
+            patch(
+                "django_structlog.middlewares.request.sync.sync_to_async",
+                side_effect=lambda f: AsyncMock(side_effect=f),
+            ) as mock_sync_to_async,
+            patch(
+                "django_structlog.middlewares.RequestMiddleware.prepare"
+            ) as mock_prepare,
+            patch(
+                "django_structlog.middlewares.RequestMiddleware.handle_response"
+            ) as mock_handle_response,
+        ):
+            await cast(Awaitable[HttpResponse], middleware(request))
+        mock_sync_to_async.assert_has_calls(
+            [call(mock_prepare), call(mock_handle_response)]
+        )
+        mock_prepare.assert_called_once_with(request)
+        mock_handle_response.assert_called_once_with(request, mock_response)
+
+    async def test_async_thread_for_signal_receivers(self) -> None:
+        def receiver_bind_extra_request_metadata(**kwargs: Any) -> None:
+            pass  # pragma: no cover
+
+        mock_response = Mock()
+
+        async def async_get_response(request: HttpRequest) -> Any:
+            return mock_response
+
+        middleware = RequestMiddleware(async_get_response)
+
+        request = RequestFactory().get("/foo")
+        bind_extra_request_metadata.connect(receiver_bind_extra_request_metadata)
+        try:
+            with (
+                patch(
+                    "django_structlog.middlewares.request.sync.sync_to_async",
+                    side_effect=lambda f: AsyncMock(side_effect=f),
+                ) as mock_sync_to_async,
+                patch(
+                    "django_structlog.middlewares.RequestMiddleware.prepare"
+                ) as mock_prepare,
+                patch(
+                    "django_structlog.middlewares.RequestMiddleware.handle_response"
+                ) as mock_handle_response,
+            ):
+                await cast(Awaitable[HttpResponse], middleware(request))
+        finally:
+            bind_extra_request_metadata.disconnect(receiver_bind_extra_request_metadata)
+        mock_sync_to_async.assert_called_once_with(mock_prepare)
+        mock_prepare.assert_called_once_with(request)
+        mock_handle_response.assert_called_once_with(request, mock_response)
+
+    @override_settings(
+        SECRET_KEY="00000000000000000000000000000000",
+    )
+    async def test_async_session_middleware_without_vary(self) -> None:
+        async def async_get_response(request: HttpRequest) -> Any:
+            return HttpResponse()
+
+        request = RequestFactory().get("/foo")
+
+        request_middleware = RequestMiddleware(async_get_response)
+        authentication_middleware = AuthenticationMiddleware(
+            cast(Any, request_middleware)
+        )
+        session_middleware = SessionMiddleware(cast(Any, authentication_middleware))
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            response = await cast(Awaitable[HttpResponse], session_middleware(request))
+
+        self.assertIsNone(response.headers.get("Vary"))
+        self.assertEqual(2, len(log_results.records))
+        record: Any = log_results.records[0]
+        self.assertEqual("request_started", record.msg["event"])
+        self.assertIsNone(record.msg["user_id"])
+        record = log_results.records[1]
+        self.assertEqual("request_finished", record.msg["event"])
+        self.assertIsNone(record.msg["user_id"])
+
+
+class TestGetRequestHeader(TestCase):
+    def test_django_22_or_higher(self) -> None:
+        mock_request = mock.MagicMock(spec=["headers"])
+        get_request_header(mock_request, "x-foo-bar", "HTTP_X_FOO_BAR")
+        mock_request.headers.get.assert_called_once_with("x-foo-bar")
+
+    def test_django_prior_to_22(self) -> None:
+        mock_request = mock.MagicMock(spec=["META"])
+        get_request_header(mock_request, "x-foo-bar", "HTTP_X_FOO_BAR")
+        mock_request.META.get.assert_called_once_with("HTTP_X_FOO_BAR")
+
+
+class TestSyncStreamingContentWrapper(TestCase):
+    def setUp(self) -> None:
+        self.logger = structlog.getLogger(__name__)
+
+    def test_success(self) -> None:
+        result = b"result"
+
+        def streaming_content() -> Generator[Any, None, None]:
+            self.logger.info("streaming_content")
+            yield result
+
+        wrapped_streaming_content = sync_streaming_content_wrapper(
+            streaming_content(), {"foo": "bar"}
+        )
+        with (
+            self.assertLogs(__name__, logging.INFO) as streaming_content_log_results,
+            self.assertLogs(
+                "django_structlog.middlewares.request", logging.INFO
+            ) as log_results,
+        ):
+            self.assertEqual(result, next(wrapped_streaming_content))
+
+        self.assertEqual(1, len(log_results.records))
+        record: Any
+        record = log_results.records[0]
+        self.assertEqual("INFO", record.levelname)
+        self.assertEqual("streaming_started", record.msg["event"])
+        self.assertIn("foo", record.msg)
+        self.assertEqual("bar", record.msg["foo"])
+
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            self.assertRaises(StopIteration, next, wrapped_streaming_content)
+
+        self.assertEqual(1, len(streaming_content_log_results.records))
+        record = streaming_content_log_results.records[0]
+        self.assertEqual("INFO", record.levelname)
+        self.assertIn("foo", record.msg)
+        self.assertEqual("bar", record.msg["foo"])
+
+        self.assertEqual(1, len(streaming_content_log_results.records))
+        record = log_results.records[0]
+        self.assertEqual("INFO", record.levelname)
+        self.assertEqual("streaming_finished", record.msg["event"])
+        self.assertIn("foo", record.msg)
+        self.assertEqual("bar", record.msg["foo"])
+
+    def test_failure(self) -> None:
+        result = b"result"
+
+        class CustomException(Exception):
+            pass
+
+        exception = CustomException()
+
+        def streaming_content() -> Generator[Any, None, None]:
+            self.logger.info("streaming_content")
+            yield result
+            raise exception
+
+        wrapped_streaming_content = sync_streaming_content_wrapper(
+            streaming_content(), {"foo": "bar"}
+        )
+        with (
+            self.assertLogs(__name__, logging.INFO) as streaming_content_log_results,
+            self.assertLogs(
+                "django_structlog.middlewares.request", logging.INFO
+            ) as log_results,
+        ):
+            self.assertEqual(result, next(wrapped_streaming_content))
+
+        self.assertEqual(1, len(log_results.records))
+        record: Any
+        record = log_results.records[0]
+        self.assertEqual("INFO", record.levelname)
+        self.assertEqual("streaming_started", record.msg["event"])
+        self.assertIn("foo", record.msg)
+        self.assertEqual("bar", record.msg["foo"])
+
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            self.assertRaises(CustomException, next, wrapped_streaming_content)
+
+        self.assertEqual(1, len(streaming_content_log_results.records))
+        record = streaming_content_log_results.records[0]
+        self.assertEqual("INFO", record.levelname)
+        self.assertIn("foo", record.msg)
+        self.assertEqual("bar", record.msg["foo"])
+
+        self.assertEqual(1, len(streaming_content_log_results.records))
+        record = log_results.records[0]
+        self.assertEqual("ERROR", record.levelname)
+        self.assertEqual("streaming_failed", record.msg["event"])
+        self.assertIn("foo", record.msg)
+        self.assertEqual("bar", record.msg["foo"])
+
+    def test_metrics(self) -> None:
+        wrapped_streaming_content = sync_streaming_content_wrapper(
+            iter([b"foo", b"barbaz"]), {}, started_at=1_000_000_000
+        )
+        with (
+            patch("time.monotonic_ns", side_effect=[1_005_000_000, 1_012_000_000]),
+            self.assertLogs(
+                "django_structlog.middlewares.request", logging.INFO
+            ) as log_results,
+        ):
+            self.assertEqual([b"foo", b"barbaz"], list(wrapped_streaming_content))
+
+        self.assertEqual(2, len(log_results.records))
+        record: Any = log_results.records[1]
+        self.assertEqual("streaming_finished", record.msg["event"])
+        self.assertEqual(5, record.msg["ttfb_ms"])
+        self.assertEqual(12, record.msg["duration_ms"])
+        self.assertEqual(9, record.msg["bytes_sent"])
+        self.assertEqual(2, record.msg["chunk_count"])
+
+    def test_metrics_empty(self) -> None:
+        wrapped_streaming_content = sync_streaming_content_wrapper(iter([]), {})
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            self.assertEqual([], list(wrapped_streaming_content))
+
+        record: Any = log_results.records[1]
+        self.assertEqual("streaming_finished", record.msg["event"])
+        self.assertIsNone(record.msg["ttfb_ms"])
+        self.assertIn("duration_ms", record.msg)
+        self.assertEqual(0, record.msg["bytes_sent"])
+        self.assertEqual(0, record.msg["chunk_count"])
+
+
+class TestASyncStreamingContentWrapper(TestCase):
+    def setUp(self) -> None:
+        self.logger = structlog.getLogger(__name__)
 
     async def test_success(self) -> None:
-        result = Mock()
+        result = b"result"
 
         async def streaming_content() -> AsyncGenerator[Any, None]:
             self.logger.info("streaming_content")
@@ -1285,7 +2225,7 @@ class TestASyncStreamingContentWrapper(TestCase):
         self.assertEqual("bar", record.msg["foo"])
 
     async def test_failure(self) -> None:
-        result = Mock()
+        result = b"result"
 
         class CustomException(Exception):
             pass
@@ -1336,7 +2276,7 @@ class TestASyncStreamingContentWrapper(TestCase):
         self.assertEqual("bar", record.msg["foo"])
 
     async def test_cancel(self) -> None:
-        result = Mock()
+        result = b"result"
 
         exception = asyncio.CancelledError()
 
@@ -1370,6 +2310,33 @@ class TestASyncStreamingContentWrapper(TestCase):
         self.assertIn("foo", record.msg)
         self.assertEqual("bar", record.msg["foo"])
 
+    async def test_metrics(self) -> None:
+        async def streaming_content() -> AsyncGenerator[bytes, None]:
+            yield b"foo"
+            yield b"barbaz"
+
+        wrapped_streaming_content = async_streaming_content_wrapper(
+            streaming_content(), {}, started_at=1_000_000_000
+        )
+        with (
+            patch("time.monotonic_ns", side_effect=[1_005_000_000, 1_012_000_000]),
+            self.assertLogs(
+                "django_structlog.middlewares.request", logging.INFO
+            ) as log_results,
+        ):
+            self.assertEqual(
+                [b"foo", b"barbaz"],
+                [chunk async for chunk in wrapped_streaming_content],
+            )
+
+        self.assertEqual(2, len(log_results.records))
+        record: Any = log_results.records[1]
+        self.assertEqual("streaming_finished", record.msg["event"])
+        self.assertEqual(5, record.msg["ttfb_ms"])
+        self.assertEqual(12, record.msg["duration_ms"])
+        self.assertEqual(9, record.msg["bytes_sent"])
+        self.assertEqual(2, record.msg["chunk_count"])
+
 
 class TestLogLevelMappings(TestCase):
     def test_log_level_for_status_code(self) -> None:
@@ -1401,3 +2368,162 @@ class TestLogLevelMappings(TestCase):
             middleware._log_level_for_status_code(100),
             app_settings.STATUS_DEFAULT_LOG_LEVEL,
         )
+
+    @override_settings(
+        DJANGO_STRUCTLOG_STATUS_CODE_LOG_LEVELS={
+            429: logging.INFO,
+            499: logging.DEBUG,
+            503: logging.WARNING,
+            600: logging.CRITICAL,
+        }
+    )
+    def test_log_level_for_exact_status_code(self) -> None:
+        middleware = RequestMiddleware(lambda r: HttpResponse())
+
+        self.assertEqual(middleware._log_level_for_status_code(429), logging.INFO)
+        self.assertEqual(middleware._log_level_for_status_code(499), logging.DEBUG)
+        self.assertEqual(middleware._log_level_for_status_code(503), logging.WARNING)
+        self.assertEqual(middleware._log_level_for_status_code(600), logging.CRITICAL)
+        self.assertEqual(middleware._log_level_for_status_code(404), logging.WARNING)
+        self.assertEqual(middleware._log_level_for_status_code(500), logging.ERROR)
+        self.assertEqual(middleware._log_level_for_status_code(601), logging.INFO)
+
+    def test_log_level_table_rebuilt_on_setting_changed(self) -> None:
+        middleware = RequestMiddleware(lambda r: HttpResponse())
+
+        with self.settings(DJANGO_STRUCTLOG_STATUS_4XX_LOG_LEVEL=logging.ERROR):
+            self.assertEqual(middleware._log_level_for_status_code(404), logging.ERROR)
+        self.assertEqual(middleware._log_level_for_status_code(404), logging.WARNING)
+
+    @override_settings(DJANGO_STRUCTLOG_STATUS_CODE_LOG_LEVELS={429: logging.INFO})
+    def test_process_request_exact_status_code_can_be_personalized(self) -> None:
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            return HttpResponse(status=429)
+
+        middleware = RequestMiddleware(get_response)
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            middleware(RequestFactory().get("/foo"))
+
+        self.assertEqual(2, len(log_results.records))
+        record: Any = log_results.records[1]
+        self.assertEqual("INFO", record.levelname)
+        self.assertEqual("request_finished", record.msg["event"])
+        self.assertEqual(429, record.msg["code"])
+
+
+class TestRequestMiddlewareDisabledEvents(TestCase):
+    def setUp(self) -> None:
+        stdlib_logger = logging.getLogger("django_structlog.middlewares.request")
+        self.addCleanup(stdlib_logger.setLevel, stdlib_logger.level)
+        stdlib_logger.setLevel(logging.CRITICAL)
+
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+
+    def test_disabled_events_are_not_built(self) -> None:
+        middleware = RequestMiddleware(lambda request: HttpResponse())
+        mock_receiver = Mock()
+        bind_extra_request_finished_metadata.connect(mock_receiver)
+        self.addCleanup(bind_extra_request_finished_metadata.disconnect, mock_receiver)
+
+        with (
+            patch.object(
+                RequestMiddleware, "format_request", return_value="GET /foo"
+            ) as mock_format_request,
+            patch("django_structlog.middlewares.request.logger.log") as mock_log,
+        ):
+            middleware(RequestFactory().get("/foo"))
+
+        mock_format_request.assert_called_once()
+        mock_receiver.assert_called_once()
+        mock_log.assert_not_called()
+
+    def test_disabled_events_without_listeners(self) -> None:
+        middleware = RequestMiddleware(lambda request: HttpResponse())
+
+        with patch.object(RequestMiddleware, "format_request") as mock_format_request:
+            middleware(RequestFactory().get("/foo"))
+
+        mock_format_request.assert_not_called()
+
+    def test_request_started_metadata_is_sent(self) -> None:
+        def get_response(_request: HttpRequest) -> HttpResponse:
+            self.context = structlog.contextvars.get_contextvars()
+            return HttpResponse()
+
+        @receiver(bind_extra_request_metadata)
+        def receiver_bind_extra_request_metadata(
+            sender: Type[Any], request: HttpRequest, logger: Any, **kwargs: Any
+        ) -> None:
+            structlog.contextvars.bind_contextvars(tenant="foo")
+
+        self.addCleanup(
+            bind_extra_request_metadata.disconnect,
+            receiver_bind_extra_request_metadata,
+        )
+        RequestMiddleware(get_response)(RequestFactory().get("/foo"))
+
+        self.assertEqual("foo", self.context["tenant"])
+
+    def test_request_failed_disabled(self) -> None:
+        exception = Exception("This is an exception")
+
+        def get_response(request: HttpRequest) -> HttpResponse:
+            try:
+                raise exception
+            except Exception as e:
+                got_request_exception.send(sender=self.__class__, request=request)
+                return HttpResponseServerError(str(e))
+
+        with patch.object(RequestMiddleware, "format_request") as mock_format_request:
+            RequestMiddleware(get_response)(RequestFactory().get("/foo"))
+
+        mock_format_request.assert_not_called()
+
+    def test_streaming_events_disabled(self) -> None:
+        wrapped_streaming_content = sync_streaming_content_wrapper(
+            iter([b"foo", b"bar"]), {}
+        )
+
+        with (
+            patch("django_structlog.middlewares.request.logger.log") as mock_log,
+            patch("time.monotonic_ns", return_value=0) as mock_monotonic_ns,
+        ):
+            self.assertEqual([b"foo", b"bar"], list(wrapped_streaming_content))
+
+        mock_log.assert_not_called()
+        # the time to first byte is still measured, but not the duration
+        self.assertEqual(2, mock_monotonic_ns.call_count)
+
+    async def test_async_streaming_events_disabled(self) -> None:
+        async def streaming_content() -> AsyncGenerator[bytes, None]:
+            yield b"foo"
+            yield b"bar"
+
+        wrapped_streaming_content = async_streaming_content_wrapper(
+            streaming_content(), {}
+        )
+
+        with patch("django_structlog.middlewares.request.logger.log") as mock_log:
+            self.assertEqual(
+                [b"foo", b"bar"], [chunk async for chunk in wrapped_streaming_content]
+            )
+
+        mock_log.assert_not_called()
+
+    def test_request_enabled_again(self) -> None:
+        middleware = RequestMiddleware(lambda request: HttpResponse())
+        middleware(RequestFactory().get("/foo"))
+
+        with self.assertLogs(
+            "django_structlog.middlewares.request", logging.INFO
+        ) as log_results:
+            middleware(RequestFactory().get("/foo"))
+
+        records: Any = log_results.records
+        self.assertEqual(
+            ["request_started", "request_finished"],
+            [record.msg["event"] for record in records],
+        )
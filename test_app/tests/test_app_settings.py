@@ -1,8 +1,10 @@
 import logging
+from dataclasses import FrozenInstanceError
 
+from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase
 
-from django_structlog import app_settings
+from django_structlog import app_settings, request_id
 
 
 class TestAppSettings(TestCase):
@@ -37,3 +39,191 @@ class TestAppSettings(TestCase):
 
         with self.settings(DJANGO_STRUCTLOG_STATUS_5XX_LOG_LEVEL=logging.CRITICAL):
             self.assertEqual(settings.STATUS_5XX_LOG_LEVEL, logging.CRITICAL)
+
+    def test_snapshot_is_cached(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertIs(settings.snapshot, settings.snapshot)
+
+    def test_snapshot_is_frozen(self) -> None:
+        settings = app_settings.AppSettings()
+
+        with self.assertRaises(FrozenInstanceError):
+            setattr(settings.snapshot, "CELERY_ENABLED", True)
+
+    def test_snapshot_reload(self) -> None:
+        settings = app_settings.AppSettings()
+        snapshot = settings.snapshot
+
+        settings.reload()
+
+        self.assertIsNot(snapshot, settings.snapshot)
+        self.assertEqual(snapshot, settings.snapshot)
+
+    def test_snapshot_reloaded_on_setting_changed(self) -> None:
+        snapshot = app_settings.app_settings.snapshot
+        self.assertEqual(snapshot.STATUS_5XX_LOG_LEVEL, logging.ERROR)
+
+        with self.settings(DJANGO_STRUCTLOG_STATUS_5XX_LOG_LEVEL=logging.CRITICAL):
+            self.assertEqual(
+                app_settings.app_settings.snapshot.STATUS_5XX_LOG_LEVEL,
+                logging.CRITICAL,
+            )
+
+        self.assertEqual(
+            app_settings.app_settings.snapshot.STATUS_5XX_LOG_LEVEL, logging.ERROR
+        )
+
+    def test_snapshot_kept_on_unrelated_setting_changed(self) -> None:
+        snapshot = app_settings.app_settings.snapshot
+
+        with self.settings(USE_TZ=False):
+            self.assertIs(snapshot, app_settings.app_settings.snapshot)
+
+    def test_status_code_log_levels_default(self) -> None:
+        settings = app_settings.AppSettings()
+        self.assertEqual(settings.STATUS_CODE_LOG_LEVELS, {})
+
+    def test_status_code_log_levels_custom(self) -> None:
+        settings = app_settings.AppSettings()
+
+        with self.settings(
+            DJANGO_STRUCTLOG_STATUS_CODE_LOG_LEVELS={499: logging.DEBUG}
+        ):
+            self.assertEqual(settings.STATUS_CODE_LOG_LEVELS, {499: logging.DEBUG})
+            self.assertEqual(
+                settings.snapshot.log_level_for_status_code(499), logging.DEBUG
+            )
+            self.assertEqual(
+                settings.snapshot.log_level_for_status_code(498), logging.WARNING
+            )
+
+    def test_request_id_generator_default(self) -> None:
+        settings = app_settings.AppSettings()
+        self.assertIs(settings.REQUEST_ID_GENERATOR, request_id.uuid4)
+
+    def test_request_id_generator_dotted_path(self) -> None:
+        settings = app_settings.AppSettings()
+
+        with self.settings(
+            DJANGO_STRUCTLOG_REQUEST_ID_GENERATOR="django_structlog.request_id.uuid7"
+        ):
+            self.assertIs(settings.REQUEST_ID_GENERATOR, request_id.uuid7)
+
+    def test_request_id_generator_callable(self) -> None:
+        settings = app_settings.AppSettings()
+
+        with self.settings(DJANGO_STRUCTLOG_REQUEST_ID_GENERATOR=request_id.ulid):
+            self.assertIs(settings.REQUEST_ID_GENERATOR, request_id.ulid)
+
+    def test_request_sampler_disabled_by_default(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertEqual(settings.REQUEST_SAMPLING_RATE, 1.0)
+        self.assertEqual(settings.REQUEST_SAMPLING_PATH_RATES, {})
+        self.assertEqual(settings.REQUEST_SAMPLING_KEEP_STATUS_CLASSES, (4, 5))
+        self.assertIsNone(settings.REQUEST_SAMPLING_KEEP_SLOWER_THAN_MS)
+        self.assertIsNone(settings.snapshot.request_sampler)
+
+    def test_request_sampler_with_rate(self) -> None:
+        settings = app_settings.AppSettings()
+
+        with self.settings(DJANGO_STRUCTLOG_REQUEST_SAMPLING_RATE=0.5):
+            self.assertIsNotNone(settings.snapshot.request_sampler)
+
+    def test_request_sampler_with_path_rates(self) -> None:
+        settings = app_settings.AppSettings()
+
+        with self.settings(DJANGO_STRUCTLOG_REQUEST_SAMPLING_PATH_RATES={"/": 1}):
+            self.assertIsNotNone(settings.snapshot.request_sampler)
+
+    def test_request_summary_enabled(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertFalse(settings.REQUEST_SUMMARY_ENABLED)
+        with self.settings(DJANGO_STRUCTLOG_REQUEST_SUMMARY_ENABLED=True):
+            self.assertTrue(settings.REQUEST_SUMMARY_ENABLED)
+
+    def test_request_format_defaults(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertFalse(settings.REQUEST_FIELDS_ENABLED)
+        self.assertIsNone(settings.REQUEST_QUERY_MAX_LENGTH)
+        self.assertEqual((), settings.REQUEST_QUERY_REDACTED_PARAMS)
+
+    def test_ip_proxy_defaults(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertIsNone(settings.IP_PROXY_HEADER)
+        self.assertEqual(1, settings.IP_PROXY_COUNT)
+
+    def test_ip_proxy_count_below_one(self) -> None:
+        settings = app_settings.AppSettings()
+
+        for proxy_count in (0, -1):
+            with self.subTest(proxy_count=proxy_count):
+                with self.settings(DJANGO_STRUCTLOG_IP_PROXY_COUNT=proxy_count):
+                    with self.assertRaises(ImproperlyConfigured):
+                        settings.snapshot
+
+    def test_hooks(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertEqual({}, settings.HOOKS)
+        with self.settings(
+            DJANGO_STRUCTLOG_HOOKS={
+                "bind_extra_request_metadata": [
+                    "django_structlog.request_id.uuid4",
+                    request_id.ulid,
+                ]
+            }
+        ):
+            self.assertEqual(
+                {"bind_extra_request_metadata": (request_id.uuid4, request_id.ulid)},
+                settings.HOOKS,
+            )
+
+    def test_user_id_from_session(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertFalse(settings.USER_ID_FROM_SESSION)
+        with self.settings(DJANGO_STRUCTLOG_USER_ID_FROM_SESSION=True):
+            self.assertTrue(settings.USER_ID_FROM_SESSION)
+
+    def test_celery_context_codec_disabled_by_default(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertIsNone(settings.CELERY_CONTEXT_KEYS)
+        self.assertEqual(settings.CELERY_CONTEXT_EXCLUDED_KEYS, ())
+        self.assertIsNone(settings.CELERY_CONTEXT_MAX_BYTES)
+        self.assertEqual(settings.CELERY_CONTEXT_KEY_ALIASES, {})
+        self.assertIsNone(settings.snapshot.celery_context_codec)
+
+    def test_celery_context_codec(self) -> None:
+        settings = app_settings.AppSettings()
+
+        with self.settings(DJANGO_STRUCTLOG_CELERY_CONTEXT_MAX_BYTES=1024):
+            self.assertIsNotNone(settings.snapshot.celery_context_codec)
+
+    def test_celery_task_overrides(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertEqual(settings.CELERY_TASK_OVERRIDES, {})
+        with self.settings(
+            DJANGO_STRUCTLOG_CELERY_TASK_SUCCESS_LOG_LEVEL=logging.WARNING,
+            DJANGO_STRUCTLOG_CELERY_TASK_OVERRIDES={
+                "app.tasks.heartbeat": {"start_log_level": logging.DEBUG}
+            },
+        ):
+            task_settings = settings.snapshot.celery_task_overrides.get(
+                "app.tasks.heartbeat"
+            )
+            self.assertEqual(logging.DEBUG, task_settings.start_log_level)
+            self.assertEqual(logging.WARNING, task_settings.success_log_level)
+
+    def test_celery_task_metrics_enabled(self) -> None:
+        settings = app_settings.AppSettings()
+
+        self.assertFalse(settings.CELERY_TASK_METRICS_ENABLED)
+        with self.settings(DJANGO_STRUCTLOG_CELERY_TASK_METRICS_ENABLED=True):
+            self.assertTrue(settings.snapshot.CELERY_TASK_METRICS_ENABLED)
@@ -3,6 +3,7 @@ from unittest.mock import create_autospec, patch
 from django.test import TestCase
 
 from django_structlog import apps, commands
+from django_structlog.app_settings import app_settings
 from django_structlog.celery import receivers
 
 
@@ -70,3 +71,13 @@ class TestAppConfig(TestCase):
         mock_receiver.connect_signals.assert_not_called()
 
         self.assertFalse(hasattr(app, "_django_command_receiver"))
+
+    def test_ready_reloads_settings(self) -> None:
+        app = apps.DjangoStructLogConfig(
+            "django_structlog", __import__("django_structlog")
+        )
+        snapshot = app_settings.snapshot
+
+        app.ready()
+
+        self.assertIsNot(snapshot, app_settings.snapshot)
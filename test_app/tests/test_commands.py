@@ -1,5 +1,6 @@
 import logging
 from typing import Any
+from unittest.mock import patch
 
 import structlog
 from django.core.management import BaseCommand, call_command
@@ -8,6 +9,8 @@ from django_extensions.management.utils import (
     signalcommand,
 )
 
+from django_structlog import commands
+
 
 class TestCommands(TestCase):
     def test_command(self) -> None:
@@ -103,3 +106,22 @@ class TestCommands(TestCase):
         self.assertEqual(
             command_event_1.msg["command_id"], command_finished_2.msg["command_id"]
         )
+
+    def test_command_events_disabled(self) -> None:
+        class Command(BaseCommand):
+            @signalcommand  # type: ignore[misc]
+            def handle(self, *args: Any, **options: Any) -> Any:
+                structlog.getLogger("command").info("command_event")
+
+        stdlib_logger = logging.getLogger("django_structlog.commands")
+        self.addCleanup(stdlib_logger.setLevel, stdlib_logger.level)
+        stdlib_logger.setLevel(logging.WARNING)
+        with (
+            self.assertLogs("command", logging.INFO) as command_log_results,
+            patch.object(commands.logger, "info") as mock_info,
+        ):
+            call_command(Command())
+
+        record: Any = command_log_results.records[0]
+        self.assertIn("command_id", record.msg)
+        mock_info.assert_not_called()
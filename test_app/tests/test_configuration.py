@@ -0,0 +1,94 @@
+import io
+import logging
+from typing import Any
+
+import structlog
+from django.test import TestCase
+
+import django_structlog
+from django_structlog import configuration
+from django_structlog.renderers import JSONRenderer
+
+
+class TestConfigure(TestCase):
+    def setUp(self) -> None:
+        config = structlog.get_config()
+        self.addCleanup(structlog.configure, **config)
+        self.addCleanup(structlog.reset_defaults)
+        self.addCleanup(structlog.contextvars.clear_contextvars)
+
+    def test_stdlib(self) -> None:
+        django_structlog.configure()
+
+        config = structlog.get_config()
+        processors = config["processors"]
+        self.assertIs(structlog.stdlib.filter_by_level, processors[0])
+        self.assertIs(
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter, processors[-1]
+        )
+        self.assertIs(structlog.stdlib.BoundLogger, config["wrapper_class"])
+        self.assertIsInstance(config["logger_factory"], structlog.stdlib.LoggerFactory)
+        self.assertTrue(config["cache_logger_on_first_use"])
+
+        structlog.contextvars.bind_contextvars(request_id="abc")
+        with self.assertLogs(__name__, logging.INFO) as log_results:
+            structlog.get_logger(__name__).info("hello %s", "world", foo="bar")
+            structlog.get_logger(__name__).debug("disabled")
+
+        self.assertEqual(1, len(log_results.records))
+        record: Any = log_results.records[0]
+        self.assertEqual("hello world", record.msg["event"])
+        self.assertEqual("abc", record.msg["request_id"])
+        self.assertEqual("bar", record.msg["foo"])
+        self.assertEqual("info", record.msg["level"])
+        self.assertEqual(__name__, record.msg["logger"])
+        self.assertIn("timestamp", record.msg)
+
+    def test_without_stdlib(self) -> None:
+        output = io.BytesIO()
+        django_structlog.configure(
+            stdlib=False,
+            level=logging.WARNING,
+            logger_factory=structlog.BytesLoggerFactory(output),
+            processors=[structlog.processors.EventRenamer("message")],
+        )
+
+        structlog.contextvars.bind_contextvars(request_id="abc")
+        logger = structlog.get_logger(__name__)
+        logger.info("disabled")
+        logger.warning("hello")
+
+        self.assertIsInstance(structlog.get_config()["processors"][-1], JSONRenderer)
+        rendered = output.getvalue()
+        self.assertEqual(1, rendered.count(b"\n"))
+        self.assertIn(b'"message":"hello"', rendered)
+        self.assertIn(b'"request_id":"abc"', rendered)
+
+    def test_renderer(self) -> None:
+        output = io.StringIO()
+        renderer = structlog.processors.KeyValueRenderer(key_order=["event"])
+        django_structlog.configure(
+            stdlib=False,
+            renderer=renderer,
+            logger_factory=structlog.PrintLoggerFactory(output),
+        )
+
+        structlog.get_logger().info("hello")
+
+        self.assertTrue(output.getvalue().startswith("event='hello'"))
+
+    def test_renderer_logger_factory(self) -> None:
+        django_structlog.configure(
+            stdlib=False, renderer=structlog.processors.KeyValueRenderer()
+        )
+
+        self.assertIsInstance(
+            structlog.get_config()["logger_factory"], structlog.PrintLoggerFactory
+        )
+
+    def test_get_processors(self) -> None:
+        processor = structlog.processors.EventRenamer("message")
+
+        processors = configuration.get_processors(processors=[processor])
+
+        self.assertIs(processor, processors[-2])
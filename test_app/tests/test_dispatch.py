@@ -0,0 +1,76 @@
+from typing import Any
+from unittest.mock import Mock, call
+
+from django.test import TestCase, override_settings
+
+from django_structlog.dispatch import Signal
+
+calls: list[Any] = []
+
+
+def hook(**kwargs: Any) -> str:
+    calls.append(kwargs)
+    return "hooked"
+
+
+class TestSignal(TestCase):
+    def setUp(self) -> None:
+        self.signal = Signal("test_signal")
+        calls.clear()
+
+    def test_has_listeners(self) -> None:
+        receiver = Mock()
+        self.assertFalse(self.signal.has_listeners())
+
+        self.signal.connect(receiver)
+        self.assertTrue(self.signal.has_listeners())
+
+        self.signal.disconnect(receiver)
+        self.assertFalse(self.signal.has_listeners())
+
+    def test_has_listeners_of_sender(self) -> None:
+        receiver = Mock()
+        self.signal.connect(receiver, sender=int)
+
+        self.assertTrue(self.signal.has_listeners(int))
+        self.assertFalse(self.signal.has_listeners(str))
+
+    def test_send(self) -> None:
+        receiver = Mock(return_value="received")
+        self.signal.connect(receiver)
+
+        self.assertEqual(
+            [(receiver, "received")], self.signal.send(sender=int, foo="bar")
+        )
+        receiver.assert_called_once_with(signal=self.signal, sender=int, foo="bar")
+
+    def test_send_without_receivers(self) -> None:
+        self.assertEqual([], self.signal.send(sender=int, foo="bar"))
+
+    @override_settings(
+        DJANGO_STRUCTLOG_HOOKS={"test_signal": ["test_app.tests.test_dispatch.hook"]}
+    )
+    def test_hooks(self) -> None:
+        self.assertEqual((hook,), self.signal.hooks)
+        self.assertTrue(self.signal.has_listeners())
+        self.assertFalse(Signal("other_signal").has_listeners())
+
+        receiver = Mock(side_effect=lambda **kwargs: calls.append("receiver"))
+        self.signal.connect(receiver)
+
+        responses = self.signal.send(sender=int, foo="bar")
+
+        self.assertEqual((hook, "hooked"), responses[0])
+        self.assertEqual(receiver, responses[1][0])
+        self.assertEqual(
+            [{"signal": self.signal, "sender": int, "foo": "bar"}, "receiver"], calls
+        )
+
+    def test_hooks_callable(self) -> None:
+        mock_hook = Mock()
+        with self.settings(DJANGO_STRUCTLOG_HOOKS={"test_signal": [mock_hook]}):
+            self.signal.send(sender=int, foo="bar")
+
+        self.assertEqual(
+            [call(signal=self.signal, sender=int, foo="bar")], mock_hook.call_args_list
+        )
@@ -0,0 +1,454 @@
+import io
+import json
+import logging
+import logging.config
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Optional, cast
+from unittest.mock import Mock, patch
+
+import structlog
+from django.test import TestCase
+
+from django_structlog import handlers
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, gate: Optional[threading.Event] = None) -> None:
+        super().__init__()
+        self.gate = gate
+        self.records: list[logging.LogRecord] = []
+        self.contexts: list[dict[str, Any]] = []
+        self.threads: list[threading.Thread] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.gate is not None:
+            self.gate.wait()
+        self.records.append(record)
+        self.contexts.append(structlog.contextvars.get_contextvars())
+        self.threads.append(threading.current_thread())
+
+
+def make_record(msg: Any, *args: Any, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(__name__, level, __file__, 1, msg, args, None)
+
+
+def configure_handler(config: dict[str, Any], **handlers: Any) -> Any:
+    """Configures the handler of ``config`` like ``dictConfig``, after ``handlers``,
+    without replacing the handlers of the test settings."""
+    configurator = logging.config.DictConfigurator(
+        {"handlers": {**handlers, "handler": config}}
+    )
+    return configurator.configure_handler(configurator.config["handlers"]["handler"])
+
+
+class TestQueueHandler(TestCase):
+    def setUp(self) -> None:
+        self.target = ListHandler()
+
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+
+    def make_handler(self, **kwargs: Any) -> handlers.QueueHandler:
+        handler = handlers.QueueHandler([self.target], **kwargs)
+        self.addCleanup(handler.close)
+        return handler
+
+    def blocked_handler(self, **kwargs: Any) -> handlers.QueueHandler:
+        """The background thread waits in the target handler for the first record."""
+        gate = threading.Event()
+        self.addCleanup(gate.set)
+        self.target.gate = gate
+        handler = self.make_handler(**kwargs)
+        handler.handle(make_record("first"))
+        while handler._buffer:
+            pass
+        return handler
+
+    def test_emit_in_background_thread(self) -> None:
+        handler = self.make_handler()
+
+        handler.handle(make_record("hello"))
+        handler.flush()
+
+        self.assertEqual(["hello"], [r.msg for r in self.target.records])
+        self.assertIsNot(threading.current_thread(), self.target.threads[0])
+
+    def test_context_of_the_caller(self) -> None:
+        handler = self.make_handler()
+
+        structlog.contextvars.bind_contextvars(request_id="abc")
+        handler.handle(make_record("hello"))
+        structlog.contextvars.clear_contextvars()
+        handler.flush()
+
+        self.assertEqual([{"request_id": "abc"}], self.target.contexts)
+
+    def test_arguments_formatted_by_the_caller(self) -> None:
+        handler = self.make_handler()
+        arg = ["a"]
+
+        handler.handle(make_record("hello %s", arg))
+        arg.append("b")
+        handler.flush()
+
+        self.assertEqual("hello ['a']", self.target.records[0].getMessage())
+
+    def test_level_of_the_target(self) -> None:
+        self.target.setLevel(logging.WARNING)
+        handler = self.make_handler()
+
+        handler.handle(make_record("info"))
+        handler.handle(make_record("warning", level=logging.WARNING))
+        handler.flush()
+
+        self.assertEqual(["warning"], [r.msg for r in self.target.records])
+
+    def test_dict_config(self) -> None:
+        handler = configure_handler(
+            {
+                "()": "django_structlog.handlers.QueueHandler",
+                "handlers": ["cfg://handlers.target"],
+            },
+            target=self.target,
+        )
+        self.addCleanup(handler.close)
+
+        handler.handle(make_record("hello"))
+        handler.flush()
+
+        self.assertEqual(["hello"], [r.msg for r in self.target.records])
+
+    def test_handler_not_configured(self) -> None:
+        with self.assertRaises(ValueError):
+            handlers.QueueHandler(cast(Any, ["target"]))
+        with self.assertRaises(ValueError):
+            configure_handler(
+                {
+                    "()": "django_structlog.handlers.QueueHandler",
+                    "handlers": ["cfg://handlers.target"],
+                },
+                target={"class": "logging.NullHandler"},
+            )
+
+    def test_unknown_policy(self) -> None:
+        with self.assertRaises(ValueError):
+            handlers.QueueHandler([], policy=cast(Any, "drop_all"))
+
+    def test_drop_oldest(self) -> None:
+        handler = self.blocked_handler(maxsize=2)
+
+        for i in range(4):
+            handler.handle(make_record(i))
+        self.assertEqual(2, handler.dropped_events)
+        self.target.gate.set()  # type: ignore[union-attr]
+        handler.flush()
+
+        self.assertEqual(["first", 2, 3], [r.msg for r in self.target.records])
+
+    def test_drop_newest(self) -> None:
+        handler = self.blocked_handler(maxsize=2, policy="drop_newest")
+
+        for i in range(4):
+            handler.handle(make_record(i))
+        self.assertEqual(2, handler.dropped_events)
+        self.target.gate.set()  # type: ignore[union-attr]
+        handler.flush()
+
+        self.assertEqual(["first", 0, 1], [r.msg for r in self.target.records])
+
+    def test_block(self) -> None:
+        handler = self.blocked_handler(maxsize=1, policy="block")
+        handler.handle(make_record(0))
+
+        producer = threading.Thread(target=handler.handle, args=(make_record(1),))
+        producer.start()
+        producer.join(0.05)
+        self.assertTrue(producer.is_alive())
+        self.target.gate.set()  # type: ignore[union-attr]
+        producer.join()
+        handler.flush()
+
+        self.assertEqual(0, handler.dropped_events)
+        self.assertEqual(["first", 0, 1], [r.msg for r in self.target.records])
+
+    def test_report_dropped_events(self) -> None:
+        handler = self.blocked_handler(maxsize=1, report_interval=0)
+        handler.handle(make_record(0))
+        handler.handle(make_record(1))
+
+        with self.assertLogs("django_structlog.handlers", logging.WARNING) as logs:
+            self.target.gate.set()  # type: ignore[union-attr]
+            handler.close()
+
+        record: Any = logs.records[0]
+        self.assertEqual("log_events_dropped", record.msg["event"])
+        self.assertEqual(1, record.msg["dropped_events"])
+
+    def test_close(self) -> None:
+        handler = handlers.QueueHandler([self.target])
+
+        handler.handle(make_record("before"))
+        handler.close()
+        handler.handle(make_record("after"))
+
+        self.assertEqual(["before", "after"], [r.msg for r in self.target.records])
+        self.assertIsNotNone(handler._thread)
+        self.assertFalse(handler._thread.is_alive())  # type: ignore[union-attr]
+
+    def test_close_targets_after_the_remaining_records(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        filename = os.path.join(directory.name, "test.log")
+        target = logging.FileHandler(filename)
+        gate = threading.Event()
+        blocking_target = ListHandler(gate)
+        handler = handlers.QueueHandler([blocking_target, target])
+
+        handler.handle(make_record("first"))
+        handler.handle(make_record("second"))
+        gate.set()
+        handler.close()
+
+        self.assertIsNone(target.stream)
+        with open(filename) as f:
+            self.assertEqual("first\nsecond\n", f.read())
+
+    def test_reset_after_fork(self) -> None:
+        handler = self.make_handler()
+        handler.handle(make_record("hello"))
+        handler.flush()
+
+        handlers._reset_after_fork()
+
+        self.assertIsNone(handler._thread)
+        handler.handle(make_record("child"))
+        handler.flush()
+        self.assertEqual(["hello", "child"], [r.msg for r in self.target.records])
+
+
+class TestBatchingFileHandler(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, "test.log")
+
+    def make_handler(self, **kwargs: Any) -> handlers.BatchingFileHandler:
+        handler = handlers.BatchingFileHandler(self.filename, **kwargs)
+        self.addCleanup(handler.close)
+        return handler
+
+    def read(self) -> str:
+        with open(self.filename) as f:
+            return f.read()
+
+    def test_batch(self) -> None:
+        handler = self.make_handler(flush_interval=3600)
+
+        with patch.object(handler.stream, "write") as mock_write:
+            for i in range(3):
+                handler.handle(make_record(i))
+            mock_write.assert_not_called()
+            handler.flush()
+
+        mock_write.assert_called_once_with("0\n1\n2\n")
+
+    def test_buffer_size(self) -> None:
+        handler = self.make_handler(buffer_size=4, flush_interval=3600)
+
+        handler.handle(make_record(0))
+        self.assertEqual("", self.read())
+        handler.handle(make_record(1))
+        self.assertEqual("0\n1\n", self.read())
+
+    def test_flush_interval(self) -> None:
+        handler = self.make_handler(flush_interval=0.01)
+
+        handler.handle(make_record("hello"))
+        deadline = time.monotonic() + 5
+        while not self.read() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual("hello\n", self.read())
+
+    def test_watch_interval(self) -> None:
+        handler = self.make_handler(flush_interval=3600, watch_interval=3600)
+
+        with patch.object(handler, "reopenIfNeeded") as mock_reopen_if_needed:
+            for i in range(3):
+                handler.handle(make_record(i))
+                handler.flush()
+
+        mock_reopen_if_needed.assert_not_called()
+
+    def test_rotation(self) -> None:
+        handler = self.make_handler(flush_interval=3600, watch_interval=0)
+        handler.handle(make_record("before"))
+        handler.flush()
+
+        os.rename(self.filename, self.filename + ".1")
+        handler.handle(make_record("after"))
+        handler.flush()
+
+        self.assertEqual("after\n", self.read())
+
+    def test_watch_disabled(self) -> None:
+        handler = self.make_handler(flush_interval=3600, watch_interval=None)
+
+        with patch.object(handler, "reopenIfNeeded") as mock_reopen_if_needed:
+            handler.handle(make_record("hello"))
+            handler.flush()
+
+        mock_reopen_if_needed.assert_not_called()
+
+    def test_close(self) -> None:
+        handler = handlers.BatchingFileHandler(
+            self.filename, delay=True, flush_interval=3600
+        )
+
+        handler.handle(make_record("before"))
+        handler.close()
+        handler.handle(make_record("after"))
+        handler.close()
+
+        self.assertEqual("before\nafter\n", self.read())
+
+    def test_reset_after_fork(self) -> None:
+        handler = self.make_handler(flush_interval=3600)
+        handler.handle(make_record("parent"))
+
+        handlers._reset_after_fork()
+        handler.handle(make_record("child"))
+        handler.flush()
+
+        self.assertEqual("child\n", self.read())
+
+
+class TestFanOutHandler(TestCase):
+    def setUp(self) -> None:
+        self.json_stream = io.StringIO()
+        self.json_handler = logging.StreamHandler(self.json_stream)
+        self.json_handler.setFormatter(
+            structlog.stdlib.ProcessorFormatter(
+                processors=[
+                    structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                    structlog.processors.format_exc_info,
+                    structlog.processors.JSONRenderer(sort_keys=True),
+                ],
+            )
+        )
+        self.key_value_stream = io.StringIO()
+        self.key_value_handler = logging.StreamHandler(self.key_value_stream)
+        self.key_value_handler.setFormatter(
+            structlog.stdlib.ProcessorFormatter(
+                processor=structlog.processors.KeyValueRenderer(sort_keys=True),
+            )
+        )
+        self.pre_chain = Mock(
+            side_effect=lambda logger, method_name, event_dict: {
+                **event_dict,
+                "level": method_name,
+                "foreign": True,
+            }
+        )
+        self.handler = handlers.FanOutHandler(
+            [self.json_handler, self.key_value_handler],
+            foreign_pre_chain=[self.pre_chain],
+        )
+
+    def test_foreign_record(self) -> None:
+        self.handler.handle(make_record("hello %s", "world"))
+
+        self.pre_chain.assert_called_once()
+        self.assertEqual(
+            '{"event": "hello world", "foreign": true, "level": "info"}\n',
+            self.json_stream.getvalue(),
+        )
+        self.assertEqual(
+            "event='hello world' foreign=True level='info'\n",
+            self.key_value_stream.getvalue(),
+        )
+
+    def test_foreign_record_with_args(self) -> None:
+        handler = handlers.FanOutHandler(
+            [self.json_handler],
+            foreign_pre_chain=[self.pre_chain],
+            use_get_message=False,
+            pass_foreign_args=True,
+        )
+
+        handler.handle(make_record("hello %s", "world"))
+
+        self.assertEqual(
+            {
+                "event": "hello %s",
+                "foreign": True,
+                "level": "info",
+                "positional_args": ["world"],
+            },
+            json.loads(self.json_stream.getvalue()),
+        )
+
+    def test_foreign_record_with_formatted_args(self) -> None:
+        handler = handlers.FanOutHandler(
+            [self.json_handler],
+            foreign_pre_chain=[structlog.stdlib.PositionalArgumentsFormatter()],
+            use_get_message=False,
+            pass_foreign_args=True,
+        )
+
+        handler.handle(make_record("hello %s", "world"))
+
+        self.assertEqual('{"event": "hello world"}\n', self.json_stream.getvalue())
+
+    def test_foreign_record_with_exception(self) -> None:
+        record = make_record("failed")
+        try:
+            raise Exception("boom")
+        except Exception:
+            record.exc_info = sys.exc_info()
+
+        self.handler.handle(record)
+
+        output = json.loads(self.json_stream.getvalue())
+        self.assertIn("Exception: boom", output["exception"])
+        self.assertNotIn("Traceback", self.key_value_stream.getvalue())
+
+    def test_structlog_record(self) -> None:
+        record = make_record({"event": "hello"})
+        setattr(record, "_logger", None)
+        setattr(record, "_name", "info")
+
+        self.handler.handle(record)
+
+        self.pre_chain.assert_not_called()
+        self.assertEqual('{"event": "hello"}\n', self.json_stream.getvalue())
+        self.assertEqual("event='hello'\n", self.key_value_stream.getvalue())
+
+    def test_level_of_the_handlers(self) -> None:
+        self.key_value_handler.setLevel(logging.WARNING)
+
+        self.handler.handle(make_record("hello"))
+
+        self.assertNotEqual("", self.json_stream.getvalue())
+        self.assertEqual("", self.key_value_stream.getvalue())
+
+    def test_dict_config(self) -> None:
+        handler = configure_handler(
+            {
+                "()": "django_structlog.handlers.FanOutHandler",
+                "handlers": ["cfg://handlers.json"],
+            },
+            json=self.json_handler,
+        )
+
+        handler.handle(make_record("hello"))
+
+        self.assertEqual('{"event": "hello"}\n', self.json_stream.getvalue())
+
+    def test_handler_not_configured(self) -> None:
+        with self.assertRaises(ValueError):
+            handlers.FanOutHandler(cast(Any, ["json"]))
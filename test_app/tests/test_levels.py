@@ -0,0 +1,97 @@
+import logging
+from unittest.mock import patch
+
+import structlog
+from django.test import TestCase
+
+from django_structlog.levels import LevelChecker, is_enabled_for
+
+
+class TestIsEnabledFor(TestCase):
+    def test_stdlib_logger(self) -> None:
+        stdlib_logger = logging.getLogger("test_is_enabled_for")
+        self.addCleanup(stdlib_logger.setLevel, stdlib_logger.level)
+        logger = structlog.wrap_logger(
+            stdlib_logger, wrapper_class=structlog.stdlib.BoundLogger
+        ).bind()
+
+        stdlib_logger.setLevel(logging.WARNING)
+        self.assertFalse(is_enabled_for(logger, logging.INFO))
+        self.assertTrue(is_enabled_for(logger, logging.WARNING))
+
+        stdlib_logger.setLevel(logging.DEBUG)
+        self.assertTrue(is_enabled_for(logger, logging.INFO))
+
+    def test_filtering_bound_logger(self) -> None:
+        logger = structlog.wrap_logger(
+            structlog.PrintLogger(),
+            wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING),
+        ).bind()
+
+        self.assertFalse(is_enabled_for(logger, logging.INFO))
+        self.assertTrue(is_enabled_for(logger, logging.ERROR))
+
+    def test_other_logger(self) -> None:
+        logger = structlog.wrap_logger(
+            structlog.PrintLogger(), wrapper_class=structlog.BoundLogger
+        ).bind()
+
+        self.assertTrue(is_enabled_for(logger, logging.DEBUG))
+
+
+class TestLevelChecker(TestCase):
+    def test_filtering_bound_logger_of_stdlib_logger(self) -> None:
+        """The test settings wrap ``logging`` loggers with a filtering bound logger"""
+        stdlib_logger = logging.getLogger("test_level_checker")
+        self.addCleanup(stdlib_logger.setLevel, stdlib_logger.level)
+        checker = LevelChecker("test_level_checker")
+
+        stdlib_logger.setLevel(logging.WARNING)
+        self.assertFalse(checker.is_enabled_for(logging.INFO))
+        self.assertTrue(checker.is_enabled_for(logging.WARNING))
+
+        stdlib_logger.setLevel(logging.DEBUG)
+        self.assertTrue(checker.is_enabled_for(logging.INFO))
+
+    def test_reconfigured(self) -> None:
+        config = structlog.get_config()
+        self.addCleanup(structlog.configure, **config)
+        checker = LevelChecker("test_level_checker")
+
+        structlog.configure(
+            wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR),
+            logger_factory=structlog.PrintLoggerFactory(),
+        )
+        self.assertFalse(checker.is_enabled_for(logging.INFO))
+
+        structlog.configure(
+            wrapper_class=structlog.make_filtering_bound_logger(logging.DEBUG)
+        )
+        self.assertTrue(checker.is_enabled_for(logging.INFO))
+
+    def test_resolved_once(self) -> None:
+        checker = LevelChecker("test_level_checker")
+
+        with patch.object(
+            structlog, "get_logger", wraps=structlog.get_logger
+        ) as mock_get_logger:
+            checker.is_enabled_for(logging.INFO)
+            checker.is_enabled_for(logging.INFO)
+
+        mock_get_logger.assert_called_once_with("test_level_checker")
+
+    def test_stdlib_bound_logger(self) -> None:
+        stdlib_logger = logging.getLogger("test_level_checker")
+        self.addCleanup(stdlib_logger.setLevel, stdlib_logger.level)
+        stdlib_logger.setLevel(logging.WARNING)
+        checker = LevelChecker("test_level_checker")
+
+        with patch.object(
+            structlog,
+            "get_logger",
+            return_value=structlog.wrap_logger(
+                stdlib_logger, wrapper_class=structlog.stdlib.BoundLogger
+            ),
+        ):
+            self.assertFalse(checker.is_enabled_for(logging.INFO))
+        self.assertTrue(checker.is_enabled_for(logging.ERROR))
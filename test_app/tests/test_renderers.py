@@ -0,0 +1,117 @@
+import datetime
+import decimal
+import json
+import logging
+import uuid
+from importlib.util import find_spec
+from typing import Any
+from unittest import skipUnless
+
+import structlog
+from django.contrib.auth.models import User
+from django.http import QueryDict
+from django.test import RequestFactory, TestCase
+from django.utils.translation import gettext_lazy
+
+from django_structlog import renderers
+
+
+class TestDefault(TestCase):
+    def test_values(self) -> None:
+        user = User(pk=1)
+        request = RequestFactory().get("/foo?bar=1")
+
+        self.assertEqual("hello", renderers.default(gettext_lazy("hello")))
+        self.assertEqual(
+            "00000000-0000-0000-0000-000000000000",
+            renderers.default(uuid.UUID(int=0)),
+        )
+        self.assertEqual("1.10", renderers.default(decimal.Decimal("1.10")))
+        self.assertEqual(
+            "2025-01-02T03:04:05",
+            renderers.default(datetime.datetime(2025, 1, 2, 3, 4, 5)),
+        )
+        self.assertEqual({"model": "auth.User", "pk": 1}, renderers.default(user))
+        self.assertEqual({"a": ["1", "2"]}, renderers.default(QueryDict("a=1&a=2")))
+        self.assertEqual("GET /foo?bar=1", renderers.default(request))
+        self.assertEqual([1], renderers.default({1}))
+        self.assertEqual("Ellipsis", renderers.default(...))
+
+
+class TestJSONRenderer(TestCase):
+    event_dict: Any = {
+        "event": "hello",
+        "user_id": uuid.UUID(int=0),
+        "amount": decimal.Decimal("1.10"),
+        "message": gettext_lazy("hello"),
+    }
+    expected = {
+        "event": "hello",
+        "user_id": "00000000-0000-0000-0000-000000000000",
+        "amount": "1.10",
+        "message": "hello",
+    }
+
+    def assertRendered(self, renderer: renderers.JSONRenderer) -> None:
+        rendered = renderer(None, "info", dict(self.event_dict))
+        self.assertIsInstance(rendered, str)
+        self.assertEqual(self.expected, json.loads(rendered))
+
+        renderer.bytes_output = True
+        rendered = renderer(None, "info", dict(self.event_dict))
+        self.assertIsInstance(rendered, bytes)
+        self.assertEqual(self.expected, json.loads(rendered))
+
+    @skipUnless(find_spec("orjson"), "requires orjson")
+    def test_orjson(self) -> None:
+        self.assertEqual("orjson", renderers.JSONRenderer().backend)
+        self.assertRendered(renderers.JSONRenderer(backend="orjson"))
+
+    @skipUnless(find_spec("msgspec"), "requires msgspec")
+    def test_msgspec(self) -> None:  # pragma: no cover
+        self.assertRendered(renderers.JSONRenderer(backend="msgspec"))
+
+    def test_json(self) -> None:
+        self.assertRendered(renderers.JSONRenderer(backend="json"))
+
+    def test_sort_keys(self) -> None:
+        backends: tuple[renderers.Backend, ...] = ("orjson", "msgspec", "json")
+        for backend in backends:
+            if backend != "json" and not find_spec(backend):
+                continue  # pragma: no cover
+            with self.subTest(backend=backend):
+                renderer = renderers.JSONRenderer(backend=backend, sort_keys=True)
+                rendered = renderer(None, "info", {"b": 2, "a": 1})
+                self.assertEqual(["a", "b"], list(json.loads(rendered)))
+
+    @skipUnless(find_spec("orjson"), "requires orjson")
+    def test_fallback_to_json(self) -> None:
+        renderer = renderers.JSONRenderer(backend="orjson")
+
+        self.assertEqual(
+            '{"big": 18446744073709551616}', renderer(None, "info", {"big": 2**64})
+        )
+
+    def test_unknown_backend(self) -> None:
+        with self.assertRaises(ValueError):
+            renderers.JSONRenderer(backend="yaml")  # type: ignore[arg-type]
+
+
+class TestJSONFormatter(TestCase):
+    def test_format(self) -> None:
+        formatter = renderers.JSONFormatter(backend="json")
+        record = logging.LogRecord(
+            __name__, logging.INFO, __file__, 1, "hello", (), None
+        )
+
+        self.assertEqual('{"event": "hello"}', formatter.format(record))
+
+    def test_processor(self) -> None:
+        formatter = renderers.JSONFormatter(
+            processor=structlog.processors.KeyValueRenderer()
+        )
+        record = logging.LogRecord(
+            __name__, logging.INFO, __file__, 1, "hello", (), None
+        )
+
+        self.assertEqual("event='hello'", formatter.format(record))
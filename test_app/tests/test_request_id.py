@@ -0,0 +1,93 @@
+import re
+import time
+import uuid
+from typing import Callable
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from django_structlog import request_id
+
+
+class TestRequestId(TestCase):
+    def assertUnique(self, generator: Callable[[], str]) -> None:
+        ids = [generator() for _ in range(1000)]
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_uuid4(self) -> None:
+        self.assertEqual(4, uuid.UUID(request_id.uuid4()).version)
+        self.assertUnique(request_id.uuid4)
+
+    def test_pooled_uuid4(self) -> None:
+        value = request_id.pooled_uuid4()
+
+        parsed = uuid.UUID(value)
+        self.assertEqual(str(parsed), value)
+        self.assertEqual(4, parsed.version)
+        self.assertEqual(uuid.RFC_4122, parsed.variant)
+        self.assertUnique(request_id.pooled_uuid4)
+
+    def test_pooled_uuid4_refills_pool(self) -> None:
+        ids = {
+            request_id.pooled_uuid4()
+            for _ in range(3 * request_id._POOL_SIZE // request_id._CHUNK_SIZE)
+        }
+        self.assertEqual(3 * request_id._POOL_SIZE // request_id._CHUNK_SIZE, len(ids))
+
+    def test_uuid7(self) -> None:
+        before_ms = time.time_ns() // 1_000_000
+        value = request_id.uuid7()
+        after_ms = time.time_ns() // 1_000_000
+
+        parsed = uuid.UUID(value)
+        self.assertEqual(str(parsed), value)
+        self.assertEqual(7, parsed.version)
+        self.assertEqual(uuid.RFC_4122, parsed.variant)
+        self.assertTrue(before_ms <= parsed.int >> 80 <= after_ms)
+        self.assertUnique(request_id.uuid7)
+
+    def test_uuid7_is_time_ordered(self) -> None:
+        with patch("time.time_ns", return_value=1_000_000_000_000):
+            first = request_id.uuid7()
+        with patch("time.time_ns", return_value=1_000_001_000_000):
+            second = request_id.uuid7()
+        self.assertLess(first, second)
+
+    def test_ulid(self) -> None:
+        with patch("time.time_ns", return_value=1_469_918_176_385_000_000):
+            value = request_id.ulid()
+
+        self.assertRegex(value, r"^[0-9A-HJKMNP-TV-Z]{26}$")
+        # timestamp example from the specification
+        self.assertEqual("01ARYZ6S41", value[:10])
+        self.assertUnique(request_id.ulid)
+
+    def test_ulid_is_time_ordered(self) -> None:
+        with patch("time.time_ns", return_value=1_000_000_000_000):
+            first = request_id.ulid()
+        with patch("time.time_ns", return_value=1_000_001_000_000):
+            second = request_id.ulid()
+        self.assertLess(first, second)
+
+    def test_process_counter(self) -> None:
+        first = request_id.process_counter()
+        second = request_id.process_counter()
+
+        match = re.match(r"^([0-9a-f]{16})-(\d+)$", first)
+        assert match is not None
+        self.assertEqual(f"{match.group(1)}-{int(match.group(2)) + 1}", second)
+
+    def test_reset_after_fork(self) -> None:
+        pooled_uuid4 = request_id.pooled_uuid4()
+        counter = request_id.process_counter()
+
+        with patch("os.urandom", side_effect=lambda size: bytes(size)):
+            request_id._reset_after_fork()
+            self.assertEqual(
+                "00000000-0000-4000-8000-000000000000", request_id.pooled_uuid4()
+            )
+            self.assertEqual("0000000000000000-1", request_id.process_counter())
+        request_id._reset_after_fork()
+
+        self.assertNotEqual(pooled_uuid4, request_id.pooled_uuid4())
+        self.assertNotEqual(counter, request_id.process_counter())
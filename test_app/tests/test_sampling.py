@@ -0,0 +1,80 @@
+from contextvars import copy_context
+
+import structlog
+from django.test import TestCase
+
+from django_structlog import sampling
+
+
+class TestSampleKey(TestCase):
+    def test_threshold(self) -> None:
+        self.assertEqual(0, sampling.threshold(-1))
+        self.assertEqual(2**31, sampling.threshold(0.5))
+        self.assertEqual(2**32, sampling.threshold(2))
+
+    def test_sample_key(self) -> None:
+        self.assertFalse(sampling.sample_key("foo", sampling.threshold(0)))
+        self.assertTrue(sampling.sample_key("foo", sampling.threshold(1)))
+        sampled = sum(
+            sampling.sample_key(f"key-{i}", sampling.threshold(0.25))
+            for i in range(10000)
+        )
+        self.assertAlmostEqual(0.25, sampled / 10000, delta=0.02)
+
+
+class TestRequestSampler(TestCase):
+    def test_rate_zero(self) -> None:
+        sampler = sampling.RequestSampler(0, {})
+        self.assertFalse(any(sampler.sample(str(i), "/") for i in range(1000)))
+
+    def test_rate_one(self) -> None:
+        sampler = sampling.RequestSampler(1, {})
+        self.assertTrue(all(sampler.sample(str(i), "/") for i in range(1000)))
+
+    def test_rate(self) -> None:
+        sampler = sampling.RequestSampler(0.25, {})
+        sampled = sum(sampler.sample(f"request-{i}", "/") for i in range(10000))
+        self.assertAlmostEqual(0.25, sampled / 10000, delta=0.02)
+
+    def test_decision_is_deterministic(self) -> None:
+        sampler = sampling.RequestSampler(0.5, {})
+        other_sampler = sampling.RequestSampler(0.5, {})
+        for i in range(100):
+            self.assertEqual(
+                sampler.sample(str(i), "/"), other_sampler.sample(str(i), "/")
+            )
+
+    def test_longest_path_prefix_wins(self) -> None:
+        sampler = sampling.RequestSampler(
+            0, {"/api/": 1, "/api/health": 0, "/static/": 1}
+        )
+        self.assertTrue(sampler.sample("foo", "/api/users"))
+        self.assertFalse(sampler.sample("foo", "/api/health/ready"))
+        self.assertTrue(sampler.sample("foo", "/static/app.js"))
+        self.assertFalse(sampler.sample("foo", "/"))
+
+
+class TestSampled(TestCase):
+    def tearDown(self) -> None:
+        structlog.contextvars.clear_contextvars()
+
+    def test_default(self) -> None:
+        self.assertTrue(copy_context().run(sampling.is_sampled))
+
+    def test_bind_sampled(self) -> None:
+        def run() -> None:
+            sampling.bind_sampled(False)
+            self.assertFalse(sampling.is_sampled())
+            self.assertEqual(
+                {"sampled": False}, structlog.contextvars.get_contextvars()
+            )
+
+        copy_context().run(run)
+
+    def test_set_sampled(self) -> None:
+        def run() -> None:
+            sampling.set_sampled(False)
+            self.assertFalse(sampling.is_sampled())
+            self.assertEqual({}, structlog.contextvars.get_contextvars())
+
+        copy_context().run(run)